@@ -102,6 +102,49 @@ class ICache(interface.Interface):
 
         """
 
+    def get_many(keys, fallback=None):
+        """
+        Get the values of several keys in the cache, in as few round trips
+        as the implementation allows.  Optional (a generic implementation
+        calling ``get()`` for each key is provided by
+        :class:`CementCacheHandler`).
+
+        :param keys: The keys of the values stored in cache.
+        :param fallback: Optional value that is returned for keys that are
+         expired or do not exist.  Default: None
+        :returns: A dictionary of every key in `keys` mapped to its value
+         (or the `fallback`).
+        :rtype: ``dict``
+
+        """
+
+    def set_many(data, time=None):
+        """
+        Set several key/values in the cache for a set amount of `time`, in
+        as few round trips as the implementation allows.  Optional (a
+        generic implementation calling ``set()`` for each key is provided by
+        :class:`CementCacheHandler`).
+
+        :param data: A dictionary of the keys/values to store in cache.
+        :param time: A one-off expire time.  If no time is given, then a
+            default value is used (determined by the implementation).
+        :type time: ``int`` (seconds) or ``None``
+        :returns: ``None``
+
+        """
+
+    def delete_many(keys):
+        """
+        Deletes several key/values from the cache, in as few round trips as
+        the implementation allows.  Optional (a generic implementation
+        calling ``delete()`` for each key is provided by
+        :class:`CementCacheHandler`).
+
+        :param keys: The keys in the cache to delete.
+        :returns: ``None``
+
+        """
+
     # pylint: disable=E0211
     def purge():
         """
@@ -131,3 +174,56 @@ class CementCacheHandler(handler.CementBaseHandler):
 
     def __init__(self, *args, **kw):
         super(CementCacheHandler, self).__init__(*args, **kw)
+
+    def get_many(self, keys, fallback=None, **kw):
+        """
+        Get the values of several keys in the cache.  This generic
+        implementation calls ``get()`` for each key, handlers should
+        override it if their backend supports getting many keys at once.
+        Additional keyword arguments are passed to ``get()``.
+
+        :param keys: The keys of the items in the cache to get.
+        :param fallback: The value to return for items that are not found
+         in the cache.
+        :returns: A dictionary of every key in `keys` mapped to its value
+         (or the `fallback`).
+        :rtype: ``dict``
+
+        """
+        res = dict()
+        for key in keys:
+            res[key] = self.get(key, fallback, **kw)
+        return res
+
+    def set_many(self, data, time=None, **kw):
+        """
+        Set several values in the cache.  This generic implementation calls
+        ``set()`` for each key, handlers should override it if their
+        backend supports setting many keys at once.  Additional keyword
+        arguments are passed to ``set()``.
+
+        :param data: A dictionary of the keys/values of the items to set.
+        :param time: The expiration time (in seconds) to keep the items
+         cached.  Defaults to the handler's default expiration time.
+        :returns: ``None``
+
+        """
+        for key, value in data.items():
+            if time is None:
+                self.set(key, value, **kw)
+            else:
+                self.set(key, value, time=time, **kw)
+
+    def delete_many(self, keys, **kw):
+        """
+        Delete several items from the cache.  This generic implementation
+        calls ``delete()`` for each key, handlers should override it if
+        their backend supports deleting many keys at once.  Additional
+        keyword arguments are passed to ``delete()``.
+
+        :param keys: The keys of the items to delete from the cache.
+        :returns: ``None``
+
+        """
+        for key in keys:
+            self.delete(key, **kw)
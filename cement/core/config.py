@@ -3,7 +3,7 @@
 import os
 from ..core import interface, handler
 from ..utils.fs import abspath
-from ..utils.misc import minimal_logger
+from ..utils.misc import minimal_logger, is_true
 
 LOG = minimal_logger(__name__)
 
@@ -25,6 +25,138 @@ def config_validator(klass, obj):
     interface.validate(IConfig, obj, members)
 
 
+def get_snapshot(config_obj):
+    """
+    Return a :class:`ConfigSnapshot` of `config_obj`.  Config handlers that
+    sub-class from :class:`CementConfigHandler` keep their snapshot until
+    the config changes, others get a new one on every call.
+
+    :param config_obj: The config handler object (i.e. ``app.config``).
+    :returns: A :class:`ConfigSnapshot` object.
+
+    """
+    if hasattr(config_obj, 'get_snapshot'):
+        return config_obj.get_snapshot()
+    return ConfigSnapshot(config_obj)
+
+
+class ConfigSnapshot(object):
+
+    """
+    A read-only, flattened copy of a config handler's settings (a dict of
+    section dicts), for looking up values in hot code paths without going
+    through the config handler.  Values coerced with ``get_int()`` and
+    ``get_bool()`` are only coerced once per snapshot.
+
+    A snapshot never changes, a new one is made when the config does (see
+    :meth:`CementConfigHandler.get_snapshot`), so code that holds on to
+    one sees a consistent view of the config.
+
+    :param config_obj: The config handler object to copy settings from.
+
+    """
+
+    def __init__(self, config_obj):
+        self._sections = dict()
+        for section in config_obj.get_sections():
+            self._sections[section] = config_obj.get_section_dict(section)
+        self._coerced = dict()
+
+    def get_sections(self):
+        """
+        Return a list of configuration sections.
+
+        :returns: ``list``
+
+        """
+        return list(self._sections.keys())
+
+    def has_section(self, section):
+        """
+        Returns whether or not the section exists.
+
+        :param section: The section to test for.
+        :returns: ``boolean``
+
+        """
+        return section in self._sections
+
+    def keys(self, section):
+        """
+        Return a list of configuration keys from `section`.
+
+        :param section: The config [section] to pull keys from.
+        :returns: ``list``
+
+        """
+        return list(self._sections[section].keys())
+
+    def get_section_dict(self, section):
+        """
+        Return a (copied) dict of configuration parameters for [section].
+
+        :param section: The config [section].
+        :returns: ``dict``
+
+        """
+        return dict(self._sections[section])
+
+    def get(self, section, key, fallback=None):
+        """
+        Return a configuration value based on [section][key], or
+        `fallback` if it isn't set.
+
+        :param section: The [section] of the configuration.
+        :param key: The configuration key.
+        :param fallback: The value to return if the key does not exist.
+        :returns: The value of the `key` in `section`.
+
+        """
+        return self._sections.get(section, {}).get(key, fallback)
+
+    def get_int(self, section, key, fallback=None):
+        """
+        Return a configuration value based on [section][key] as an
+        ``int``, or `fallback` if it isn't set.
+
+        :param section: The [section] of the configuration.
+        :param key: The configuration key.
+        :param fallback: The value to return if the key does not exist.
+        :returns: ``int``
+        :raises: ``ValueError`` if the value is not an integer.
+
+        """
+        return self._get_coerced(section, key, int, fallback)
+
+    def get_bool(self, section, key, fallback=None):
+        """
+        Return a configuration value based on [section][key] as a
+        ``boolean`` (see :func:`cement.utils.misc.is_true`), or `fallback`
+        if it isn't set.
+
+        :param section: The [section] of the configuration.
+        :param key: The configuration key.
+        :param fallback: The value to return if the key does not exist.
+        :returns: ``boolean``
+
+        """
+        return self._get_coerced(section, key, is_true, fallback)
+
+    def _get_coerced(self, section, key, func, fallback):
+        cache_key = (section, key, func)
+        try:
+            return self._coerced[cache_key]
+        except KeyError:
+            pass
+
+        if key not in self._sections.get(section, {}):
+            return fallback
+
+        value = func(self._sections[section][key])
+        self._coerced[cache_key] = value
+        return value
+
+
 class IConfig(interface.Interface):
 
     """
@@ -194,9 +326,68 @@ class CementConfigHandler(handler.CementBaseHandler):
         interface = IConfig
         """The interface that this handler implements."""
 
+    # key -> list of sections that have it, built on first use (see
+    # ``get_key_sections()``)
+    _key_index = None
+
+    # built on first use (see ``get_snapshot()``)
+    _snapshot = None
+
     def __init__(self, *args, **kw):
         super(CementConfigHandler, self).__init__(*args, **kw)
 
+    def get_key_sections(self, key):
+        """
+        Return a list of the configuration sections that have `key`.  The
+        index this is looked up in is built on first use, kept up to date
+        by ``set()`` and ``merge()``, and rebuilt after ``parse_file()``.
+
+        :param key: The configuration key to look for.
+        :returns: A list of sections.
+        :rtype: ``list``
+
+        """
+        if self._key_index is None:
+            index = {}
+            for section in self.get_sections():
+                for _key in self.keys(section):
+                    index.setdefault(_key, []).append(section)
+            self._key_index = index
+        return list(self._key_index.get(key, []))
+
+    def get_snapshot(self):
+        """
+        Return a read-only :class:`ConfigSnapshot` of the configuration.
+        The same snapshot is returned until the configuration is changed
+        by ``set()``, ``merge()`` or ``parse_file()``, after which a new
+        one is made on the next call.
+
+        :returns: A :class:`ConfigSnapshot` object.
+
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = ConfigSnapshot(self)
+            self._snapshot = snapshot
+        return snapshot
+
+    def _key_changed(self, section, key):
+        # called by ``set()``, updates the index (if it's been built) and
+        # drops the snapshot
+        self._snapshot = None
+        if self._key_index is None:
+            return
+        sections = self._key_index.setdefault(key, [])
+        if section not in sections:
+            sections.append(section)
+
+    def _config_changed(self):
+        # anything that changes the config without going through ``set()``
+        # must call this, so that the index and snapshot are rebuilt on next
+        # use
+        self._key_index = None
+        self._snapshot = None
+
     def _parse_file(self, file_path):
         """
         Parse a configuration file at `file_path` and store it.  This function
@@ -210,6 +401,24 @@ class CementConfigHandler(handler.CementBaseHandler):
         """
         raise NotImplementedError
 
+    def _parse_file_cached(self, file_path, cache):
+        # parse the file into a separate config handler object (unless it
+        # is in the cache), and merge what was parsed from it
+        data = cache.get(file_path, self.__class__)
+        if data is None:
+            config_obj = self.__class__()
+            config_obj._setup(self.app)
+            if not config_obj._parse_file(file_path):
+                return False
+
+            data = {}
+            for section in config_obj.get_sections():
+                data[section] = config_obj.get_section_dict(section)
+            cache.set(file_path, self.__class__, data)
+
+        self.merge(data)
+        return True
+
     def parse_file(self, file_path):
         """
         Ensure we are using the absolute/expanded path to `file_path`, and
@@ -221,6 +430,10 @@ class CementConfigHandler(handler.CementBaseHandler):
         `_parse_file` which handles just the parsing of the file and leaving
         this function to wrap any checks/logging/etc.
 
+        If ``CementApp.Meta.config_cache`` is enabled, the file is parsed
+        into a separate handler object and what was parsed is cached, so
+        that it is only parsed again once the file changes.
+
         :param file_path: The file system path to the configuration file.
         :returns: ``boolean``
 
@@ -229,7 +442,13 @@ class CementConfigHandler(handler.CementBaseHandler):
         if os.path.exists(file_path):
             LOG.debug("config file '%s' exists, loading settings..." %
                       file_path)
-            return self._parse_file(file_path)
+            cache = getattr(self.app, '_config_cache', None)
+            try:
+                if cache is not None:
+                    return self._parse_file_cached(file_path, cache)
+                return self._parse_file(file_path)
+            finally:
+                self._config_changed()
         else:
             LOG.debug("config file '%s' does not exist, skipping..." %
                       file_path)
@@ -56,6 +56,43 @@ def controller_validator(klass, obj):
         )
 
 
+def get_exposed(controller_class):
+    """
+    Returns the meta-data dictionaries (``__cement_meta__``) of all functions
+    exposed as commands (via an ``expose`` decorator) on
+    ``controller_class`` and its parent classes, sorted by function name.
+
+    The registry is built once per class (when the class is defined on
+    Python 3.6+, or on first use otherwise), so this is only a dictionary
+    read on every dispatch.
+
+    :param controller_class: The controller class.
+    :returns: ``list`` of ``dict``
+
+    """
+    if '__cement_exposed__' not in controller_class.__dict__:
+        register_exposed(controller_class)
+    return controller_class.__dict__['__cement_exposed__']
+
+
+def register_exposed(controller_class):
+    """
+    Build (or re-build) the registry of exposed commands of
+    ``controller_class``.  See ``get_exposed()``.
+
+    :param controller_class: The controller class.
+
+    """
+    exposed = []
+    for member in dir(controller_class):
+        if member.startswith('_'):
+            continue
+        func = getattr(controller_class, member, None)
+        if hasattr(func, '__cement_meta__'):
+            exposed.append(func.__cement_meta__)
+    controller_class.__cement_exposed__ = exposed
+
+
 class IController(interface.Interface):
 
     """
@@ -138,6 +175,9 @@ class expose(object):
      command/function label.
     :type aliases: ``list``
 
+    Exposed functions may also be coroutine functions (``async def``) on
+    Python 3.6+.  See ``CementApp.run()`` and ``CementApp.run_async()``.
+
     Usage:
 
     .. code-block:: python
@@ -323,6 +363,11 @@ class CementBaseController(handler.CementBaseHandler):
         in how Cement discovers and maps commands.
         """
 
+    def __init_subclass__(cls, **kw):
+        # Python 3.6+ only, see get_exposed()
+        super(CementBaseController, cls).__init_subclass__(**kw)
+        register_exposed(cls)
+
     def __init__(self, *args, **kw):
         super(CementBaseController, self).__init__(*args, **kw)
 
@@ -345,7 +390,7 @@ class CementBaseController(handler.CementBaseHandler):
 
         self.app = app_obj
 
-    def _collect(self):
+    def _collect(self, controllers=None):
         LOG.debug("collecting arguments/commands for %s" % self)
         arguments = []
         commands = []
@@ -353,28 +398,32 @@ class CementBaseController(handler.CementBaseHandler):
         # process my arguments and commands first
         arguments = list(self._meta.arguments)
 
-        for member in dir(self.__class__):
-            if member.startswith('_'):
-                continue
-            try:
-                func = getattr(self.__class__, member).__cement_meta__
-            except AttributeError:
-                continue
-            else:
-                func['controller'] = self
-                commands.append(func)
+        for func in get_exposed(self.__class__):
+            func['controller'] = self
+            commands.append(func)
+
+        # the other controllers are only instantiated once, and then shared
+        # with the embedded controllers that we collect from
+        if controllers is None:
+            controllers = []
+            handlers = self.app.handler.list('controller', validate=False)
+            for contr in handlers:
+                if contr == self.__class__:
+                    continue
+                contr = contr()
+                contr._setup(self.app)
+                controllers.append(contr)
 
         # process stacked controllers second for commands and args
-        for contr in self.app.handler.list('controller'):
+        for contr in controllers:
             # don't include self here
-            if contr == self.__class__:
+            if contr.__class__ == self.__class__:
                 continue
 
-            contr = contr()
-            contr._setup(self.app)
             if contr._meta.stacked_on == self._meta.label:
                 if contr._meta.stacked_type == 'embedded':
-                    contr_arguments, contr_commands = contr._collect()
+                    contr_arguments, contr_commands = \
+                        contr._collect(controllers)
                     for arg in contr_arguments:
                         arguments.append(arg)
                     for func in contr_commands:
@@ -394,11 +443,22 @@ class CementBaseController(handler.CementBaseHandler):
         return (arguments, commands)
 
     def _process_arguments(self):
+        # the arguments of a controller are only added to the parser once,
+        # so that the application can be dispatched more than once (i.e.
+        # CementApp.run_batch())
+        processed = getattr(self.app.args, '_processed_controllers', None)
+        if processed is None:
+            processed = set()
+            self.app.args._processed_controllers = processed
+        elif self._meta.label in processed:
+            return
+
         for _arg, _kw in self._arguments:
             try:
                 self.app.args.add_argument(*_arg, **_kw)
             except argparse.ArgumentError as e:
                 raise exc.FrameworkError(e.__str__())
+        processed.add(self._meta.label)
 
     def _process_commands(self):
         self._dispatch_map = {}
@@ -462,9 +522,16 @@ class CementBaseController(handler.CementBaseHandler):
 
         self._arguments, self._commands = self._collect()
         self._process_commands()
+        self._dispatch_command = None
         self._get_dispatch_command()
 
         if self._dispatch_command:
+            # validate the controller now (if validation is deferred, see
+            # CementApp.Meta.defer_handler_validation)
+            contr = self._dispatch_command['controller']
+            if contr is not self:
+                self.app.handler.get('controller', contr._meta.label)
+
             if self._dispatch_command['func_name'] == '_dispatch':
                 func = getattr(self._dispatch_command['controller'],
                                '_dispatch')
@@ -1,12 +1,111 @@
 """Cement core extensions module."""
 
 import sys
+from functools import partial
 from ..core import exc, interface, handler
-from ..utils.misc import minimal_logger
+from ..utils.misc import is_true, minimal_logger
+from ..utils.profiler import StartupProfiler
 
 LOG = minimal_logger(__name__)
 
 
+def handler_overridden(handler_type, label):
+    """
+    Returns a ``hooks_when`` function for an extension manifest (see
+    ``CementApp.Meta.extension_manifest``), that is ``True`` once the
+    ``handler_type`` handler has been overridden with ``label`` via the
+    command line (see ``CementApp.Meta.handler_override_options``).
+
+    :param handler_type: The handler type (interface label), i.e.
+        ``output``.
+    :param label: The handler label, i.e. ``json``.
+
+    """
+    dest = '%s_handler_override' % handler_type
+
+    def when(app):
+        return getattr(app.pargs, dest, None) == label
+    return when
+
+
+# The handlers (and hooks) provided by the extensions that ship with Cement.
+# Knowing the handler labels up front means these extensions can be loaded
+# lazily (see ``CementApp.Meta.lazy_extensions``) without first importing
+# them.  Every hook that an extension registers when loaded must be listed,
+# so that the extension is loaded before the hook is run (rather than from one
+# of the hook's functions, while it is already running).  Extensions whose
+# hook functions only act on some runs can also give a ``hooks_when`` function
+# (taking the app object), so that running their hooks does not load them
+# unless it returns ``True``.  Extensions that do more than register handlers
+# and hooks when loaded (i.e. catching signals, or extending the app) are
+# intentionally not listed.
+EXTENSION_MANIFEST = {
+    'cement.ext.ext_dummy': dict(
+        handlers=dict(output=['dummy'], mail=['dummy']),
+    ),
+    'cement.ext.ext_smtp': dict(
+        handlers=dict(mail=['smtp']),
+    ),
+    'cement.ext.ext_plugin': dict(
+        handlers=dict(plugin=['cement']),
+    ),
+    'cement.ext.ext_configparser': dict(
+        handlers=dict(config=['configparser']),
+    ),
+    'cement.ext.ext_logging': dict(
+        handlers=dict(log=['logging']),
+    ),
+    'cement.ext.ext_argparse': dict(
+        handlers=dict(argument=['argparse']),
+    ),
+    'cement.ext.ext_colorlog': dict(
+        handlers=dict(log=['colorlog']),
+    ),
+    'cement.ext.ext_configobj': dict(
+        handlers=dict(config=['configobj']),
+    ),
+    'cement.ext.ext_json': dict(
+        handlers=dict(output=['json'], config=['json']),
+        overridable=dict(output=['json']),
+        hooks=['post_argument_parsing', 'pre_render', 'post_render'],
+        hooks_when=handler_overridden('output', 'json'),
+    ),
+    'cement.ext.ext_json_configobj': dict(
+        handlers=dict(config=['json_configobj']),
+    ),
+    'cement.ext.ext_yaml': dict(
+        handlers=dict(output=['yaml'], config=['yaml']),
+        overridable=dict(output=['yaml']),
+        hooks=['post_argument_parsing', 'pre_render', 'post_render'],
+        hooks_when=handler_overridden('output', 'yaml'),
+    ),
+    'cement.ext.ext_yaml_configobj': dict(
+        handlers=dict(config=['yaml_configobj']),
+    ),
+    'cement.ext.ext_genshi': dict(
+        handlers=dict(output=['genshi']),
+    ),
+    'cement.ext.ext_handlebars': dict(
+        handlers=dict(output=['handlebars']),
+    ),
+    'cement.ext.ext_jinja2': dict(
+        handlers=dict(output=['jinja2']),
+    ),
+    'cement.ext.ext_mustache': dict(
+        handlers=dict(output=['mustache']),
+    ),
+    'cement.ext.ext_tabulate': dict(
+        handlers=dict(output=['tabulate']),
+    ),
+    'cement.ext.ext_memcached': dict(
+        handlers=dict(cache=['memcached']),
+    ),
+    'cement.ext.ext_redis': dict(
+        handlers=dict(cache=['redis']),
+    ),
+}
+
+
 def extension_validator(klass, obj):
     """
     Validates an handler implementation against the IExtension interface.
@@ -115,11 +214,24 @@ class CementExtensionHandler(handler.CementBaseHandler):
         super(CementExtensionHandler, self).__init__(**kw)
         self.app = None
         self._loaded_extensions = []
+        self._lazy_extensions = []
 
     def get_loaded_extensions(self):
         """Returns list of loaded extensions."""
         return self._loaded_extensions
 
+    def get_lazy_extensions(self):
+        """
+        Returns list of extensions that were registered lazily, and have not
+        been loaded yet.
+        """
+        return self._lazy_extensions
+
+    def _get_manifest(self, ext_module):
+        manifest = EXTENSION_MANIFEST.copy()
+        manifest.update(getattr(self.app._meta, 'extension_manifest', {}))
+        return manifest.get(ext_module, None)
+
     def load_extension(self, ext_module):
         """
         Given an extension module name, load or in other-words 'import' the
@@ -138,14 +250,70 @@ class CementExtensionHandler(handler.CementBaseHandler):
         if ext_module in self._loaded_extensions:
             LOG.debug("framework extension '%s' already loaded" % ext_module)
             return
+        elif ext_module in self._lazy_extensions:
+            LOG.debug("framework extension '%s' already registered lazily" %
+                      ext_module)
+            return
+
+        # extensions that are already imported are cheap to load, so only
+        # defer the ones that we'd actually have to import
+        lazy = is_true(getattr(self.app._meta, 'lazy_extensions', False))
+        if lazy is True and ext_module not in sys.modules:
+            manifest = self._get_manifest(ext_module)
+            if manifest is not None:
+                self._register_lazy_extension(ext_module, manifest)
+                return
+
+        self._load_extension(ext_module)
+
+    def _register_lazy_extension(self, ext_module, manifest):
+        LOG.debug("lazily registering the '%s' framework extension" %
+                  ext_module)
+        loader = partial(self._load_lazy_extension, ext_module)
+        overridable = manifest.get('overridable', {})
+
+        for handler_type, labels in manifest.get('handlers', {}).items():
+            for label in labels:
+                self.app.handler.register_lazy(
+                    handler_type, label, loader,
+                    overridable=label in overridable.get(handler_type, []),
+                )
+
+        when = manifest.get('hooks_when', None)
+        if when is not None:
+            loader = partial(self._load_lazy_extension_when, ext_module, when)
+        for hook_name in manifest.get('hooks', []):
+            self.app.hook.register_lazy(hook_name, loader)
+
+        self._lazy_extensions.append(ext_module)
+
+    def _load_lazy_extension(self, ext_module):
+        # called (possibly more than once) by the handler/hook managers when
+        # one of the extension's handlers or hooks are first needed
+        if ext_module not in self._lazy_extensions:
+            return
+
+        LOG.debug("loading lazily registered framework extension '%s'" %
+                  ext_module)
+        self._lazy_extensions.remove(ext_module)
+        self._load_extension(ext_module)
 
+    def _load_lazy_extension_when(self, ext_module, when):
+        # hook loader for extensions whose hooks only matter on some runs,
+        # returning False (to be called again) if it did not load anything
+        if ext_module in self._lazy_extensions and not when(self.app):
+            return False
+        self._load_lazy_extension(ext_module)
+
+    def _load_extension(self, ext_module):
         LOG.debug("loading the '%s' framework extension" % ext_module)
         try:
-            if ext_module not in sys.modules:
-                __import__(ext_module, globals(), locals(), [], 0)
+            with self._profile(ext_module):
+                if ext_module not in sys.modules:
+                    __import__(ext_module, globals(), locals(), [], 0)
 
-            if hasattr(sys.modules[ext_module], 'load'):
-                sys.modules[ext_module].load(self.app)
+                if hasattr(sys.modules[ext_module], 'load'):
+                    sys.modules[ext_module].load(self.app)
 
             if ext_module not in self._loaded_extensions:
                 self._loaded_extensions.append(ext_module)
@@ -153,6 +321,14 @@ class CementExtensionHandler(handler.CementBaseHandler):
         except ImportError as e:
             raise exc.FrameworkError(e.args[0])
 
+    def _profile(self, ext_module):
+        # startup profiling is optional, and the application object might not
+        # be a CementApp (or might not be set at all)
+        profiler = getattr(self.app, '_profiler', None)
+        if profiler is None:
+            profiler = StartupProfiler(enabled=False)
+        return profiler.measure('extensions', ext_module)
+
     def load_extensions(self, ext_list):
         """
         Given a list of extension modules, iterate over the list and pass
@@ -3,6 +3,7 @@
 import os
 import sys
 import signal
+import inspect
 import platform
 from time import sleep
 from ..core import backend, exc, log, config, plugin
@@ -10,7 +11,9 @@ from ..core import output, extension, arg, controller, meta, cache, mail
 from ..core.handler import HandlerManager
 from ..core.hook import HookManager
 from ..utils.misc import is_true, minimal_logger
-from ..utils import fs
+from ..utils.profiler import StartupProfiler
+from ..utils.snapshot import SetupSnapshot, ParsedConfigCache
+from ..utils import fs, batch
 
 # The `imp` module is deprecated in favor of `importlib` in 3.4, but it
 # wasn't introduced until 3.1.  Finally, reload is a builtin on Python < 3
@@ -30,6 +33,32 @@ else:
     SIGNALS = [signal.SIGTERM, signal.SIGINT, signal.SIGHUP]
 
 
+def _merge_config_layers(*layers):
+    # merge config dicts (``{section: {key: value}}``), later layers take
+    # precedence
+    res = {}
+    for layer in layers:
+        for section, section_dict in layer.items():
+            res.setdefault(section, {}).update(section_dict)
+    return res
+
+
+def _diff_config_layers(old, new):
+    # returns the keys that were changed (or added), and removed, per section
+    changed = {}
+    removed = {}
+    for section in set(old) | set(new):
+        old_dict = old.get(section, {})
+        new_dict = new.get(section, {})
+        for key, value in new_dict.items():
+            if key not in old_dict or old_dict[key] != value:
+                changed.setdefault(section, set()).add(key)
+        for key in old_dict:
+            if key not in new_dict:
+                removed.setdefault(section, set()).add(key)
+    return changed, removed
+
+
 def add_handler_override_options(app):
     """
     This is a ``post_setup`` hook that adds the handler override options to
@@ -47,14 +76,21 @@ def add_handler_override_options(app):
                       " is not defined, can not override handlers")
             continue
 
-        if len(app.handler.list(i)) > 1:
+        # lazily registered handlers are listed without loading them
+        lazy = app.handler.list_lazy(i)
+        loaded = app.handler.list(i, load_lazy=False, validate=False)
+
+        if len(loaded) + len(lazy) > 1:
             handlers = []
-            for h in app.handler.list(i):
+            for h in loaded:
                 handlers.append(h())
 
             choices = [x._meta.label
                        for x in handlers
                        if x._meta.overridable is True]
+            choices.extend(sorted([label
+                                   for label, overridable in lazy.items()
+                                   if overridable is True]))
 
             # don't display the option if no handlers are overridable
             if not len(choices) > 0:
@@ -505,6 +541,47 @@ class CementApp(meta.MetaMixin):
         extensions = []
         """List of additional framework extensions to load."""
 
+        lazy_extensions = False
+        """
+        Whether or not to load extensions lazily.  If enabled, extensions
+        that are listed in the extension manifest (see
+        ``CementApp.Meta.extension_manifest``) are not imported during
+        ``setup()``.  Instead, their handlers are registered by label and
+        the extension is only imported (and loaded) the first time one of
+        its handlers is requested (i.e. ``app.handler.get()`` or
+        ``app.handler.resolve()``), or one of the hooks it declares is run.
+        Extensions not found in the manifest are loaded as usual.
+        """
+
+        extension_manifest = {}
+        """
+        Dictionary of additional extension manifests, used by
+        ``CementApp.Meta.lazy_extensions`` to know what an extension provides
+        without importing it.  These are merged with (and have precedence
+        over) the manifests of the extensions that ship with Cement
+        (``cement.core.extension.EXTENSION_MANIFEST``).
+
+        Dictionary Format:
+
+        .. code-block:: python
+
+            extension_manifest = {
+                'myapp.ext.ext_mysql': dict(
+                    handlers=dict(database=['mysql']),
+                    overridable=dict(database=['mysql']),
+                    hooks=['post_setup'],
+                ),
+            }
+
+        Every hook that the extension registers when loaded must be listed
+        under ``hooks``, otherwise its functions may not be registered
+        until after that hook has already run.  If the extension's hook
+        functions only do something on some runs, ``hooks_when`` can be set
+        to a function (taking the app object) so that those hooks only load
+        the extension once it returns ``True``.  See
+        ``cement.core.extension.handler_overridden()``.
+        """
+
         bootstrap = None
         """
         A bootstrapping module to load after app creation, and before
@@ -677,6 +754,109 @@ class CementApp(meta.MetaMixin):
         has changed or exists.
         """
 
+        profile_startup = False
+        """
+        Whether or not to profile application startup.  When enabled, the
+        wall time, CPU time, and allocated memory (Python 3.4+) of each
+        setup phase, extension loaded, and plugin loaded are recorded and
+        made available via ``CementApp.startup_stats``.
+
+        This option is also enabled by passing ``--profile-startup`` at
+        command line, if ``CementApp.Meta.profile_startup_option`` is
+        enabled.
+        """
+
+        profile_startup_option = False
+        """
+        Whether or not to add the ``--profile-startup`` command line option,
+        which enables ``CementApp.Meta.profile_startup``.  Disabled by
+        default, so that the option does not show up in (or conflict with
+        an option of) every application.
+        """
+
+        profile_startup_report = True
+        """
+        Whether or not to write a report of the startup profiling statistics
+        to ``sys.stderr`` when ``close()`` is called.  Only honored if
+        ``CementApp.Meta.profile_startup`` is enabled.
+        """
+
+        setup_snapshot = False
+        """
+        Whether or not to cache the results of parsing configuration files
+        (``CementApp.Meta.config_files``) and plugin configuration files
+        (``CementApp.Meta.plugin_config_dirs``) in a snapshot file.  On
+        subsequent runs the snapshot is restored in place of parsing the
+        files, as long as none of the files, directories, the application
+        module, or the relevant meta options have changed.  See
+        ``CementApp.Meta.setup_snapshot_file``.
+        """
+
+        setup_snapshot_file = None
+        """
+        The file system path of the setup snapshot file.  Only honored if
+        ``CementApp.Meta.setup_snapshot`` is enabled.  If ``None``, defaults
+        to ``~/.<app_label>/cache/setup.snapshot``.
+        """
+
+        config_cache = False
+        """
+        Whether or not to cache what is parsed from each configuration file
+        (application and plugin configuration files) in
+        ``CementApp.Meta.config_cache_dir``.  On subsequent runs, files
+        whose modification time and size are unchanged are loaded from the
+        cache rather than parsed again.  Unlike
+        ``CementApp.Meta.setup_snapshot``, files are cached individually,
+        so changing one file only causes that file to be parsed again.
+        """
+
+        config_cache_dir = None
+        """
+        The file system path of the directory where parsed configuration
+        files are cached.  Only honored if ``CementApp.Meta.config_cache``
+        is enabled.  If ``None``, defaults to ``~/.<app_label>/cache/config``.
+        Cache entries are pickled, so they are ignored unless this
+        directory (and the entry) are owned by the current user and not
+        writable by anyone else.
+        """
+
+        defer_handler_validation = False
+        """
+        Whether or not to defer validating the handlers listed in
+        ``CementApp.Meta.handlers`` against their interfaces until they are
+        first used, rather than when they are registered.  This speeds up
+        startup of applications that register many handlers, but only use a
+        few of them per run.  Note that invalid handlers then only raise
+        ``InterfaceError`` when they are used (for controllers, when a
+        command of the controller is dispatched).
+        """
+
+        incremental_reload = False
+        """
+        Whether or not ``reload()`` (and so ``run_forever()``) only rebuilds
+        what changed, rather than tearing down and setting up the whole
+        application again.  Configuration files (and plugin configuration
+        files) are re-parsed and diffed against what was loaded, changed
+        keys are updated in ``app.config``, and only the mail, cache, log,
+        and output handlers whose config section changed are setup again
+        (others keep their connections, open files, etc).  A full reload is
+        still done for changes that can not be applied in place (loaded
+        extensions, enabled plugins, ``meta_override`` settings, or keys
+        removed that have no default).
+        """
+
+        batch_mode = False
+        """
+        Whether or not to enable the ``--batch FILE`` command line option.
+        When passed, the application is setup once and then every line of
+        ``FILE`` (or ``sys.stdin`` if ``FILE`` is ``-``) is run as a separate
+        command line (see ``CementApp.run_batch()``).  Blank lines and lines
+        starting with ``#`` are ignored, and any other arguments passed
+        along with ``--batch`` are prepended to every line.  Passing
+        ``--parallel N`` as well runs the commands on ``N`` worker processes
+        (see ``CementApp.run_many()``).
+        """
+
         alternative_module_mapping = {}
         """
         EXPERIMENTAL FEATURE: This is an experimental feature added in Cement
@@ -727,8 +907,13 @@ class CementApp(meta.MetaMixin):
             self._meta.label = label
         self._validate_label()
         self._loaded_bootstrap = None
+        self._snapshot = None
+        self._config_cache = None
+        self._config_layer = None
+        self._plugin_config_layer = None
         self._parsed_args = None
         self._last_rendered = None
+        self._batch_overrides = None
         self._extended_members = []
         self.__saved_stdout__ = None
         self.__saved_stderr__ = None
@@ -756,8 +941,16 @@ class CementApp(meta.MetaMixin):
         if '--debug' in self.argv:
             self._meta.debug = True
 
+        if is_true(self._meta.profile_startup_option) and \
+                '--profile-startup' in self.argv:
+            self._meta.profile_startup = True
+        self._profiler = StartupProfiler(
+            enabled=is_true(self._meta.profile_startup)
+        )
+
         # setup the cement framework
-        self._lay_cement()
+        with self._profiler.measure('phases', 'lay_cement'):
+            self._lay_cement()
 
     @property
     def debug(self):
@@ -774,6 +967,20 @@ class CementApp(meta.MetaMixin):
         """The arguments list that will be used when self.run() is called."""
         return self._meta.argv
 
+    @property
+    def startup_stats(self):
+        """
+        Returns the startup profiling statistics if
+        ``CementApp.Meta.profile_startup`` is enabled, otherwise ``None``.
+        Statistics are a dictionary of lists (``phases``, ``extensions``,
+        and ``plugins``), where each item is a dictionary containing the
+        ``label``, ``wall`` and ``cpu`` time (in seconds), and allocated
+        ``memory`` (in bytes, or ``None`` if not available).
+
+        :returns: ``dict`` or ``None``
+        """
+        return self._profiler.stats
+
     def extend(self, member_name, member_object):
         """
         Extend the CementApp() object with additional functions/classes such
@@ -824,64 +1031,107 @@ class CementApp(meta.MetaMixin):
         complete.
 
         """
+        try:
+            self._setup_app()
+        finally:
+            # stop tracing memory allocations even if setup failed
+            self._profiler.stop()
+
+    def _setup_app(self):
         LOG.debug("now setting up the '%s' application" % self._meta.label)
+        profile = self._profiler.measure
 
         if self._meta.bootstrap is not None:
             LOG.debug("importing bootstrap code from %s" %
                       self._meta.bootstrap)
 
-            if self._meta.bootstrap not in sys.modules \
-                    or self._loaded_bootstrap is None:
-                __import__(self._meta.bootstrap, globals(), locals(), [], 0)
-                if hasattr(sys.modules[self._meta.bootstrap], 'load'):
-                    sys.modules[self._meta.bootstrap].load(self)
+            with profile('phases', 'bootstrap'):
+                if self._meta.bootstrap not in sys.modules \
+                        or self._loaded_bootstrap is None:
+                    __import__(self._meta.bootstrap, globals(), locals(),
+                               [], 0)
+                    if hasattr(sys.modules[self._meta.bootstrap], 'load'):
+                        sys.modules[self._meta.bootstrap].load(self)
 
-                self._loaded_bootstrap = sys.modules[self._meta.bootstrap]
-            else:
-                reload_module(self._loaded_bootstrap)
+                    self._loaded_bootstrap = \
+                        sys.modules[self._meta.bootstrap]
+                else:
+                    reload_module(self._loaded_bootstrap)
 
-        for res in self.hook.run('pre_setup', self):
-            pass
+        with profile('phases', 'pre_setup'):
+            for res in self.hook.run('pre_setup', self):
+                pass
+
+        with profile('phases', 'snapshot'):
+            self._load_snapshot()
+
+        # order is important here
+        phases = [
+            'extension_handler',
+            'signals',
+            'config_handler',
+            'mail_handler',
+            'cache_handler',
+            'log_handler',
+            'plugin_handler',
+            'arg_handler',
+            'output_handler',
+            'controllers',
+        ]
+        for phase in phases:
+            with profile('phases', phase):
+                getattr(self, '_setup_%s' % phase)()
 
-        self._setup_extension_handler()
-        self._setup_signals()
-        self._setup_config_handler()
-        self._setup_mail_handler()
-        self._setup_cache_handler()
-        self._setup_log_handler()
-        self._setup_plugin_handler()
-        self._setup_arg_handler()
-        self._setup_output_handler()
-        self._setup_controllers()
+        if self._snapshot is not None:
+            with profile('phases', 'snapshot'):
+                self._snapshot.save()
 
         for hook_spec in self.__retry_hooks__:
             self.hook.register(*hook_spec)
 
-        for res in self.hook.run('post_setup', self):
-            pass
+        with profile('phases', 'post_setup'):
+            for res in self.hook.run('post_setup', self):
+                pass
 
     def run(self):
         """
         This function wraps everything together (after self._setup() is
-        called) to run the application.
+        called) to run the application.  If the executed controller function
+        is a coroutine function (``async def``) it is run to completion on a
+        new asyncio event loop, use ``run_async()`` instead when already
+        running under an event loop.
+
+        If ``CementApp.Meta.batch_mode`` is enabled and ``--batch`` was
+        passed at command line, then the command lines of the batch are run
+        instead (see ``run_batch()``).
 
         :returns: Returns the result of the executed controller function if
           a base controller is set and a controller function is called,
           otherwise ``None`` if no controller dispatched or no controller
-          function was called.
+          function was called.  In batch mode, returns the ``list`` of
+          results as returned by ``run_batch()``.
 
         """
+        if self._meta.batch_mode is True:
+            batch_file, parallel, argv = self._get_batch_args()
+            if batch_file is not None:
+                return self._run_batch_file(batch_file, argv, parallel)
+
+        return self._run()
+
+    def _run(self):
         return_val = None
 
         LOG.debug('running pre_run hook')
         for res in self.hook.run('pre_run', self):
             pass
 
-        # If controller exists, then dispatch it
-        if self.controller:
-            return_val = self.controller._dispatch()
-        else:
-            self._parse_args()
+        return_val = self._dispatch()
+
+        # the controller function is a coroutine (``async def``)
+        if pyver >= (3, 6) and inspect.isawaitable(return_val):
+            from ..utils import aio
+            return_val = aio.run_until_complete(return_val)
 
         LOG.debug('running post_run hook')
         for res in self.hook.run('post_run', self):
@@ -889,55 +1139,539 @@ class CementApp(meta.MetaMixin):
 
         return return_val
 
-    def run_forever(self, interval=1, tb=True):
+    def run_batch(self, argvs, stop_on_error=False):
+        """
+        Run many command lines against the (already setup) application,
+        avoiding the cost of setting up the application for every command.
+        Every command line is dispatched the same as ``run()``, and
+        ``pargs``, the last rendered output, ``exit_code``, and any config
+        settings overridden by arguments (see
+        ``CementApp.Meta.arguments_override_config`` and
+        ``CementApp.Meta.override_arguments``) are reset between them.
+        Blank lines and comments (lines starting with ``#``) passed as
+        strings are skipped.
+
+        Exceptions raised by a command (including ``SystemExit``, i.e. from
+        ``--help`` or invalid arguments) are caught and recorded in its
+        result.  ``CaughtSignal`` is not caught, and ends the batch.  When
+        done, ``exit_code`` is set to the highest exit code of all commands.
+
+        :param argvs: An iterable of command lines, either as lists of
+          arguments or as strings (split using shell-like syntax).
+        :param stop_on_error: Whether or not to stop at the first command
+          with a non-zero exit code.
+        :returns: A ``list`` of ``cement.utils.batch.BatchResult`` objects,
+          one per command that was run.
+
+        Usage:
+
+        .. code-block:: python
+
+            from cement.core.foundation import CementApp
+
+            with CementApp('myapp') as app:
+                results = app.run_batch([
+                    ['my-command', '--foo', 'bar'],
+                    'my-command --foo baz',
+                ])
+
+                for res in results:
+                    print('%s: %s' % (' '.join(res.argv), res.exit_code))
+
+        """
+        saved_argv = self._meta.argv
+        try:
+            results = (self._run_batch_item(argv)
+                       for argv in self._batch_argvs(argvs))
+            return self._collect_batch_results(results, stop_on_error)
+        finally:
+            self._meta.argv = saved_argv
+
+    def run_command(self, argv):
+        """
+        Run a single command line against the (already setup) application,
+        the same as one command of ``run_batch()``: exceptions raised by the
+        command (other than ``CaughtSignal``) are caught and recorded in the
+        result, and config settings overridden by its arguments are reset
+        afterwards.  Unlike ``run_batch()``, ``exit_code`` is left set to
+        the exit code of the command.
+
+        :param argv: The command line arguments (``list``).
+        :returns: A ``cement.utils.batch.BatchResult`` object.
+
+        Usage:
+
+        .. code-block:: python
+
+            from cement.core.foundation import CementApp
+
+            with CementApp('myapp') as app:
+                res = app.run_command(['my-command', '--foo', 'bar'])
+                if res.error is not None:
+                    print('failed: %s' % res.error)
+
+        """
+        saved_argv = self._meta.argv
+        try:
+            return self._run_batch_item(argv)
+        finally:
+            self._meta.argv = saved_argv
+
+    def run_many(self, argvs, workers=None, ordered=True,
+                 stop_on_error=False):
+        """
+        Run many command lines the same as ``run_batch()``, but concurrently
+        on a pool of worker processes.  Workers are forked from the (already
+        setup) application, and every worker runs many commands, so the
+        application is never setup more than once.
+
+        Output written by the commands is not captured, and may interleave.
+        Return values and rendered output that can not be sent back from the
+        worker processes (i.e. that can not be pickled) are replaced with
+        ``None``.
+
+        If ``workers`` is ``1``, or running commands in worker processes is
+        not supported (requires Python 3.7+, and the ``fork``
+        multiprocessing start method), then the commands are run by
+        ``run_batch()`` instead.
+
+        :param argvs: An iterable of command lines, either as lists of
+          arguments or as strings (split using shell-like syntax).
+        :param workers: The number of worker processes.  Defaults to the
+          number of CPUs.
+        :param ordered: Whether to return results in the order of ``argvs``,
+          or in the order that the commands complete.
+        :param stop_on_error: Whether or not to stop at the first command
+          with a non-zero exit code.  Commands already running are still
+          completed.
+        :returns: A ``list`` of ``cement.utils.batch.BatchResult`` objects,
+          one per command that was run.
+
+        Usage:
+
+        .. code-block:: python
+
+            from cement.core.foundation import CementApp
+
+            with CementApp('myapp') as app:
+                argvs = [['process', path] for path in paths]
+                results = app.run_many(argvs, workers=8)
+
+        """
+        if workers is None:
+            import multiprocessing
+            workers = multiprocessing.cpu_count()
+        if int(workers) <= 1 or not batch.can_run_parallel():
+            LOG.debug('running batch commands serially')
+            return self.run_batch(argvs, stop_on_error=stop_on_error)
+
+        argvs = list(self._batch_argvs(argvs))
+        results = batch.run_parallel(self, argvs, int(workers),
+                                     ordered=ordered)
+        try:
+            return self._collect_batch_results(results, stop_on_error)
+        finally:
+            results.close()
+
+    def _batch_argvs(self, argvs):
+        for argv in argvs:
+            if not isinstance(argv, (list, tuple)):
+                argv = batch.parse_batch_line(argv)
+                if argv is None:
+                    continue
+            yield list(argv)
+
+    def _collect_batch_results(self, results, stop_on_error=False):
+        collected = []
+        for i, res in enumerate(results, 1):
+            collected.append(res)
+            if res.exit_code != 0:
+                self.log.error("batch command %s (%s) failed with exit "
+                               "code %s" % (i, ' '.join(res.argv),
+                                            res.exit_code))
+                if stop_on_error is True:
+                    break
+
+        self.exit_code = max([0] + [res.exit_code for res in collected])
+        return collected
+
+    def _run_batch_item(self, argv):
+        LOG.debug("running batch command: %s" % argv)
+        self._meta.argv = list(argv)
+        self._parsed_args = None
+        self._last_rendered = None
+        self._batch_overrides = {}
+        self.exit_code = 0
+
+        return_val = None
+        error = None
+        try:
+            return_val = self._run()
+            code = self.exit_code
+        except SystemExit as e:
+            code = batch.exit_code_from(e)
+        except exc.CaughtSignal:
+            raise
+        except Exception as e:
+            LOG.debug("batch command raised %s: %s" % (type(e).__name__, e))
+            error = e
+            code = self.exit_code or 1
+        finally:
+            # config settings overridden by arguments only apply to the
+            # command that passed them
+            overrides = self._batch_overrides
+            self._batch_overrides = None
+            for (section, key), value in overrides.items():
+                self.config.set(section, key, value)
+
+        return batch.BatchResult(argv, code, return_val,
+                                 self._last_rendered, error)
+
+    def _get_batch_args(self):
+        # returns the batch file passed with ``--batch``, the number of
+        # workers passed with ``--parallel``, and the rest of the arguments
+        options = {'--batch': None, '--parallel': None}
+        argv = []
+        args = list(self.argv)
+        while args:
+            arg = args.pop(0)
+            name = arg.split('=', 1)[0]
+            if arg == '--':
+                argv = argv + [arg] + args
+                break
+            elif name in options and '=' in arg:
+                options[name] = arg.split('=', 1)[1]
+            elif name in options and args:
+                options[name] = args.pop(0)
+            else:
+                argv.append(arg)
+
+        if options['--batch'] is None:
+            return (None, None, list(self.argv))
+
+        parallel = options['--parallel']
+        if parallel is not None:
+            try:
+                parallel = int(parallel)
+            except ValueError:
+                raise exc.FrameworkError(
+                    "Invalid value for --parallel: '%s'" % parallel)
+        return (options['--batch'], parallel, argv)
+
+    def _run_batch_file(self, path, prefix=None, parallel=None):
+        prefix = list(prefix or [])
+        argvs = (prefix + argv for argv in batch.read_batch(path))
+        if parallel is not None:
+            return self.run_many(argvs, workers=parallel)
+        return self.run_batch(argvs)
+
+    def run_async(self):
+        """
+        A coroutine that runs the application the same as ``run()``, but
+        from an asyncio event loop.  Controller functions that are coroutine
+        functions (``async def``) are awaited, and the ``pre_run`` and
+        ``post_run`` hooks are run with ``HookManager.run_async()``, meaning
+        that coroutine hook functions are awaited, and hooks of equal weight
+        run concurrently.  Requires Python 3.6+.
+
+        :returns: Returns the result of the executed controller function if
+          a base controller is set and a controller function is called,
+          otherwise ``None`` if no controller dispatched or no controller
+          function was called.
+
+        Usage:
+
+        .. code-block:: python
+
+            import asyncio
+            from cement.core.foundation import CementApp
+
+            async def main():
+                async with CementApp('myapp') as app:
+                    await app.run_async()
+
+            asyncio.get_event_loop().run_until_complete(main())
+
+        """
+        if sys.version_info < (3, 6):
+            raise exc.FrameworkError(                    # pragma: nocover
+                "CementApp.run_async() requires Python 3.6+")
+
+        from ..utils import aio
+        return aio.run_app(self)
+
+    def _dispatch(self):
+        # If controller exists, then dispatch it
+        if self.controller:
+            return self.controller._dispatch()
+        else:
+            self._parse_args()
+
+    def run_forever(self, interval=1, tb=True, scheduler=None):
         """
         This function wraps ``run()`` with an endless while loop.  If any
         exception is encountered it will be logged and then the application
         will be reloaded.
 
+        If a ``scheduler`` is passed, then runs are scheduled by it instead
+        (fixed rate or fixed delay, with optional jitter and backoff after
+        exceptions), and the application is only reloaded on demand:  when
+        one of the scheduler's ``reload_signals`` (``SIGHUP`` by default) is
+        caught, when ``scheduler.wake(reload=True)`` is called, or when the
+        ``reload_config`` extension detects a modified configuration file.
+        Exceptions are logged, but do not cause a reload (a reload that
+        raises an exception is logged too, and retried when the next run is
+        due, instead of running the application).  Runs continue
+        until ``scheduler.stop()`` is called, or a signal is caught (see
+        ``CementApp.Meta.catch_signals``).
+
         :param interval: The number of seconds to sleep before reloading the
             the appliction.
         :param tb: Whether or not to print traceback if exception occurs.
-        :returns: It should never return.
+        :param scheduler: A ``cement.utils.sched.Scheduler`` object.
+        :returns: It should never return (unless ``scheduler.stop()`` is
+            called).
+
+        Usage:
+
+        .. code-block:: python
+
+            from cement.utils.sched import Scheduler
+
+            with MyApp() as app:
+                scheduler = Scheduler(60, mode='fixed_rate', backoff=600)
+                app.run_forever(scheduler=scheduler)
+
         """
 
         if tb is True:
             import traceback
 
+        def log_exception(e):
+            self.log.fatal('Caught Exception: %s' % e)
+
+            if tb is True:
+                exc_type, exc_value, exc_traceback = sys.exc_info()
+                traceback.print_exception(
+                    exc_type, exc_value, exc_traceback, limit=2,
+                    file=sys.stdout
+                )
+
+        if scheduler is not None:
+            return self._run_scheduled(scheduler, log_exception)
+
         while True:
             LOG.debug('inside run_forever() eternal loop')
             try:
                 self.run()
             except Exception as e:
-                self.log.fatal('Caught Exception: %s' % e)
-
-                if tb is True:
-                    exc_type, exc_value, exc_traceback = sys.exc_info()
-                    traceback.print_exception(
-                        exc_type, exc_value, exc_traceback, limit=2,
-                        file=sys.stdout
-                    )
+                log_exception(e)
             sleep(interval)
             self.reload()
 
+    def _run_scheduled(self, scheduler, error_func):
+        def wake(app):
+            scheduler.wake(reload=True)
+
+        def watch_config():
+            # wake up when the reload_config extension detects changes (the
+            # hook is re-defined by a full reload)
+            if self.hook.defined('post_reload_config'):
+                self.hook.unregister('post_reload_config', wake)
+                self.hook.register('post_reload_config', wake)
+
+        def reload():
+            self.reload()
+            watch_config()
+
+        argv = list(self._meta.argv)
+
+        def run():
+            # every run dispatches the same command line
+            self._meta.argv = list(argv)
+            self._parsed_args = None
+            self.run()
+
+        watch_config()
+        try:
+            scheduler.run(run, reload_func=reload, error_func=error_func)
+        finally:
+            if self.hook.defined('post_reload_config'):
+                self.hook.unregister('post_reload_config', wake)
+
     def reload(self):
         """
         This function is useful for reloading a running applications, for
-        example to reload configuration settings, etc.
+        example to reload configuration settings, etc.  The ``pre_reload``
+        hook is run first, and the ``post_reload`` hook last.
+
+        If ``CementApp.Meta.incremental_reload`` is enabled, only the
+        configuration that changed is reloaded (see
+        ``CementApp.Meta.incremental_reload``), and the ``post_reload``
+        hook is passed a ``dict`` of the changed config sections, mapped to
+        the ``list`` of keys that changed.  Otherwise, the application is
+        torn down and setup again from scratch, and ``None`` is passed.
 
         :returns: ``None``
         """
         LOG.debug('reloading the %s application' % self._meta.label)
+        for res in self.hook.run('pre_reload', self):
+            pass
+
+        changes = None
+        if self._meta.incremental_reload is True \
+                and self._config_layer is not None:
+            changes = self._reload_incremental()
+        else:
+            self._reload_full()
+
+        for res in self.hook.run('post_reload', self, changes):
+            pass
+
+    def _reload_full(self):
         self._unlay_cement()
-        self._lay_cement()
+        self._profiler.reset()
+        with self._profiler.measure('phases', 'lay_cement'):
+            self._lay_cement()
         self.setup()
 
+    def _reload_incremental(self):
+        # re-read everything that was loaded from files, and diff it with
+        # what was loaded last time
+        config_layer = self._read_config_layer()
+        plugin_handler = self._read_plugin_configs()
+        plugin_layer = self._get_plugin_config_layer(plugin_handler)
+
+        old = _merge_config_layers(self._plugin_config_layer,
+                                   self._config_layer)
+        new = _merge_config_layers(plugin_layer, config_layer)
+        changed, removed = _diff_config_layers(old, new)
+
+        changes = {}
+        for section in set(changed) | set(removed):
+            keys = changed.get(section, set()) | removed.get(section, set())
+            changes[section] = sorted(keys)
+
+        full = False
+        if plugin_handler.get_enabled_plugins() != \
+                self.plugin.get_enabled_plugins():
+            LOG.debug('enabled plugins changed, doing a full reload')
+            full = True
+
+        overrides = set(self._meta.core_meta_override) | \
+            set(self._meta.meta_override) | set(['extensions'])
+        for section, keys in changes.items():
+            if 'enable_plugin' in keys:
+                full = True
+            if section == self._meta.config_section and \
+                    overrides.intersection(keys):
+                full = True
+
+        defaults = {}
+        for section, keys in removed.items():
+            for key in keys:
+                try:
+                    defaults[(section, key)] = \
+                        self._get_config_default(section, key)
+                except KeyError:
+                    LOG.debug("no default for removed config key "
+                              "'%s' -> '%s', doing a full reload" %
+                              (section, key))
+                    full = True
+
+        if full is True:
+            self._reload_full()
+            return changes
+
+        for section, keys in changed.items():
+            if section not in self.config.get_sections():
+                self.config.add_section(section)
+            for key in keys:
+                self.config.set(section, key, new[section][key])
+        for (section, key), value in defaults.items():
+            self.config.set(section, key, value)
+
+        self._config_layer = config_layer
+        self._plugin_config_layer = plugin_layer
+
+        # setup again only the handlers that use config that changed
+        for name in ['mail', 'cache', 'log', 'output']:
+            han = getattr(self, name, None)
+            if han is None:
+                continue
+            section = getattr(han._meta, 'config_section', None)
+            if section in changes:
+                LOG.debug("config section '%s' changed, setting up the %s "
+                          "handler again" % (section, name))
+                getattr(self, '_setup_%s_handler' % name)()
+
+        return changes
+
+    def _get_config_default(self, section, key):
+        # the default value of a config key, from the application or handler
+        # meta data (raises KeyError if there isn't one)
+        defaults = self._meta.config_defaults or {}
+        if key in defaults.get(section, {}):
+            return defaults[section][key]
+
+        for name in ['ext', 'config', 'mail', 'cache', 'log', 'plugin',
+                     'args', 'output']:
+            han = getattr(self, name, None)
+            if han is None or not hasattr(han, '_meta'):
+                continue
+            if getattr(han._meta, 'config_section', None) != section:
+                continue
+            han_defaults = getattr(han._meta, 'config_defaults', None) or {}
+            if key in han_defaults:
+                return han_defaults[key]
+
+        raise KeyError(key)
+
+    def _read_config_layer(self):
+        # parse the application config files into a separate config handler
+        # object, and return what was loaded from them
+        handler_class = self.handler.get('config', self.config._meta.label)
+        config_obj = handler_class()
+        config_obj._setup(self)
+        for _file in self._meta.config_files:
+            config_obj.parse_file(_file)
+
+        layer = {}
+        for section in config_obj.get_sections():
+            layer[section] = config_obj.get_section_dict(section)
+        return layer
+
+    def _read_plugin_configs(self):
+        # parse the plugin config files with a separate plugin handler
+        # object (and not from the setup snapshot, which might be stale)
+        plugin_handler = self.plugin.__class__()
+        snapshot, self._snapshot = self._snapshot, None
+        try:
+            plugin_handler._setup(self)
+        finally:
+            self._snapshot = snapshot
+        return plugin_handler
+
+    def _get_plugin_config_layer(self, plugin_handler):
+        # the plugin configs (as parsed by the plugin handler) of the loaded
+        # plugins
+        configs = getattr(plugin_handler, '_plugin_configs', {})
+        layer = {}
+        for plugin_name in self.plugin.get_loaded_plugins():
+            if plugin_name in configs:
+                layer[plugin_name] = dict(configs[plugin_name])
+        return layer
+
     def _unlay_cement(self):
         for member in self._extended_members:
             delattr(self, member)
         self._extended_members = []
         self.handler.__handlers__ = {}
+        self.handler.__lazy_handlers__ = {}
+        self.handler.__deferred_handlers__ = {}
         self.hook.__hooks__ = {}
+        self.hook.__lazy_hooks__ = {}
+        self.hook.__hook_cache__ = {}
 
     def close(self, code=None):
         """
@@ -953,8 +1687,33 @@ class CementApp(meta.MetaMixin):
         for res in self.hook.run('pre_close', self):
             pass
 
+        self._close(code)
+
+    def close_async(self, code=None):
+        """
+        A coroutine that closes the application the same as ``close()``, but
+        from an asyncio event loop.  The ``pre_close`` hook is run with
+        ``HookManager.run_async()``.  Requires Python 3.6+.
+
+        :param code: An exit code to exit with (``int``), if ``None`` is
+          passed then exit with whatever ``self.exit_code`` is currently set
+          to.  Note: ``sys.exit()`` will only be called if
+          ``CementApp.Meta.exit_on_close==True``.
+        """
+        if sys.version_info < (3, 6):
+            raise exc.FrameworkError(                    # pragma: nocover
+                "CementApp.close_async() requires Python 3.6+")
+
+        from ..utils import aio
+        return aio.close_app(self, code)
+
+    def _close(self, code=None):
         LOG.debug("closing the %s application" % self._meta.label)
 
+        if self._profiler.enabled and \
+                is_true(self._meta.profile_startup_report):
+            sys.stderr.write(self._profiler.render())
+
         # in theory, this should happen last-last... but at that point `self`
         # would be kind of busted after _unlay_cement() is run.
         for res in self.hook.run('post_close', self):
@@ -1085,10 +1844,16 @@ class CementApp(meta.MetaMixin):
         if self._meta.use_backend_globals is True:
             backend.__hooks__ = {}
             backend.__handlers__ = {}
-            self.handler = HandlerManager(use_backend_globals=True)
+            self.handler = HandlerManager(
+                use_backend_globals=True,
+                defer_validation=self._meta.defer_handler_validation,
+            )
             self.hook = HookManager(use_backend_globals=True)
         else:
-            self.handler = HandlerManager(use_backend_globals=False)
+            self.handler = HandlerManager(
+                use_backend_globals=False,
+                defer_validation=self._meta.defer_handler_validation,
+            )
             self.hook = HookManager(use_backend_globals=False)
 
         # define framework hooks
@@ -1103,6 +1868,8 @@ class CementApp(meta.MetaMixin):
         self.hook.define('signal')
         self.hook.define('pre_render')
         self.hook.define('post_render')
+        self.hook.define('pre_reload')
+        self.hook.define('post_reload')
 
         # define application hooks from meta
         for label in self._meta.define_hooks:
@@ -1148,8 +1915,7 @@ class CementApp(meta.MetaMixin):
         self.handler.register(extension.CementExtensionHandler)
 
         # register application handlers
-        for handler_class in self._meta.handlers:
-            self.handler.register(handler_class)
+        self.handler.register_many(self._meta.handlers)
 
     def _parse_args(self):
         for res in self.hook.run('pre_argument_parsing', self):
@@ -1158,29 +1924,49 @@ class CementApp(meta.MetaMixin):
         self._parsed_args = self.args.parse(self.argv)
 
         if self._meta.arguments_override_config is True:
-            for member in dir(self._parsed_args):
+            # only the parsed arguments (not every attribute of the object),
+            # each looked up in the index of config keys
+            try:
+                parsed = vars(self._parsed_args)
+            except TypeError:                           # pragma: nocover
+                parsed = dict((member, getattr(self._parsed_args, member))
+                              for member in dir(self._parsed_args))
+
+            for member, value in parsed.items():
                 if member and member.startswith('_'):
                     continue
 
                 # don't override config values for options that weren't passed
                 # or in otherwords are None
-                elif getattr(self._parsed_args, member) is None:
+                elif value is None:
                     continue
 
-                for section in self.config.get_sections():
-                    if member in self.config.keys(section):
-                        self.config.set(section, member,
-                                        getattr(self._parsed_args, member))
+                for section in self._get_config_key_sections(member):
+                    self._override_config(section, member, value)
 
         for member in self._meta.override_arguments:
-            for section in self.config.get_sections():
-                if member in self.config.keys(section):
-                    self.config.set(section, member,
-                                    getattr(self._parsed_args, member))
+            for section in self._get_config_key_sections(member):
+                self._override_config(section, member,
+                                      getattr(self._parsed_args, member))
 
         for res in self.hook.run('post_argument_parsing', self):
             pass
 
+    def _override_config(self, section, key, value):
+        # remember the original value, to be restored after a batch command
+        overrides = self._batch_overrides
+        if overrides is not None and (section, key) not in overrides:
+            overrides[(section, key)] = self.config.get(section, key)
+        self.config.set(section, key, value)
+
+    def _get_config_key_sections(self, key):
+        # config handlers not sub-classing from CementConfigHandler might not
+        # have a key index
+        if hasattr(self.config, 'get_key_sections'):
+            return self.config.get_key_sections(key)
+        return [section for section in self.config.get_sections()
+                if key in self.config.keys(section)]
+
     def catch_signal(self, signum):
         """
         Add ``signum`` to the list of signals to catch and handle by Cement.
@@ -1227,6 +2013,7 @@ class CementApp(meta.MetaMixin):
 
     def _setup_config_handler(self):
         LOG.debug("setting up %s.config handler" % self._meta.label)
+        self._setup_config_cache()
         self.config = self._resolve_handler('config',
                                             self._meta.config_handler)
         if self._meta.config_section is None:
@@ -1246,8 +2033,24 @@ class CementApp(meta.MetaMixin):
                 os.path.join(fs.HOME_DIR, '.%s' % label, 'config'),
             ]
 
-        for _file in self._meta.config_files:
-            self.config.parse_file(_file)
+        snapshot = self._snapshot
+        if self._meta.incremental_reload is True:
+            # parsed separately, so that reload() can diff them
+            self._config_layer = self._read_config_layer()
+            self.config.merge(self._config_layer)
+        elif snapshot is not None and snapshot.get('config') is not None:
+            LOG.debug("restoring config from setup snapshot")
+            self.config.merge(snapshot.get('config'))
+        else:
+            for _file in self._meta.config_files:
+                self.config.parse_file(_file)
+
+            if snapshot is not None:
+                snapshot.track(*self._meta.config_files)
+                config = {}
+                for section in self.config.get_sections():
+                    config[section] = self.config.get_section_dict(section)
+                snapshot.set('config', config)
 
         self.validate_config()
 
@@ -1292,6 +2095,53 @@ class CementApp(meta.MetaMixin):
                 # add to meta data
                 self._meta.extensions.append(ext)
 
+    def _setup_config_cache(self):
+        self._config_cache = None
+        if not is_true(self._meta.config_cache):
+            return
+
+        cache_dir = self._meta.config_cache_dir
+        if cache_dir is None:
+            label = self._meta.label
+            cache_dir = os.path.join(fs.HOME_DIR, '.%s' % label, 'cache',
+                                     'config')
+        self._config_cache = ParsedConfigCache(cache_dir)
+
+    def _load_snapshot(self):
+        self._snapshot = None
+        if not is_true(self._meta.setup_snapshot):
+            return
+
+        path = self._meta.setup_snapshot_file
+        if path is None:
+            label = self._meta.label
+            path = os.path.join(fs.HOME_DIR, '.%s' % label, 'cache',
+                                'setup.snapshot')
+
+        # everything (other than files) that the snapshot data depends on
+        key = dict(
+            version=list(backend.VERSION),
+            label=self._meta.label,
+            config_section=self._meta.config_section,
+            config_defaults=self._meta.config_defaults,
+            config_files=self._meta.config_files,
+            config_extension=self._meta.config_extension,
+            config_handler=str(self._meta.config_handler),
+            extensions=self._meta.extensions,
+            plugin_config_dirs=self._meta.plugin_config_dirs,
+            plugin_config_dir=self._meta.plugin_config_dir,
+        )
+        self._snapshot = SetupSnapshot(path, key=key)
+        self._snapshot.load()
+
+        # changes to the application code invalidate the snapshot
+        modules = [self.__class__.__module__, self._meta.bootstrap]
+        for name in modules:
+            module = sys.modules.get(name, None)
+            path = getattr(module, '__file__', None)
+            if path is not None:
+                self._snapshot.track(path)
+
     def _setup_mail_handler(self):
         LOG.debug("setting up %s.mail handler" % self._meta.label)
         self.mail = self._resolve_handler('mail',
@@ -1338,6 +2188,10 @@ class CementApp(meta.MetaMixin):
         self.plugin.load_plugins(self._meta.plugins)
         self.plugin.load_plugins(self.plugin.get_enabled_plugins())
 
+        if self._meta.incremental_reload is True:
+            self._plugin_config_layer = \
+                self._get_plugin_config_layer(self.plugin)
+
     def _setup_output_handler(self):
         if self._meta.output_handler is None:
             LOG.debug("no output handler defined, skipping.")
@@ -1390,6 +2244,20 @@ class CementApp(meta.MetaMixin):
         self.args.add_argument('--quiet', dest='suppress_output',
                                action='store_true',
                                help='suppress all output')
+        if is_true(self._meta.profile_startup_option):
+            self.args.add_argument('--profile-startup',
+                                   dest='profile_startup',
+                                   action='store_true',
+                                   help='display startup profiling '
+                                        'statistics')
+        if self._meta.batch_mode is True:
+            self.args.add_argument('--batch', dest='batch', metavar='FILE',
+                                   help='run every line of FILE (or - for '
+                                        'stdin) as a command')
+            self.args.add_argument('--parallel', dest='parallel', metavar='N',
+                                   type=int,
+                                   help='run the commands of --batch on N '
+                                        'worker processes')
 
         # merge handler override meta data
         if self._meta.handler_override_options is not None:
@@ -1505,3 +2373,15 @@ class CementApp(meta.MetaMixin):
         # only close the app if there are no unhandled exceptions
         if exc_type is None:
             self.close()
+
+    def __aenter__(self):
+        if sys.version_info < (3, 6):
+            raise exc.FrameworkError(                    # pragma: nocover
+                "'async with CementApp()' requires Python 3.6+")
+
+        from ..utils import aio
+        return aio.enter_app(self)
+
+    def __aexit__(self, exc_type, exc_value, exc_traceback):
+        from ..utils import aio
+        return aio.exit_app(self, exc_type)
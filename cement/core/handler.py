@@ -11,6 +11,62 @@ from ..utils.misc import minimal_logger
 LOG = minimal_logger(__name__)
 
 
+def _instantiate(handler_class):
+    try:
+        return handler_class()
+    except Exception as e:
+        LOG.debug("unable to instantiate %s to validate it: %s" %
+                  (handler_class, e))
+        return None
+
+
+def _get_validation_obj(handler_class):
+    # A stand-in for an instance of the handler class, with the class level
+    # meta data, without calling ``__init__()`` (which might be expensive).
+    # Handlers that only set their label/interface in ``__init__()`` are
+    # instantiated, as all handlers used to be.
+    obj = handler_class.__new__(handler_class)
+    obj._meta = meta.Meta()
+    obj._meta._merge(meta._get_meta_defaults(handler_class))
+    if not getattr(obj._meta, 'label', None) or \
+            not getattr(obj._meta, 'interface', None):
+        instance = _instantiate(handler_class)
+        if instance is not None:
+            obj = instance
+    return obj
+
+
+def _validate(interface, handler_class, obj=None):
+    # Validate a handler class against its interface.  The result is cached
+    # on the class (per interface) for as long as its meta data is unchanged
+    defaults = meta._get_meta_defaults(handler_class)
+    validated = handler_class.__dict__.get('__cement_validated__', None)
+    if validated is not None and validated.get(interface, None) is defaults:
+        return
+
+    if not hasattr(interface.IMeta, 'validator'):
+        LOG.debug("Interface '%s' does not have a validator() function!" %
+                  interface)
+        return
+
+    if obj is None:
+        obj = _get_validation_obj(handler_class)
+    try:
+        interface.IMeta().validator(obj)
+    except exc.InterfaceError as e:
+        # members set in ``__init__()`` are missing from the stand-in object,
+        # so fall back to validating an instance
+        obj = _instantiate(handler_class)
+        if obj is None:
+            raise e
+        interface.IMeta().validator(obj)
+
+    if validated is None:
+        validated = {}
+        setattr(handler_class, '__cement_validated__', validated)
+    validated[interface] = defaults
+
+
 class HandlerManager(object):
     """
     Manages the handler system to define, get, resolve, etc handlers with
@@ -18,13 +74,19 @@ class HandlerManager(object):
 
     :param use_backend_globals: Whether to use backend globals (backward
         compatibility and deprecated).
+    :param defer_validation: Whether handlers registered with
+        ``register_many()`` are validated when they are first used, rather
+        than when they are registered.
     """
 
-    def __init__(self, use_backend_globals=False):
+    def __init__(self, use_backend_globals=False, defer_validation=False):
         if use_backend_globals is True:
             self.__handlers__ = backend.__handlers__
         else:
             self.__handlers__ = {}
+        self.__lazy_handlers__ = {}
+        self.__deferred_handlers__ = {}
+        self.defer_validation = defer_validation
 
     def get(self, handler_type, handler_label, *args):
         """
@@ -51,7 +113,11 @@ class HandlerManager(object):
             raise exc.FrameworkError("handler type '%s' does not exist!" %
                                      handler_type)
 
+        if handler_label not in self.__handlers__[handler_type]:
+            self._load_lazy(handler_type, handler_label)
+
         if handler_label in self.__handlers__[handler_type]:
+            self._validate_deferred(handler_type, handler_label)
             return self.__handlers__[handler_type][handler_label]
         elif len(args) > 0:
             return args[0]
@@ -59,11 +125,17 @@ class HandlerManager(object):
             raise exc.FrameworkError("handlers['%s']['%s'] does not exist!" %
                                      (handler_type, handler_label))
 
-    def list(self, handler_type):
+    def list(self, handler_type, load_lazy=True, validate=True):
         """
         Return a list of handlers for a given ``handler_type``.
 
         :param handler_type: The type of handler (i.e. ``output``)
+        :param load_lazy: Whether or not to load any lazily registered
+         handlers of ``handler_type`` (see ``register_lazy()``) so that they
+         are included in the list.
+        :param validate: Whether or not to validate the listed handlers whose
+         validation was deferred (see ``register_many()``).  If ``False``,
+         they are validated later on, when fetched via ``get()``.
         :returns: List of handlers that match ``hander_type``.
         :rtype: ``list``
         :raises: :class:`cement.core.exc.FrameworkError`
@@ -79,10 +151,16 @@ class HandlerManager(object):
             raise exc.FrameworkError("handler type '%s' does not exist!" %
                                      handler_type)
 
+        if load_lazy is True:
+            for label in self.list_lazy(handler_type):
+                self._load_lazy(handler_type, label)
+
         res = []
         for label in self.__handlers__[handler_type]:
             if label == '__interface__':
                 continue
+            if validate is True:
+                self._validate_deferred(handler_type, label)
             res.append(self.__handlers__[handler_type][label])
         return res
 
@@ -187,10 +265,13 @@ class HandlerManager(object):
 
         """
 
+        self._register(handler_obj, force=force)
+
+    def _register(self, handler_obj, force=False, defer_validation=False):
         orig_obj = handler_obj
 
-        # for checks
-        obj = orig_obj()
+        # for checks (handlers are not instantiated to validate them)
+        obj = _get_validation_obj(orig_obj)
 
         if not hasattr(obj._meta, 'label') or not obj._meta.label:
             raise exc.InterfaceError("Invalid handler %s, " % orig_obj +
@@ -200,8 +281,9 @@ class HandlerManager(object):
                                      "missing '_meta.interface'.")
 
         # translate dashes to underscores
-        orig_obj.Meta.label = re.sub('-', '_', obj._meta.label)
-        obj._meta.label = re.sub('-', '_', obj._meta.label)
+        if '-' in obj._meta.label:
+            orig_obj.Meta.label = re.sub('-', '_', obj._meta.label)
+            obj._meta.label = orig_obj.Meta.label
 
         handler_type = obj._meta.interface.IMeta.label
         LOG.debug("registering handler '%s' into handlers['%s']['%s']" %
@@ -226,14 +308,124 @@ class HandlerManager(object):
                 )
 
         interface = self.__handlers__[handler_type]['__interface__']
-        if hasattr(interface.IMeta, 'validator'):
-            interface.IMeta().validator(obj)
+        if defer_validation is True:
+            self.__deferred_handlers__[(handler_type, obj._meta.label)] = \
+                orig_obj
         else:
-            LOG.debug("Interface '%s' does not have a validator() function!" %
-                      interface)
+            self.__deferred_handlers__.pop((handler_type, obj._meta.label),
+                                           None)
+            _validate(interface, orig_obj, obj)
 
         self.__handlers__[handler_type][obj._meta.label] = orig_obj
 
+    def register_many(self, handler_objs, force=False):
+        """
+        Register many handler objects at once (see ``register()``).  If
+        ``defer_validation`` is enabled, the handlers are not validated
+        against their interface until they are first used (via ``get()``,
+        ``list()``, or ``resolve()``), which can speed up application
+        startup when many handlers are registered but only a few are used.
+
+        :param handler_objs: A list of uninstantiated handler objects to
+         register.
+        :param force: Whether to allow replacement if an existing
+         handler of the same ``label`` is already registered.
+        :raises: :class:`cement.core.exc.InterfaceError`
+        :raises: :class:`cement.core.exc.FrameworkError`
+
+        Usage:
+
+        .. code-block:: python
+
+            app.handler.register_many([MyDatabaseHandler, MyCacheHandler])
+
+        """
+        for handler_obj in handler_objs:
+            self._register(handler_obj, force=force,
+                           defer_validation=self.defer_validation)
+
+    def _validate_deferred(self, handler_type, handler_label):
+        if not self.__deferred_handlers__:
+            return
+
+        handler_class = self.__deferred_handlers__.pop(
+            (handler_type, handler_label), None)
+        if handler_class is not None:
+            LOG.debug("validating deferred handlers['%s']['%s']" %
+                      (handler_type, handler_label))
+            interface = self.__handlers__[handler_type]['__interface__']
+            try:
+                _validate(interface, handler_class)
+            except exc.InterfaceError:
+                del self.__handlers__[handler_type][handler_label]
+                raise
+
+    def register_lazy(self, handler_type, handler_label, loader,
+                      overridable=False):
+        """
+        Register a placeholder for a handler that has not been imported yet.
+        The ``loader`` is called the first time that the handler is requested
+        via ``get()``, ``resolve()``, or ``list()`` and must register the
+        actual handler (generally by loading the extension that provides it).
+        Lazily registered handlers are considered ``registered()``.
+
+        :param handler_type: The type of handler (interface label).
+        :param handler_label: The label of the handler.
+        :param loader: A callable (taking no arguments) that registers the
+         actual handler.
+        :param overridable: Whether or not the handler will be overridable
+         (see ``CementApp.Meta.handler_override_options``).  Used to list
+         the handler as an override choice without loading it.
+
+        Usage:
+
+        .. code-block:: python
+
+            def load_mysql():
+                app.ext.load_extension('myapp.ext.ext_mysql')
+
+            app.handler.register_lazy('database', 'mysql', load_mysql)
+
+        """
+        if self.registered(handler_type, handler_label):
+            LOG.debug("handlers['%s']['%s'] already registered, " %
+                      (handler_type, handler_label) +
+                      "not registering it lazily")
+            return
+
+        LOG.debug("lazily registering handler into handlers['%s']['%s']" %
+                  (handler_type, handler_label))
+        if handler_type not in self.__lazy_handlers__:
+            self.__lazy_handlers__[handler_type] = {}
+        self.__lazy_handlers__[handler_type][handler_label] = dict(
+            loader=loader,
+            overridable=overridable,
+        )
+
+    def list_lazy(self, handler_type):
+        """
+        Return the handlers of ``handler_type`` that have been lazily
+        registered, but not loaded yet.
+
+        :param handler_type: The type of handler (i.e. ``output``)
+        :returns: Dictionary of ``{<handler_label>: <overridable>}``.
+        :rtype: ``dict``
+
+        """
+        lazy = self.__lazy_handlers__.get(handler_type, {})
+        return dict([(label, info['overridable'])
+                     for label, info in lazy.items()])
+
+    def _load_lazy(self, handler_type, handler_label):
+        lazy = self.__lazy_handlers__.get(handler_type, {})
+        if handler_label not in lazy:
+            return
+
+        LOG.debug("loading lazily registered handlers['%s']['%s']" %
+                  (handler_type, handler_label))
+        info = lazy.pop(handler_label)
+        info['loader']()
+
     def registered(self, handler_type, handler_label):
         """
         Check if a handler is registered.
@@ -253,6 +445,8 @@ class HandlerManager(object):
         if handler_type in self.__handlers__ and \
            handler_label in self.__handlers__[handler_type]:
             return True
+        elif handler_label in self.__lazy_handlers__.get(handler_type, {}):
+            return True
 
         return False
 
@@ -296,11 +490,15 @@ class HandlerManager(object):
         elif hasattr(handler_def, '_meta'):
             if not self.registered(handler_type, handler_def._meta.label):
                 self.register(handler_def.__class__)
+            else:
+                self._validate_deferred(handler_type, handler_def._meta.label)
             han = handler_def
         elif hasattr(handler_def, 'Meta'):
             han = handler_def(**meta_defaults)
             if not self.registered(handler_type, han._meta.label):
                 self.register(handler_def)
+            else:
+                self._validate_deferred(handler_type, han._meta.label)
 
         msg = "Unable to resolve handler '%s' of type '%s'" % \
               (handler_def, handler_type)
@@ -592,8 +790,8 @@ def register(handler_obj, force=False):
 
     orig_obj = handler_obj
 
-    # for checks
-    obj = orig_obj()
+    # for checks (handlers are not instantiated to validate them)
+    obj = _get_validation_obj(orig_obj)
 
     if not hasattr(obj._meta, 'label') or not obj._meta.label:
         raise exc.InterfaceError("Invalid handler %s, " % orig_obj +
@@ -603,8 +801,9 @@ def register(handler_obj, force=False):
                                  "missing '_meta.interface'.")
 
     # translate dashes to underscores
-    orig_obj.Meta.label = re.sub('-', '_', obj._meta.label)
-    obj._meta.label = re.sub('-', '_', obj._meta.label)
+    if '-' in obj._meta.label:
+        orig_obj.Meta.label = re.sub('-', '_', obj._meta.label)
+        obj._meta.label = orig_obj.Meta.label
 
     handler_type = obj._meta.interface.IMeta.label
     LOG.debug("registering handler '%s' into handlers['%s']['%s']" %
@@ -628,11 +827,7 @@ def register(handler_obj, force=False):
             )
 
     interface = backend.__handlers__[handler_type]['__interface__']
-    if hasattr(interface.IMeta, 'validator'):
-        interface.IMeta().validator(obj)
-    else:
-        LOG.debug("Interface '%s' does not have a validator() function!" %
-                  interface)
+    _validate(interface, orig_obj, obj)
 
     backend.__handlers__[handler_type][obj.Meta.label] = orig_obj
 
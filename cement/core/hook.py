@@ -1,5 +1,6 @@
 """Cement core hooks module."""
 
+import sys
 import operator
 import types
 from ..core import exc, backend
@@ -8,6 +9,21 @@ from ..utils.misc import minimal_logger
 LOG = minimal_logger(__name__)
 
 
+def _insert_hook(hooks, hook):
+    # keep hooks ordered by weight (the first item in the tuple), inserting
+    # after any hooks of the same weight so that they run in the order they
+    # were registered (same as a stable sort)
+    lo = 0
+    hi = len(hooks)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if hook[0] < hooks[mid][0]:
+            hi = mid
+        else:
+            lo = mid + 1
+    hooks.insert(lo, hook)
+
+
 class HookManager(object):
     """
     Manages the hook system to define, get, run, etc hooks within the
@@ -22,6 +38,8 @@ class HookManager(object):
             self.__hooks__ = backend.__hooks__
         else:
             self.__hooks__ = {}
+        self.__lazy_hooks__ = {}
+        self.__hook_cache__ = {}
 
     def define(self, name):
         """
@@ -108,7 +126,105 @@ class HookManager(object):
                   (func.__name__, func.__module__, name))
 
         # Hooks are as follows: (weight, name, func)
-        self.__hooks__[name].append((int(weight), func.__name__, func))
+        _insert_hook(self.__hooks__[name], (int(weight), func.__name__, func))
+        self.__hook_cache__.pop(name, None)
+
+    def unregister(self, name, func):
+        """
+        Unregister a function from a hook.  If the function was registered
+        more than once, all of its registrations are removed.
+
+        :param name: The name of the hook.  I.e. ``pre_setup``,
+            ``post_run``, etc.
+        :param func: The function to unregister from the hook.
+        :returns: True if the function was unregistered, False otherwise.
+        :rtype: ``boolean``
+
+        Usage:
+
+        .. code-block:: python
+
+            from cement.core.foundation import CementApp
+
+            def my_hook_func(app):
+                # do something with app?
+                return True
+
+            with CementApp('myapp') as app:
+                app.hook.define('my_hook_name')
+                app.hook.register('my_hook_name', my_hook_func)
+                app.hook.unregister('my_hook_name', my_hook_func)
+
+        """
+        if name not in self.__hooks__:
+            LOG.debug("hook name '%s' is not defined! ignoring..." % name)
+            return False
+
+        hooks = self.__hooks__[name]
+        keep = [hook for hook in hooks if hook[2] is not func]
+        if len(keep) == len(hooks):
+            LOG.debug("hook '%s' is not registered into hooks['%s']" %
+                      (func.__name__, name))
+            return False
+
+        LOG.debug("unregistering hook '%s' from %s from hooks['%s']" %
+                  (func.__name__, func.__module__, name))
+        hooks[:] = keep
+        self.__hook_cache__.pop(name, None)
+        return True
+
+    def _get_cached_hooks(self, name):
+        # cached tuples of the hook functions in weight order, and grouped by
+        # weight.  The list is also checked for changes made outside of
+        # register()/unregister() (i.e. the deprecated module functions when
+        # using backend globals)
+        hooks = self.__hooks__[name]
+        cached = self.__hook_cache__.get(name, None)
+        if cached is None or cached[0] is not hooks or \
+                cached[1] != len(hooks):
+            hooks.sort(key=operator.itemgetter(0))
+            groups = []
+            for weight, func_name, func in hooks:
+                if groups and groups[-1][0] == weight:
+                    groups[-1][1].append(func)
+                else:
+                    groups.append((weight, [func]))
+            cached = (hooks, len(hooks),
+                      tuple([hook[2] for hook in hooks]),
+                      tuple([tuple(group[1]) for group in groups]))
+            self.__hook_cache__[name] = cached
+        return cached
+
+    def _get_hook_funcs(self, name):
+        return self._get_cached_hooks(name)[2]
+
+    def _get_hook_groups(self, name):
+        return self._get_cached_hooks(name)[3]
+
+    def register_lazy(self, name, loader):
+        """
+        Register a ``loader`` to be called the first time that the hook
+        ``name`` is run.  This allows lazily registered extensions to be
+        loaded (and register their hook functions) only when one of the hooks
+        that they declare is actually run.  Unlike ``register()``, the hook
+        does not need to be defined yet.
+
+        :param name: The name of the hook.
+        :param loader: A callable (taking no arguments).  If it returns
+            ``False`` nothing was loaded, and it is called again the next
+            time that the hook is run.
+
+        """
+        LOG.debug("lazily registering loader into hooks['%s']" % name)
+        if name not in self.__lazy_hooks__:
+            self.__lazy_hooks__[name] = []
+        self.__lazy_hooks__[name].append(loader)
+
+    def _run_lazy_loaders(self, name):
+        keep = [loader for loader in self.__lazy_hooks__.pop(name, [])
+                if loader() is False]
+        if keep:
+            self.__lazy_hooks__[name] = keep
 
     def run(self, name, *args, **kwargs):
         """
@@ -139,15 +255,15 @@ class HookManager(object):
                     pass
 
         """
+        self._run_lazy_loaders(name)
+
         if name not in self.__hooks__:
             raise exc.FrameworkError("Hook name '%s' is not defined!" % name)
 
-        # Will order based on weight (the first item in the tuple)
-        self.__hooks__[name].sort(key=operator.itemgetter(0))
-        for hook in self.__hooks__[name]:
+        for func in self._get_hook_funcs(name):
             LOG.debug("running hook '%s' (%s) from %s" %
-                      (name, hook[2], hook[2].__module__))
-            res = hook[2](*args, **kwargs)
+                      (name, func, func.__module__))
+            res = func(*args, **kwargs)
 
             # Check if result is a nested generator - needed to support e.g.
             # asyncio
@@ -157,6 +273,57 @@ class HookManager(object):
             else:
                 yield res
 
+    def run_async(self, name, *args, **kwargs):
+        """
+        Run all defined hooks in the namespace from an asyncio event loop.
+        Hook functions may be coroutine functions (``async def``), in which
+        case they are awaited.  Hooks of equal weight are run concurrently
+        (with ``asyncio.gather()``), while results are still yielded in
+        weight order.  Requires Python 3.6+.
+
+        :param name: The name of the hook function.
+        :param args: Additional arguments to be passed to the hook functions.
+        :param kwargs: Additional keyword arguments to be passed to the hook
+            functions.
+        :returns: An asynchronous generator yielding the results of each
+            hook function.
+        :raises: cement.core.exc.FrameworkError - If the hook ``name`` does
+            not exist
+
+        Usage:
+
+        .. code-block:: python
+
+            import asyncio
+            from cement.core.foundation import CementApp
+
+            async def my_hook_func(app):
+                await warm_up_the_cache()
+                return True
+
+            async def main(app):
+                async for res in app.hook.run_async('my_hook_name', app):
+                    # do something with the result?
+                    pass
+
+            with CementApp('myapp') as app:
+                app.hook.define('my_hook_name')
+                app.hook.register('my_hook_name', my_hook_func)
+                asyncio.get_event_loop().run_until_complete(main(app))
+
+        """
+        if sys.version_info < (3, 6):
+            raise exc.FrameworkError(                    # pragma: nocover
+                "HookManager.run_async() requires Python 3.6+")
+
+        self._run_lazy_loaders(name)
+
+        if name not in self.__hooks__:
+            raise exc.FrameworkError("Hook name '%s' is not defined!" % name)
+
+        from ..utils import aio
+        return aio.run_hooks(name, self._get_hook_groups(name), args, kwargs)
+
 
 # the following is only used for backward compat with < 2.7.x!
 
@@ -271,7 +438,7 @@ def register(name, func, weight=0):
               (func.__name__, func.__module__, name))
 
     # Hooks are as follows: (weight, name, func)
-    backend.__hooks__[name].append((int(weight), func.__name__, func))
+    _insert_hook(backend.__hooks__[name], (int(weight), func.__name__, func))
 
 
 def run(name, *args, **kwargs):
@@ -311,9 +478,9 @@ def run(name, *args, **kwargs):
     if name not in backend.__hooks__:
         raise exc.FrameworkError("Hook name '%s' is not defined!" % name)
 
-    # Will order based on weight (the first item in the tuple)
-    backend.__hooks__[name].sort(key=operator.itemgetter(0))
-    for hook in backend.__hooks__[name]:
+    # hooks are kept in weight order by register(), iterate over a copy in
+    # case a hook function registers other hooks
+    for hook in tuple(backend.__hooks__[name]):
         LOG.debug("running hook '%s' (%s) from %s" %
                   (name, hook[2], hook[2].__module__))
         res = hook[2](*args, **kwargs)
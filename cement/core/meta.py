@@ -13,8 +13,35 @@ class Meta(object):
         self._merge(kwargs)
 
     def _merge(self, dict_obj):
-        for key in dict_obj.keys():
-            setattr(self, key, dict_obj[key])
+        self.__dict__.update(dict_obj)
+
+
+def _get_meta_defaults(cls):
+    # The merged Meta options of a class are cached on the class itself,
+    # along with copies of the Meta classes they were merged from so that
+    # changes to any of them (i.e. ``SomeHandler.Meta.label = 'foo'``) are
+    # picked up.
+    cached = cls.__dict__.get('__cement_meta_cache__', None)
+    if cached is not None:
+        for meta, attrs in cached[1]:
+            if meta.__dict__ != attrs:
+                break
+        else:
+            return cached[0]
+
+    # Get a List of all the Classes we in our MRO, find any attribute named
+    #     Meta on them, and then merge them together in order of MRO
+    metas = reversed([x.Meta for x in cls.mro() if hasattr(x, "Meta")])
+    defaults = {}
+    sources = []
+    for meta in metas:
+        defaults.update(dict([x for x in meta.__dict__.items()
+                              if not x[0].startswith("_")]))
+        if meta not in [source[0] for source in sources]:
+            sources.append((meta, dict(meta.__dict__)))
+
+    setattr(cls, '__cement_meta_cache__', (defaults, sources))
+    return defaults
 
 
 class MetaMixin(object):
@@ -26,23 +53,15 @@ class MetaMixin(object):
     """
 
     def __init__(self, *args, **kwargs):
-        # Get a List of all the Classes we in our MRO, find any attribute named
-        #     Meta on them, and then merge them together in order of MRO
-        metas = reversed([x.Meta for x in self.__class__.mro()
-                          if hasattr(x, "Meta")])
-        final_meta = {}
-
-        # Merge the Meta classes into one dict
-        for meta in metas:
-            final_meta.update(dict([x for x in meta.__dict__.items()
-                                    if not x[0].startswith("_")]))
-
-        # Update the final Meta with any kwargs passed in
-        for key in final_meta.keys():
-            if key in kwargs:
-                final_meta[key] = kwargs.pop(key)
-
-        self._meta = Meta(**final_meta)
+        # The Meta classes of our MRO are only merged once per class, kwargs
+        # passed in are applied on top of them
+        defaults = _get_meta_defaults(self.__class__)
+
+        self._meta = Meta()
+        self._meta._merge(defaults)
+        for key in list(kwargs.keys()):
+            if key in defaults:
+                setattr(self._meta, key, kwargs.pop(key))
 
         # FIX ME: object.__init__() doesn't take params without exception
         super(MetaMixin, self).__init__()
@@ -165,17 +165,26 @@ The above looks like:
 
 """
 
+import os
 import re
 import sys
+import heapq
 from argparse import ArgumentParser, SUPPRESS
+from collections import OrderedDict
 from ..core.handler import CementBaseHandler
 from ..core.arg import CementArgumentHandler, IArgument
-from ..core.controller import IController
+from ..core.controller import IController, get_exposed, register_exposed
 from ..core.exc import FrameworkError
 from ..utils.misc import minimal_logger
 
 LOG = minimal_logger(__name__)
 
+# resolved controller order, cached per set of controller classes so that
+# it is only computed once per process (i.e. for ``run_forever()``).  Only
+# the most recently resolved sets are kept (the oldest is dropped first).
+_CONTROLLER_ORDER_CACHE = OrderedDict()
+_CONTROLLER_ORDER_CACHE_SIZE = 32
+
 
 def _clean_label(label):
     return re.sub('_', '-', label)
@@ -271,6 +280,9 @@ class expose(object):
     :keyword parser_options: Additional options to pass to Argparse.
     :type parser_options: ``dict``
 
+    Exposed functions may also be coroutine functions (``async def``) on
+    Python 3.6+.  See ``CementApp.run()`` and ``CementApp.run_async()``.
+
     Usage:
 
     .. code-block:: python
@@ -455,6 +467,20 @@ class ArgparseController(CementBaseHandler):
         #: exception ``error: too few arguments``.
         default_func = 'default'
 
+        #: Whether or not to only build the sub-parsers of the nested
+        #: controllers and sub-commands that are actually referenced by the
+        #: command line arguments (only honored by the ``base`` controller).
+        #: Every sub-command is still listed in ``--help``, but its
+        #: arguments are not added to the parser unless it is called.  This
+        #: can greatly speed up dispatch for applications with a large
+        #: number of controllers and sub-commands.
+        lazy_parsers = False
+
+    def __init_subclass__(cls, **kw):
+        # Python 3.6+ only, see cement.core.controller.get_exposed()
+        super(ArgparseController, cls).__init_subclass__(**kw)
+        register_exposed(cls)
+
     def __init__(self, *args, **kw):
         super(ArgparseController, self).__init__(*args, **kw)
         self.app = None
@@ -465,6 +491,10 @@ class ArgparseController(CementBaseHandler):
             self._sub_parsers = dict()
             self._controllers = []
             self._controllers_map = {}
+            self._commands = {}
+            self._command_parsers = {}
+            self._built_commands = []
+            self._pre_parsed_controllers = []
 
         if self._meta.help is None:
             self._meta.help = '%s controller' % _clean_label(self._meta.label)
@@ -477,95 +507,154 @@ class ArgparseController(CementBaseHandler):
         self.app = app
 
     def _setup_controllers(self):
-        # need a list to maintain order
-        resolved_controllers = []
-
-        # need a dict to do key/label based lookup
-        resolved_controllers_map = {}
-
-        # list to maintain which controllers we haven't resolved yet
-        unresolved_controllers = []
-        for contr in self.app.handler.list('controller'):
+        # only resolve once, dispatch might be called more than once
+        if self._controllers:
+            return
+
+        # controllers are only validated once dispatched to (if validation is
+        # deferred, see CementApp.Meta.defer_handler_validation)
+        controllers = []
+        handlers = self.app.handler.list('controller', validate=False)
+        for contr in handlers:
             # don't include self/base
             if contr == self.__class__:
                 continue
 
             contr = contr()
             contr._setup(self.app)
-            unresolved_controllers.append(contr)
+            controllers.append(contr)
+
+        key = tuple(handlers)
+        if key in _CONTROLLER_ORDER_CACHE.keys():
+            LOG.debug('using cached controller nesting/embedding order')
+            contr_map = dict([(c.__class__, c) for c in controllers])
+            resolved_controllers = [self]
+            for contr_class in _CONTROLLER_ORDER_CACHE[key]:
+                resolved_controllers.append(contr_map[contr_class])
+        else:
+            resolved_controllers = self._resolve_controllers(controllers)
+            while len(_CONTROLLER_ORDER_CACHE) >= _CONTROLLER_ORDER_CACHE_SIZE:
+                _CONTROLLER_ORDER_CACHE.popitem(last=False)
+            _CONTROLLER_ORDER_CACHE[key] = [c.__class__
+                                            for c in resolved_controllers[1:]]
 
-        # treat self/base separately
-        resolved_controllers.append(self)
+        # need a dict to do key/label based lookup
+        resolved_controllers_map = {}
+        for contr in resolved_controllers[1:]:
+            resolved_controllers_map[contr._meta.label] = contr
         resolved_controllers_map['base'] = self
 
-        # all this crazy shit is to resolve controllers in the order that they
-        # are nested/embedded, otherwise argparse does weird things
+        self._controllers = resolved_controllers
+        self._controllers_map = resolved_controllers_map
 
+    def _resolve_controllers(self, controllers):
+        # resolve controllers in the order that they are nested/embedded,
+        # otherwise argparse does weird things.  The order is that of earlier
+        # versions, which repeatedly scanned the unresolved controllers (in
+        # registration order) until all of them were resolved.  Every scan:
+        #
+        #   1. resolves the controllers whose parent is already resolved
+        #      (including parents resolved earlier in the same scan), and
+        #      then the controllers stacked on the current parent
+        #   2. resolves the controllers stacked on the latter
+        #   3. makes the first unresolved controller the next parent
+        #
+        # where controllers resolved together are ordered nested first (most
+        # recently registered first) and then embedded.  Rather than scanning
+        # everything, controllers are only visited once their parent is.
         LOG.debug('resolving controller nesting/embedding order')
 
-        current_parent = self._meta.label
-        while unresolved_controllers:
-            LOG.debug('unresolved controllers > %s' % unresolved_controllers)
-            LOG.debug('current parent > %s' % current_parent)
-
-            # handle all controllers nested on parent
-            current_children = []
-            resolved_child_controllers = []
-            for contr in list(unresolved_controllers):
-                # if stacked_on is the current parent, we want to process
-                # its children in this run first
-                if contr._meta.stacked_on == current_parent:
-                    current_children.append(contr)
-                    if contr._meta.stacked_type == 'embedded':
-                        resolved_child_controllers.append(contr)
+        labels = set([c._meta.label for c in controllers])
+        labels.add(self._meta.label)
+
+        # index the stacked_on graph, parent label -> [(position, child)]
+        children = {}
+        for pos, contr in enumerate(controllers):
+            stacked_on = contr._meta.stacked_on
+            if stacked_on not in labels:
+                raise FrameworkError(
+                    "Controller '%s' is stacked on '%s', " %
+                    (contr._meta.label, stacked_on) +
+                    "but no controller with that label is registered!")
+            children.setdefault(stacked_on, []).append((pos, contr))
+
+        # anything not reachable from base is stacked on each other in a cycle
+        reachable = set([self._meta.label])
+        stack = [self._meta.label]
+        while stack:
+            for pos, contr in children.get(stack.pop(), []):
+                if contr._meta.label not in reachable:
+                    reachable.add(contr._meta.label)
+                    stack.append(contr._meta.label)
+        unresolved = [c._meta.label for c in controllers
+                      if c._meta.label not in reachable]
+        if unresolved:
+            raise FrameworkError(
+                "Controllers %s are stacked on each other in a cycle, " %
+                ', '.join(["'%s'" % label for label in sorted(unresolved)]) +
+                "and can not be resolved!")
+
+        done = [False] * len(controllers)
+
+        def unresolved_children(label):
+            # in registration order, each parent is only looked up once
+            return [(p, c) for p, c in children.pop(label, []) if not done[p]]
+
+        def resolve(resolved):
+            for pos, contr in resolved:
+                done[pos] = True
+                LOG.debug('resolved controller %s %s on %s' %
+                          (contr, contr._meta.stacked_type,
+                           contr._meta.stacked_on))
+                resolved_controllers.append(contr)
+
+        def ordered(resolved):
+            nested = [(p, c) for p, c in resolved
+                      if c._meta.stacked_type != 'embedded']
+            embedded = [(p, c) for p, c in resolved
+                        if c._meta.stacked_type == 'embedded']
+            return list(reversed(nested)) + embedded
+
+        resolved_controllers = [self]
+        ready = []      # children of resolved controllers, for the next scan
+        first = 0       # position of the first unresolved controller
+        parent = self._meta.label
+        while first < len(controllers):
+            current_children = unresolved_children(parent)
+            for pos, contr in current_children:
+                done[pos] = True
+
+            # controllers whose parent is resolved, in registration order
+            heapq.heapify(ready)
+            next_ready = []
+            while ready:
+                pos, contr = heapq.heappop(ready)
+                if done[pos]:
+                    continue
+                resolve([(pos, contr)])
+                for child in unresolved_children(contr._meta.label):
+                    if child[0] > pos:
+                        heapq.heappush(ready, child)
                     else:
-                        resolved_child_controllers.insert(0, contr)
-                    unresolved_controllers.remove(contr)
-                    LOG.debug('resolved controller %s %s on %s' %
-                              (contr, contr._meta.stacked_type,
-                               current_parent))
-
-                # if not, fall back on whether the stacked_on parent is
-                # already resolved
-                elif contr._meta.stacked_on in resolved_controllers_map.keys():
-                    resolved_controllers.append(contr)
-                    resolved_controllers_map[contr._meta.label] = contr
-                    unresolved_controllers.remove(contr)
-                    LOG.debug('resolved controller %s %s on %s' %
-                              (contr, contr._meta.stacked_type,
-                               contr._meta.stacked_on))
-
-            resolved_controllers.extend(resolved_child_controllers)
-            for contr in resolved_child_controllers:
-                resolved_controllers_map[contr._meta.label] = contr
-
-            # then, for all those controllers... handler all controllers
-            # nested on them
-            resolved_child_controllers = []
-            for child_contr in current_children:
-                for contr in list(unresolved_controllers):
-                    if contr._meta.stacked_on == child_contr._meta.label:
-                        if contr._meta.stacked_type == 'embedded':
-                            resolved_child_controllers.append(contr)
-                        else:
-                            resolved_child_controllers.insert(0, contr)
-
-                        unresolved_controllers.remove(contr)
-                        LOG.debug('resolved controller %s %s on %s' %
-                                  (contr, contr._meta.stacked_type,
-                                   child_contr._meta.label))
-
-            resolved_controllers.extend(resolved_child_controllers)
-            for contr in resolved_child_controllers:
-                resolved_controllers_map[contr._meta.label] = contr
-
-            # re-iterate with the next in line as the parent (handles multiple
-            # level nesting)
-            if unresolved_controllers:
-                current_parent = unresolved_controllers[0]._meta.label
+                        next_ready.append(child)
 
-        self._controllers = resolved_controllers
-        self._controllers_map = resolved_controllers_map
+            # then the children of the current parent, and their children
+            grand_children = []
+            for pos, contr in current_children:
+                grand_children.extend(unresolved_children(contr._meta.label))
+            resolve(ordered(current_children))
+            resolve(ordered(grand_children))
+
+            for pos, contr in grand_children:
+                next_ready.extend(unresolved_children(contr._meta.label))
+            ready = next_ready
+
+            while first < len(controllers) and done[first]:
+                first += 1
+            if first < len(controllers):
+                parent = controllers[first]._meta.label
+
+        return resolved_controllers
 
     def _process_parsed_arguments(self):
         pass
@@ -626,7 +715,18 @@ class ArgparseController(CementBaseHandler):
         return kwargs
 
     def _setup_parsers(self):
-        # this should only be run by the base controller
+        # this should only be run by the base controller, and only once per
+        # root parser (the argument handler might be re-created)
+        if self._parser is not None and self._parser is self.app.args:
+            return
+
+        self._sub_parser_parents = dict()
+        self._sub_parsers = dict()
+        self._commands = {}
+        self._command_parsers = {}
+        self._built_commands = []
+        self._pre_parsed_controllers = []
+
         from cement.utils.misc import rando
 
         _rando = rando()[:12]
@@ -661,9 +761,9 @@ class ArgparseController(CementBaseHandler):
                                      )
         self._parser = parsers['base']
 
-        # and if only base controller registered... go ahead and return
-        if len(self.app.handler.list('controller')) <= 1:
-            return    # pragma: nocover
+    def _setup_nested_parsers(self, selected=None):
+        parents = self._sub_parser_parents
+        parsers = self._sub_parsers
 
         # note that the order of self._controllers was already organized by
         # stacking/embedding order in self._setup_controllers ... order is
@@ -673,17 +773,34 @@ class ArgparseController(CementBaseHandler):
             stacked_on = contr._meta.stacked_on
             stacked_type = contr._meta.stacked_type
 
+            # skip base, and controllers whose parent namespace hasn't been
+            # built (lazy parsers)
+            if contr is self or stacked_on not in parents.keys():
+                continue
+
             if stacked_type == 'nested':
                 # if the controller is nested, we need to create a new parser
                 # parent using the one that it is stacked on, as well as as a
                 # new parser
-                kwargs = self._get_parser_options(contr)
-                parsers[label] = parents[stacked_on].add_parser(
-                    _clean_label(label),
-                    **kwargs
-                )
-
-                contr._parser = parsers[label]
+                if label not in parsers.keys():
+                    kwargs = self._get_parser_options(contr)
+                    parsers[label] = parents[stacked_on].add_parser(
+                        _clean_label(label),
+                        **kwargs
+                    )
+
+                    contr._parser = parsers[label]
+
+                if label in parents.keys():
+                    continue
+
+                names = [_clean_label(label)]
+                names.extend(self._get_parser_options(contr).get('aliases',
+                                                                 []))
+                if not self._is_selected(names, selected):
+                    LOG.debug("not building parsers for '%s' " % label +
+                              "controller namespace (not selected)")
+                    continue
 
                 # we need to add subparsers to this parser so we can
                 # attach commands and other nested controllers to it
@@ -702,8 +819,26 @@ class ArgparseController(CementBaseHandler):
             elif stacked_type == 'embedded':
                 # if it's embedded, then just set it to use the same as the
                 # controller its stacked on
-                parents[label] = parents[stacked_on]
-                parsers[label] = parsers[stacked_on]
+                if label not in parents.keys():
+                    parents[label] = parents[stacked_on]
+                    parsers[label] = parsers[stacked_on]
+
+    def _is_selected(self, names, selected):
+        if selected is None:
+            return True
+        for name in names:
+            if name in selected:
+                return True
+        return False
+
+    def _get_selected(self):
+        # the command line tokens that sub-parsers must be built for, or
+        # None to build all of them.  Argcomplete needs the full tree.
+        if self._meta.lazy_parsers is not True:
+            return None
+        elif '_ARGCOMPLETE' in os.environ.keys():
+            return None       # pragma: nocover
+        return set(self.app.argv)
 
     def _get_parser_by_controller(self, controller):
         if controller._meta.stacked_type == 'embedded':
@@ -739,27 +874,44 @@ class ArgparseController(CementBaseHandler):
             LOG.debug('adding argument (args=%s, kwargs=%s)' % (arg, kw))
             parser.add_argument(*arg, **kw)
 
-    def _process_commands(self, controller):
+    def _process_commands(self, controller, selected=None):
         label = controller._meta.label
         LOG.debug("processing commands for '%s' " % label +
                   "controller namespace")
 
-        commands = controller._collect_commands()
-        for command in commands:
+        if label not in self._commands.keys():
+            self._commands[label] = controller._collect_commands()
+
+        for command in self._commands[label]:
             kwargs = self._get_command_parser_options(command)
 
             func_name = command['func_name']
-            LOG.debug("adding command '%s' " % command['label'] +
-                      "(controller=%s, func=%s)" %
-                      (controller._meta.label, func_name))
+            default_contr_func = "%s.%s" % (command['controller']._meta.label,
+                                            command['func_name'])
+
+            if default_contr_func not in self._command_parsers.keys():
+                LOG.debug("adding command '%s' " % command['label'] +
+                          "(controller=%s, func=%s)" %
+                          (controller._meta.label, func_name))
 
-            cmd_parent = self._get_parser_parent_by_controller(controller)
-            command_parser = cmd_parent.add_parser(command['label'], **kwargs)
+                cmd_parent = self._get_parser_parent_by_controller(controller)
+                command_parser = cmd_parent.add_parser(command['label'],
+                                                       **kwargs)
+                self._command_parsers[default_contr_func] = command_parser
+
+            if default_contr_func in self._built_commands:
+                continue
+
+            names = [command['label']]
+            names.extend(kwargs.get('aliases', []))
+            if not self._is_selected(names, selected):
+                continue
+
+            command_parser = self._command_parsers[default_contr_func]
+            self._built_commands.append(default_contr_func)
 
             # add an invisible dispatch option so we can figure out what to
             # call later in self._dispatch
-            default_contr_func = "%s.%s" % (command['controller']._meta.label,
-                                            command['func_name'])
             command_parser.add_argument(self._dispatch_option,
                                         action='store',
                                         default=default_contr_func,
@@ -792,13 +944,9 @@ class ArgparseController(CementBaseHandler):
                   (self._meta.stacked_on, self._meta.stacked_type))
 
         commands = []
-        for member in dir(self.__class__):
-            if member.startswith('_'):
-                continue
-            elif hasattr(getattr(self, member), '__cement_meta__'):
-                func = getattr(self.__class__, member).__cement_meta__
-                func['controller'] = self
-                commands.append(func)
+        for func in get_exposed(self.__class__):
+            func['controller'] = self
+            commands.append(func)
 
         return commands
 
@@ -875,12 +1023,31 @@ class ArgparseController(CementBaseHandler):
         self._setup_controllers()
         self._setup_parsers()
 
+        selected = self._get_selected()
+        self._setup_nested_parsers(selected)
+
         for contr in self._controllers:
-            self._process_arguments(contr)
-            self._process_commands(contr)
+            label = contr._meta.label
+
+            # skip controllers whose namespace hasn't been built
+            if label not in self._sub_parser_parents.keys():
+                continue
+
+            # arguments are only added the first time the commands of a
+            # controller are processed
+            if label not in self._commands.keys():
+                self._process_arguments(contr)
+            self._process_commands(contr, selected)
 
         for contr in self._controllers:
+            label = contr._meta.label
+            if label not in self._sub_parser_parents.keys():
+                continue
+            elif label in self._pre_parsed_controllers:
+                continue
+
             contr._pre_argument_parsing()
+            self._pre_parsed_controllers.append(label)
 
         self.app._parse_args()
 
@@ -912,6 +1079,7 @@ class ArgparseController(CementBaseHandler):
             contr = self
         else:
             contr = self._controllers_map[contr_label]
+            self.app.handler.get('controller', contr_label)
 
         if hasattr(contr, func_name):
             func = getattr(contr, func_name)
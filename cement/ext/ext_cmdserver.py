@@ -0,0 +1,469 @@
+"""
+The Command Server Extension keeps a fully setup application resident, and
+serves its commands to other processes on the same host over a unix domain
+socket.  Callers avoid the cost of starting Python, importing the
+application, and running ``app.setup()`` for every command.
+
+Requests are served by a pool of worker processes that are forked from the
+(already setup) server process.  Every worker handles one request at a time,
+and is replaced by a fresh worker after handling ``max_requests`` requests,
+limiting the effect of any state leaking from one command to the next.
+Processes are used rather than threads, as the application object (parsed
+arguments, rendered output, exit code) and the standard output/error streams
+are process wide.
+
+The protocol is a 4 byte (network byte order) length prefix, followed by a
+UTF-8 encoded JSON object, in both directions.  Requests look like:
+
+.. code-block:: javascript
+
+    {"argv": ["my-command", "--foo", "bar"]}
+
+And responses look like:
+
+.. code-block:: javascript
+
+    {
+        "exit_code": 0,
+        "rendered": "the output text of the last call to app.render()",
+        "stdout": "everything the command wrote to stdout",
+        "stderr": "everything the command wrote to stderr"
+    }
+
+Requirements
+------------
+
+ * Available on Unix/Linux only
+
+
+Configuration
+-------------
+
+The command server extension is configurable with the following settings
+under the ``[cmdserver]`` section.
+
+    * **socket_path** - The filesystem path of the unix socket to listen on.
+      Default: ``~/.<app_label>/cmdserver.sock``
+    * **workers** - The number of worker processes.  If ``0``, requests are
+      served one at a time by the server process itself.  Default: ``4``
+    * **max_requests** - The number of requests a worker handles before it
+      is replaced.  If ``0``, workers are never replaced.  Default: ``1000``
+    * **timeout** - Seconds to wait for a client to send its request, before
+      dropping the connection (so that a stalled client does not hold up a
+      worker).  Default: ``30``
+    * **max_request_size** - The maximum size (in bytes) of a request.
+      Larger requests are dropped.  Default: ``1048576``
+
+An existing file at ``socket_path`` is only replaced if it is a unix socket
+owned by the current user.
+
+Workers that exit with an error are replaced, after a delay that grows
+with every worker that failed right after starting.  If that happens
+``WORKER_MAX_FAILURES`` times in a row, ``serve()`` gives up and raises
+``FrameworkError``.
+
+
+Usage
+-----
+
+The server is started from the application like any other long running
+process:
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['cmdserver']
+
+    with MyApp() as app:
+        app.cmdserver.serve()
+
+
+Clients can use ``command_client()``, or implement the protocol themselves:
+
+.. code-block:: python
+
+    import sys
+    from cement.ext.ext_cmdserver import command_client
+
+    res = command_client('~/.myapp/cmdserver.sock', ['my-command'])
+    if res is None:
+        # the server is not running
+        pass
+    else:
+        sys.stdout.write(res['stdout'])
+        sys.stderr.write(res['stderr'])
+        sys.exit(res['exit_code'])
+
+"""
+
+import io
+import os
+import sys
+import json
+import stat
+import errno
+import signal
+import socket
+import time
+import struct
+import tempfile
+from contextlib import contextmanager
+from ..core import exc
+from ..utils.misc import minimal_logger
+from ..utils.fs import abspath
+
+LOG = minimal_logger(__name__)
+
+HEADER = struct.Struct('!I')
+
+# workers failing within WORKER_MIN_UPTIME seconds of starting are replaced
+# after an exponential delay (of at most WORKER_MAX_BACKOFF seconds), and
+# serve() gives up after WORKER_MAX_FAILURES such failures in a row
+WORKER_MIN_UPTIME = 1.0
+WORKER_MAX_BACKOFF = 5.0
+WORKER_MAX_FAILURES = 10
+
+
+def _recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError('connection closed by peer')
+        data += chunk
+    return data
+
+
+def send_message(sock, data):
+    """
+    Send a length prefixed JSON message.
+
+    :param sock: The connected socket.
+    :param data: The JSON serializable data to send.
+
+    """
+    payload = json.dumps(data).encode('utf-8')
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock, max_size=None):
+    """
+    Receive a length prefixed JSON message.
+
+    :param sock: The connected socket.
+    :param max_size: The maximum size of the message (in bytes), or
+        ``None`` for no limit.
+    :returns: The decoded data.
+    :raises: EOFError - If the connection is closed before a complete
+        message was received.
+    :raises: ValueError - If the message is larger than ``max_size``, or
+        is not valid JSON.
+
+    """
+    length = HEADER.unpack(_recv_exactly(sock, HEADER.size))[0]
+    if max_size is not None and length > max_size:
+        raise ValueError('message of %s bytes exceeds the maximum of %s' %
+                         (length, max_size))
+    return json.loads(_recv_exactly(sock, length).decode('utf-8'))
+
+
+def command_client(socket_path, argv, timeout=None):
+    """
+    Run a command on the command server listening at ``socket_path``.
+
+    :param socket_path: The filesystem path of the server's unix socket.
+    :param argv: The command line arguments (``list``).
+    :param timeout: Seconds to wait for the command to complete, or
+        ``None`` to wait forever.
+    :returns: The response (``dict``) with the ``exit_code``, ``rendered``
+        output, ``stdout``, and ``stderr`` of the command, or ``None`` if
+        the server is not available.
+    :raises: cement.core.exc.FrameworkError - If the connection is closed
+        before a complete response is received (i.e. the worker died).
+
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(abspath(socket_path))
+    except (OSError, socket.error):
+        sock.close()
+        return None
+
+    try:
+        send_message(sock, dict(argv=list(argv)))
+        try:
+            return recv_message(sock)
+        except EOFError:
+            raise exc.FrameworkError(
+                "The command server closed the connection before sending a "
+                "response (the worker process may have died)")
+    finally:
+        sock.close()
+
+
+@contextmanager
+def _capture_output():
+    # capture at the file descriptor level so that everything is captured,
+    # including output written to stream objects that were bound to
+    # stdout/stderr before the request (i.e. log handlers)
+    files = [tempfile.TemporaryFile(), tempfile.TemporaryFile()]
+    streams = [sys.stdout, sys.stderr]
+    for stream in streams:
+        stream.flush()
+
+    saved = [os.dup(1), os.dup(2)]
+    try:
+        for fd, f in zip([1, 2], files):
+            os.dup2(f.fileno(), fd)
+
+        # the std streams might not be bound to fds 1/2 (i.e. if they were
+        # replaced), in which case wrap the fds for the request
+        for fd, name in zip([1, 2], ['stdout', 'stderr']):
+            try:
+                fileno = getattr(sys, name).fileno()
+            except (AttributeError, ValueError, io.UnsupportedOperation):
+                fileno = None
+            if fileno != fd:
+                setattr(sys, name, io.open(fd, 'w', closefd=False))
+
+        yield files
+    finally:
+        for stream in set([sys.stdout, sys.stderr] + streams):
+            try:
+                stream.flush()
+            except (ValueError, IOError, OSError):     # pragma: nocover
+                pass                                    # pragma: nocover
+        sys.stdout, sys.stderr = streams
+        for fd, saved_fd in zip([1, 2], saved):
+            os.dup2(saved_fd, fd)
+            os.close(saved_fd)
+
+
+class CommandServer(object):
+
+    """
+    Serves the commands of the (already setup) application over a unix
+    socket, using a pool of pre-forked worker processes.  See
+    ``command_client()``.
+
+    :param app: The application object.
+
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.socket_path = None
+        self._sock = None
+        self._timeout = None
+        self._max_request_size = None
+
+        # worker pid -> time started
+        self._workers = {}
+
+    def serve(self, socket_path=None, workers=None, max_requests=None):
+        """
+        Listen for, and handle requests until the process is signaled to
+        stop.
+
+        :param socket_path: The filesystem path of the unix socket to listen
+         on.  Defaults to the ``[cmdserver] -> socket_path`` setting.
+        :param workers: The number of worker processes.  Defaults to the
+         ``[cmdserver] -> workers`` setting.
+        :param max_requests: The number of requests a worker handles before
+         it is replaced.  Defaults to the ``[cmdserver] -> max_requests``
+         setting.
+        :raises: cement.core.exc.FrameworkError - If the socket can not be
+         used, something other than a socket owned by the current user
+         exists at ``socket_path``, or workers keep failing right after
+         starting.
+
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            raise exc.FrameworkError(                    # pragma: nocover
+                "The cmdserver extension requires unix domain sockets")
+
+        if socket_path is None:
+            socket_path = self.app.config.get('cmdserver', 'socket_path')
+        if workers is None:
+            workers = self.app.config.get('cmdserver', 'workers')
+        if max_requests is None:
+            max_requests = self.app.config.get('cmdserver', 'max_requests')
+
+        self.socket_path = abspath(socket_path)
+        workers = int(workers)
+        max_requests = int(max_requests)
+        self._timeout = float(self.app.config.get('cmdserver', 'timeout'))
+        self._max_request_size = int(
+            self.app.config.get('cmdserver', 'max_request_size'))
+
+        if not os.path.exists(os.path.dirname(self.socket_path)):
+            os.makedirs(os.path.dirname(self.socket_path))
+        if os.path.lexists(self.socket_path):
+            # i.e. left behind by a server that was killed, but don't remove
+            # anything else
+            st = os.lstat(self.socket_path)
+            if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+                raise exc.FrameworkError(
+                    "Refusing to replace '%s', " % self.socket_path +
+                    "it is not a unix socket owned by the current user")
+            os.remove(self.socket_path)
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # create the socket accessible only by the current user, rather
+        # than restricting it after the fact
+        umask = os.umask(0o177)
+        try:
+            self._sock.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+        self._sock.listen(128)
+
+        LOG.debug("command server listening on '%s' (workers: %s, "
+                  "max_requests: %s)" %
+                  (self.socket_path, workers, max_requests))
+        try:
+            if workers <= 0:
+                self._serve_requests(0)
+            else:
+                for i in range(workers):
+                    self._spawn_worker(max_requests)
+                self._supervise(max_requests)
+        finally:
+            self._stop_workers()
+            self._sock.close()
+            self._sock = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def _supervise(self, max_requests):
+        # replace workers as they exit (i.e. after max_requests), backing off
+        # if they fail right after starting rather than forking in a loop
+        failures = 0
+        while True:
+            try:
+                pid, status = os.wait()
+            except OSError as e:
+                if e.errno == errno.EINTR:               # pragma: nocover
+                    continue                            # pragma: nocover
+                raise
+
+            if pid not in self._workers:
+                continue                                # pragma: nocover
+
+            started = self._workers.pop(pid)
+            LOG.debug("command server worker %s exited (status %s)" %
+                      (pid, status))
+            if status != 0 and time.time() - started < WORKER_MIN_UPTIME:
+                failures += 1
+            else:
+                failures = 0
+
+            if failures >= WORKER_MAX_FAILURES:
+                raise exc.FrameworkError(
+                    "Command server workers failed right after starting "
+                    "%s times in a row, giving up" % failures)
+            elif failures > 0:
+                time.sleep(min(0.1 * 2 ** failures, WORKER_MAX_BACKOFF))
+            self._spawn_worker(max_requests)
+
+    def _spawn_worker(self, max_requests):
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            code = 0
+            try:
+                self._workers = {}
+                self._serve_requests(max_requests)
+            except exc.CaughtSignal:
+                pass
+            except Exception as e:
+                LOG.debug("command server worker failed: %s" % e)
+                code = 1
+            finally:
+                os._exit(code)
+
+        LOG.debug("started command server worker %s" % pid)
+        self._workers[pid] = time.time()
+
+    def _stop_workers(self):
+        for pid in self._workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:                             # pragma: nocover
+                pass                                    # pragma: nocover
+        for pid in self._workers:
+            try:
+                os.waitpid(pid, 0)
+            except OSError:                             # pragma: nocover
+                pass                                    # pragma: nocover
+        self._workers = {}
+
+    def _serve_requests(self, max_requests):
+        handled = 0
+        while max_requests <= 0 or handled < max_requests:
+            conn, addr = self._sock.accept()
+            try:
+                self._handle(conn)
+            finally:
+                conn.close()
+            handled += 1
+
+    def _handle(self, conn):
+        conn.settimeout(self._timeout)
+        try:
+            request = recv_message(conn, self._max_request_size)
+        except (EOFError, ValueError, OSError, socket.error) as e:
+            LOG.debug('invalid command server request: %s' % e)
+            return
+
+        argv = request.get('argv') if isinstance(request, dict) else None
+        if not isinstance(argv, list):
+            send_message(conn, dict(exit_code=2, rendered=None, stdout='',
+                                    stderr='invalid request\n'))
+            return
+        argv = ['%s' % arg for arg in argv]
+
+        with _capture_output() as (out, err):
+            res = self.app.run_command(argv)
+            if res.error is not None:
+                sys.stderr.write('%s: %s\n' %
+                                 (type(res.error).__name__, res.error))
+
+        response = dict(exit_code=res.exit_code, rendered=None)
+        if res.rendered is not None:
+            response['rendered'] = res.rendered[1]
+        for key, f in zip(['stdout', 'stderr'], [out, err]):
+            f.seek(0)
+            response[key] = f.read().decode('utf-8', 'replace')
+            f.close()
+
+        try:
+            send_message(conn, response)
+        except (OSError, socket.error) as e:
+            LOG.debug('unable to send command server response: %s' % e)
+
+
+def extend_app(app):
+    """
+    Sets the default ``[cmdserver]`` config section options, and adds the
+    ``app.cmdserver`` server object.
+
+    """
+    defaults = dict()
+    defaults['cmdserver'] = dict()
+    defaults['cmdserver']['socket_path'] = os.path.join(
+        '~', '.%s' % app._meta.label, 'cmdserver.sock')
+    defaults['cmdserver']['workers'] = 4
+    defaults['cmdserver']['max_requests'] = 1000
+    defaults['cmdserver']['timeout'] = 30
+    defaults['cmdserver']['max_request_size'] = 1048576
+    app.config.merge(defaults, override=False)
+    app.extend('cmdserver', CommandServer(app))
+
+
+def load(app):
+    app.hook.register('post_setup', extend_app)
@@ -118,8 +118,8 @@ import os
 import sys
 import logging
 from colorlog import ColoredFormatter
+from ..core import config
 from ..ext.ext_logging import LoggingLogHandler
-from ..utils.misc import is_true
 
 
 class ColorLogHandler(LoggingLogHandler):
@@ -176,23 +176,26 @@ class ColorLogHandler(LoggingLogHandler):
 
     def _get_console_format(self):
         format = super(ColorLogHandler, self)._get_console_format()
-        colorize = self.app.config.get('log.colorlog', 'colorize_console_log')
+        snapshot = config.get_snapshot(self.app.config)
+        colorize = snapshot.get_bool('log.colorlog', 'colorize_console_log')
         if sys.stdout.isatty() or 'CEMENT_TEST' in os.environ:
-            if is_true(colorize):
+            if colorize:
                 format = "%(log_color)s" + format
         return format
 
     def _get_file_format(self):
         format = super(ColorLogHandler, self)._get_file_format()
-        colorize = self.app.config.get('log.colorlog', 'colorize_file_log')
-        if is_true(colorize):
+        snapshot = config.get_snapshot(self.app.config)
+        colorize = snapshot.get_bool('log.colorlog', 'colorize_file_log')
+        if colorize:
             format = "%(log_color)s" + format
         return format
 
     def _get_console_formatter(self, format):
-        colorize = self.app.config.get('log.colorlog', 'colorize_console_log')
+        snapshot = config.get_snapshot(self.app.config)
+        colorize = snapshot.get_bool('log.colorlog', 'colorize_console_log')
         if sys.stdout.isatty() or 'CEMENT_TEST' in os.environ:
-            if is_true(colorize):
+            if colorize:
                 formatter = self._meta.formatter_class(
                     format,
                     log_colors=self._meta.colors
@@ -208,8 +211,9 @@ class ColorLogHandler(LoggingLogHandler):
         return formatter
 
     def _get_file_formatter(self, format):
-        colorize = self.app.config.get('log.colorlog', 'colorize_file_log')
-        if is_true(colorize):
+        snapshot = config.get_snapshot(self.app.config)
+        colorize = snapshot.get_bool('log.colorlog', 'colorize_file_log')
+        if colorize:
             formatter = self._meta.formatter_class(
                 format,
                 log_colors=self._meta.colors
@@ -147,6 +147,7 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         :returns: None
         """
         self[section][key] = value
+        self._key_changed(section, key)
 
     def has_section(self, section):
         """
@@ -170,6 +171,7 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         """
         if not self.has_section(section):
             self[section] = dict()
+            self._config_changed()
 
     def merge(self, dict_obj, override=True):
         """
@@ -40,9 +40,9 @@ from ..core import config
 from ..utils.misc import minimal_logger
 
 if sys.version_info[0] < 3:
-    from ConfigParser import RawConfigParser  # pragma: no cover
+    from ConfigParser import RawConfigParser, DEFAULTSECT  # pragma: no cover
 else:
-    from configparser import RawConfigParser  # pragma: no cover
+    from configparser import RawConfigParser, DEFAULTSECT  # pragma: no cover
 
 LOG = minimal_logger(__name__)
 
@@ -119,6 +119,47 @@ class ConfigParserConfigHandler(config.CementConfigHandler, RawConfigParser):
         # will likely raise an exception anyhow.
         return True
 
+    def set(self, section, key, value=None):
+        """
+        Set a configuration value at [section][key].
+
+        :param section: The config section (I.e. [block_section]).
+        :param key: The config key to set.
+        :param value: The value to set.
+
+        """
+        RawConfigParser.set(self, section, key, value)
+        if section == DEFAULTSECT:
+            # default keys show up in every section
+            self._config_changed()
+        else:
+            self._key_changed(section, self.optionxform(key))
+
+    def remove_option(self, section, key):
+        """
+        Remove a key from 'section'.
+
+        :param section: The config section (I.e. [block_section]).
+        :param key: The config key to remove.
+        :returns: True if the key existed, False otherwise.
+        :rtype: ``boolean``
+
+        """
+        self._config_changed()
+        return RawConfigParser.remove_option(self, section, key)
+
+    def remove_section(self, section):
+        """
+        Remove a block section from the config.
+
+        :param section: The section to remove.
+        :returns: True if the section existed, False otherwise.
+        :rtype: ``boolean``
+
+        """
+        self._config_changed()
+        return RawConfigParser.remove_section(self, section)
+
     def keys(self, section):
         """
         Return a list of keys within 'section'.
@@ -163,6 +204,7 @@ class ConfigParserConfigHandler(config.CementConfigHandler, RawConfigParser):
 
         """
         super(ConfigParserConfigHandler, self).add_section(section)
+        self._config_changed()
 
 
 def load(app):
@@ -99,7 +99,7 @@ Usage
 """
 
 import pylibmc
-from ..core import cache
+from ..core import cache, config
 from ..utils.misc import minimal_logger
 
 LOG = minimal_logger(__name__)
@@ -205,7 +205,8 @@ class MemcachedCacheHandler(cache.CementCacheHandler):
 
         """
         if time is None:
-            time = int(self._config('expire_time'))
+            snapshot = config.get_snapshot(self.app.config)
+            time = snapshot.get_int(self._meta.config_section, 'expire_time')
 
         self.mc.set(key, value, time=time, **kw)
 
@@ -221,6 +222,59 @@ class MemcachedCacheHandler(cache.CementCacheHandler):
         """
         self.mc.delete(key, **kw)
 
+    def get_many(self, keys, fallback=None, **kw):
+        """
+        Get the values of several keys from the cache, with a single
+        ``get_multi``.  Any additional keyword arguments will be passed
+        directly to the `pylibmc` get_multi function.
+
+        :param keys: The keys of the items in the cache to get.
+        :param fallback: The value to return for items that are not found
+         in the cache.
+        :returns: A dictionary of every key in `keys` mapped to its value
+         (or the `fallback`).
+        :rtype: ``dict``
+
+        """
+        keys = list(keys)
+        LOG.debug("getting %s cache values" % len(keys))
+        found = self.mc.get_multi(keys, **kw)
+        res = dict()
+        for key in keys:
+            res[key] = found.get(key, fallback)
+        return res
+
+    def set_many(self, data, time=None, **kw):
+        """
+        Set several values in the cache, with a single ``set_multi``.  Any
+        additional keyword arguments will be passed directly to the
+        `pylibmc` set_multi function.
+
+        :param data: A dictionary of the keys/values of the items to set.
+        :param time: The expiration time (in seconds) to keep the items
+         cached.  Defaults to `expire_time` as defined in the applications
+         configuration.
+        :returns: ``None``
+
+        """
+        if time is None:
+            snapshot = config.get_snapshot(self.app.config)
+            time = snapshot.get_int(self._meta.config_section, 'expire_time')
+
+        self.mc.set_multi(data, time=time, **kw)
+
+    def delete_many(self, keys, **kw):
+        """
+        Delete several items from the cache, with a single
+        ``delete_multi``.  Any additional keyword arguments will be passed
+        directly to the `pylibmc` delete_multi function.
+
+        :param keys: The keys of the items to delete from the cache.
+        :returns: ``None``
+
+        """
+        self.mc.delete_multi(list(keys), **kw)
+
     def purge(self, **kw):
         """
         Purge the entire cache, all keys and values will be lost.  Any
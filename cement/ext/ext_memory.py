@@ -0,0 +1,284 @@
+"""
+The Memory Extension provides application caching and key/value store
+support in the memory of the running process.  It is useful for memoizing
+expensive lookups where a round trip to a cache server would cost more than
+the work saved, however nothing is shared between processes, and nothing
+survives the process exiting.
+
+Requirements
+------------
+
+ * No external dependencies.
+
+Configuration
+-------------
+
+This extension honors the following config settings
+under a ``[cache.memory]`` section in any configuration file:
+
+    * **expire_time** - The default time in seconds to expire items in the
+      cache.  Default: 0 (does not expire).
+    * **max_entries** - The maximum number of items in the cache.  The
+      least recently used items are evicted to stay below it.  Default:
+      10000 (0 for no limit).
+    * **max_bytes** - The maximum (approximate) size in bytes of the items
+      in the cache, as measured by ``sys.getsizeof()``.  This is a shallow
+      size, that does not include the objects a value refers to (i.e. the
+      items of a ``list`` or ``dict``), so containers are counted as much
+      smaller than they really are.  The least recently used items are
+      evicted to stay below it.  Default: 0 (no limit).
+    * **purge_interval** - How often (in seconds) expired items are removed
+      from the cache, by a sweep of all items during a ``set()``.  Expired
+      items are also removed when they are accessed, or evicted as the
+      least recently used.  Default: 60 (0 to disable the sweep).
+
+
+Configurations can be passed as defaults to a CementApp:
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+    from cement.utils.misc import init_defaults
+
+    defaults = init_defaults('myapp', 'cache.memory')
+    defaults['cache.memory']['expire_time'] = 300
+    defaults['cache.memory']['max_entries'] = 1000
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            config_defaults = defaults
+            extensions = ['memory']
+            cache_handler = 'memory'
+
+
+Additionally, an application configuration file might have a section like
+the following:
+
+.. code-block:: text
+
+    [myapp]
+
+    # set the cache handler to use
+    cache_handler = memory
+
+
+    [cache.memory]
+
+    # time in seconds that an item in the cache will expire
+    expire_time = 300
+
+    # maximum number of items in the cache
+    max_entries = 1000
+
+
+Usage
+-----
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['memory']
+            cache_handler = 'memory'
+
+    with MyApp() as app:
+        # Run the app
+        app.run()
+
+        # Set a cached value
+        app.cache.set('my_key', 'my value')
+
+        # Get a cached value
+        app.cache.get('my_key')
+
+        # Delete a cached value
+        app.cache.delete('my_key')
+
+        # Delete the entire cache
+        app.cache.purge()
+
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from ..core import cache, config
+from ..utils.misc import minimal_logger
+
+try:
+    from time import monotonic as _clock
+except ImportError:                                 # pragma: nocover
+    from time import time as _clock                 # pragma: nocover
+
+LOG = minimal_logger(__name__)
+
+
+class MemoryCacheHandler(cache.CementCacheHandler):
+
+    """
+    This class implements the :ref:`ICache <cement.core.cache>`
+    interface.  It provides a thread safe, size bounded, least recently
+    used (LRU) cache in the memory of the running process, with per item
+    expiration.  Getting, setting and deleting items are O(1).
+    """
+
+    class Meta:
+
+        """Handler meta-data."""
+
+        interface = cache.ICache
+        label = 'memory'
+        config_defaults = dict(
+            expire_time=0,
+            max_entries=10000,
+            max_bytes=0,
+            purge_interval=60,
+        )
+
+    def __init__(self, *args, **kw):
+        super(MemoryCacheHandler, self).__init__(*args, **kw)
+        self._lock = threading.RLock()
+
+        # key -> (value, expires, size), in least to most recently used order
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._max_entries = 0
+        self._max_bytes = 0
+        self._purge_interval = 0
+        self._next_purge = None
+
+    def _setup(self, *args, **kw):
+        super(MemoryCacheHandler, self)._setup(*args, **kw)
+        snapshot = config.get_snapshot(self.app.config)
+        section = self._meta.config_section
+        self._max_entries = snapshot.get_int(section, 'max_entries', 0)
+        self._max_bytes = snapshot.get_int(section, 'max_bytes', 0)
+        self._purge_interval = snapshot.get_int(section, 'purge_interval', 0)
+        self._next_purge = None
+        if self._purge_interval:
+            self._next_purge = _clock() + self._purge_interval
+
+    def get(self, key, fallback=None, **kw):
+        """
+        Get a value from the cache.  Additional keyword arguments are ignored.
+
+        :param key: The key of the item in the cache to get.
+        :param fallback: The value to return if the item is not found in the
+         cache.
+        :returns: The value of the item in the cache, or the `fallback` value.
+
+        """
+        LOG.debug("getting cache value using key '%s'" % key)
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is None:
+                return fallback
+
+            value, expires, size = item
+            if expires is not None and expires <= _clock():
+                self._bytes -= size
+                return fallback
+
+            # re-insert as the most recently used
+            self._items[key] = item
+            return value
+
+    def set(self, key, value, time=None, **kw):
+        """
+        Set a value in the cache for the given ``key``.  Least recently used
+        items are evicted if the cache is full.  Additional keyword arguments
+        are ignored.
+
+        :param key: The key of the item in the cache to set.
+        :param value: The value of the item to set.
+        :param time: The expiration time (in seconds) to keep the item cached.
+         Defaults to `expire_time` as defined in the applications
+         configuration.
+        :returns: ``None``
+
+        """
+        if time is None:
+            snapshot = config.get_snapshot(self.app.config)
+            time = snapshot.get_int(self._meta.config_section, 'expire_time')
+
+        now = _clock()
+        expires = None
+        if time:
+            expires = now + time
+
+        size = 0
+        if self._max_bytes:
+            size = sys.getsizeof(value)
+
+        with self._lock:
+            self._purge_expired(now)
+
+            item = self._items.pop(key, None)
+            if item is not None:
+                self._bytes -= item[2]
+
+            self._items[key] = (value, expires, size)
+            self._bytes += size
+            self._evict()
+
+    def delete(self, key, **kw):
+        """
+        Delete an item from the cache for the given ``key``.  Additional
+        keyword arguments are ignored.
+
+        :param key: The key to delete from the cache.
+        :returns: True if the key existed, False otherwise.
+        :rtype: ``boolean``
+
+        """
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is None:
+                return False
+            self._bytes -= item[2]
+            return item[1] is None or item[1] > _clock()
+
+    def purge(self, **kw):
+        """
+        Purge the entire cache, all keys and values will be lost.  Any
+        additional keyword arguments are ignored.
+
+        :returns: ``None``
+
+        """
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def _over_limit(self):
+        if self._max_entries and len(self._items) > self._max_entries:
+            return True
+        return bool(self._max_bytes) and self._bytes > self._max_bytes
+
+    def _evict(self):
+        # evict least recently used items until within the limits (the item
+        # just set is kept, even if it is larger than max_bytes by itself)
+        while len(self._items) > 1 and self._over_limit():
+            key, item = self._items.popitem(last=False)
+            self._bytes -= item[2]
+            LOG.debug("evicted '%s' from the memory cache" % key)
+
+    def _purge_expired(self, now):
+        # remove all expired items, at most once every purge_interval (never
+        # if it is 0, as sweeping every set() would make it O(n))
+        if self._next_purge is None or now < self._next_purge:
+            return
+        self._next_purge = now + self._purge_interval
+
+        expired = [key for key, item in self._items.items()
+                   if item[1] is not None and item[1] <= now]
+        for key in expired:
+            self._bytes -= self._items.pop(key)[2]
+
+
+def load(app):
+    app.handler.register(MemoryCacheHandler)
@@ -28,6 +28,7 @@ import imp
 from ..core import plugin, exc
 from ..utils.misc import is_true, minimal_logger
 from ..utils.fs import abspath
+from ..utils.profiler import StartupProfiler
 
 LOG = minimal_logger(__name__)
 
@@ -69,13 +70,57 @@ class CementPluginHandler(plugin.CementPluginHandler):
         self.bootstrap = self.app._meta.plugin_bootstrap
         self.load_dirs = self.app._meta.plugin_dirs
 
+        # first parse plugin config dir for enabled plugins (or restore the
+        # results from the setup snapshot)
+        snapshot = getattr(self.app, '_snapshot', None)
+        cached = None
+        if snapshot is not None:
+            cached = snapshot.get('plugins')
+
+        if cached is not None:
+            LOG.debug("restoring plugin configs from setup snapshot")
+            self._enabled_plugins = list(cached['enabled'])
+            self._disabled_plugins = list(cached['disabled'])
+            self._plugin_configs = cached['configs']
+        else:
+            self._parse_plugin_config_dirs(snapshot)
+            if snapshot is not None:
+                snapshot.set('plugins', dict(
+                    enabled=list(self._enabled_plugins),
+                    disabled=list(self._disabled_plugins),
+                    configs=self._plugin_configs,
+                ))
+
+        # second, parse all app configs for plugins. Note: these are already
+        # loaded from files when app.config was setup.  The application
+        # configuration OVERRIDES plugin configs.
+        for section in self.app.config.get_sections():
+            if 'enable_plugin' not in self.app.config.keys(section):
+                continue
+            if is_true(self.app.config.get(section, 'enable_plugin')):
+                LOG.debug("enabling plugin '%s' per application config" %
+                          section)
+                if section not in self._enabled_plugins:
+                    self._enabled_plugins.append(section)
+                if section in self._disabled_plugins:
+                    self._disabled_plugins.remove(section)
+            else:
+                LOG.debug("disabling plugin '%s' per application config" %
+                          section)
+                if section not in self._disabled_plugins:
+                    self._disabled_plugins.append(section)
+                if section in self._enabled_plugins:
+                    self._enabled_plugins.remove(section)
+
+    def _parse_plugin_config_dirs(self, snapshot=None):
         # grab a generic config handler object
         config_handler = self.app.handler.get('config',
                                               self.app.config._meta.label)
 
-        # first parse plugin config dir for enabled plugins
         for config_dir in self.config_dirs:
             config_dir = abspath(config_dir)
+            if snapshot is not None:
+                snapshot.track(config_dir)
 
             if not os.path.exists(config_dir):
                 LOG.debug('plugin config dir %s does not exist.' %
@@ -92,6 +137,8 @@ class CementPluginHandler(plugin.CementPluginHandler):
                 for config in plugin_config_files:
                     config = os.path.abspath(os.path.expanduser(config))
                     LOG.debug("loading plugin config from '%s'." % config)
+                    if snapshot is not None:
+                        snapshot.track(config)
                     pconfig = config_handler()
                     pconfig._setup(self.app)
                     pconfig.parse_file(config)
@@ -130,27 +177,6 @@ class CementPluginHandler(plugin.CementPluginHandler):
                         val = pconfig.get(plugin, key)
                         self._plugin_configs[plugin][key] = val
 
-        # second, parse all app configs for plugins. Note: these are already
-        # loaded from files when app.config was setup.  The application
-        # configuration OVERRIDES plugin configs.
-        for plugin in self.app.config.get_sections():
-            if 'enable_plugin' not in self.app.config.keys(plugin):
-                continue
-            if is_true(self.app.config.get(plugin, 'enable_plugin')):
-                LOG.debug("enabling plugin '%s' per application config" %
-                          plugin)
-                if plugin not in self._enabled_plugins:
-                    self._enabled_plugins.append(plugin)
-                if plugin in self._disabled_plugins:
-                    self._disabled_plugins.remove(plugin)
-            else:
-                LOG.debug("disabling plugin '%s' per application config" %
-                          plugin)
-                if plugin not in self._disabled_plugins:
-                    self._disabled_plugins.append(plugin)
-                if plugin in self._enabled_plugins:
-                    self._enabled_plugins.remove(plugin)
-
     def _load_plugin_from_dir(self, plugin_name, plugin_dir):
         """
         Load a plugin from a directory path rather than a python package
@@ -246,18 +272,20 @@ class CementPluginHandler(plugin.CementPluginHandler):
         """
         LOG.debug("loading application plugin '%s'" % plugin_name)
 
-        # first attempt to load from plugin_dirs
-        for load_dir in self.load_dirs:
-            load_dir = abspath(load_dir)
+        with self._profile(plugin_name):
+            # first attempt to load from plugin_dirs
+            for load_dir in self.load_dirs:
+                load_dir = abspath(load_dir)
 
-            if self._load_plugin_from_dir(plugin_name, load_dir):
-                self._loaded_plugins.append(plugin_name)
-                break
+                if self._load_plugin_from_dir(plugin_name, load_dir):
+                    self._loaded_plugins.append(plugin_name)
+                    break
 
-        # then from a bootstrap module
-        if plugin_name not in self._loaded_plugins:
-            if self._load_plugin_from_bootstrap(plugin_name, self.bootstrap):
-                self._loaded_plugins.append(plugin_name)
+            # then from a bootstrap module
+            if plugin_name not in self._loaded_plugins:
+                if self._load_plugin_from_bootstrap(plugin_name,
+                                                    self.bootstrap):
+                    self._loaded_plugins.append(plugin_name)
 
         # otherwise it's a bust
         if plugin_name not in self._loaded_plugins:
@@ -278,6 +306,14 @@ class CementPluginHandler(plugin.CementPluginHandler):
                 if key not in self.app.config.keys(plugin_name):
                     self.app.config.set(plugin_name, key, val)
 
+    def _profile(self, plugin_name):
+        # startup profiling is optional, and the application object might not
+        # be a CementApp
+        profiler = getattr(self.app, '_profiler', None)
+        if profiler is None:
+            profiler = StartupProfiler(enabled=False)
+        return profiler.measure('plugins', plugin_name)
+
     def load_plugins(self, plugin_list):
         """
         Load a list of plugins.  Each plugin name is passed to
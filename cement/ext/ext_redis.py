@@ -18,6 +18,21 @@ under a ``[cache.redis]`` section in any configuration file:
     * **host** - Redis server.
     * **port** - Redis port.
     * **db** - Redis database number.
+    * **namespace** - Prefix of every key (as ``<namespace>:<key>``), so that
+      applications can share a Redis database without their keys
+      colliding, or being purged by each other.  Set it to an empty string
+      to disable prefixing.  Default: the application label.
+    * **purge_mode** - ``scan`` to purge by incrementally scanning for and
+      unlinking the keys of the namespace (without blocking the Redis
+      server, as ``KEYS`` would), or ``generation`` to purge in O(1) by
+      bumping a generation number that is part of every key.  Keys of
+      previous generations are no longer read, and are left to expire, so
+      this mode requires a non-zero ``expire_time``, which is also used for
+      items set with a ``time`` of 0.  Default: ``scan``.
+    * **generation_interval** - How often (in seconds) the generation
+      number is re-read from Redis, with the ``generation`` purge mode.
+      Purges by other processes are seen within this interval.  Default: 1
+      (0 to re-read it on every operation).
 
 
 Configurations can be passed as defaults to a CementApp:
@@ -66,6 +81,12 @@ the following:
     # Redis database number
     db = 0
 
+    # prefix of every key
+    namespace = myapp
+
+    # purge by bumping a generation number, rather than deleting keys
+    purge_mode = generation
+
 
 Usage
 -----
@@ -107,11 +128,21 @@ Usage
 """
 
 import redis
-from ..core import cache
+from ..core import cache, config, exc
 from ..utils.misc import minimal_logger
 
+try:
+    from time import monotonic as _clock
+except ImportError:                                 # pragma: nocover
+    from time import time as _clock                 # pragma: nocover
+
 LOG = minimal_logger(__name__)
 
+PURGE_MODES = ['scan', 'generation']
+
+# number of keys asked for per SCAN, and unlinked per UNLINK, by purge()
+PURGE_BATCH = 1000
+
 
 class RedisCacheHandler(cache.CementCacheHandler):
 
@@ -137,11 +168,19 @@ class RedisCacheHandler(cache.CementCacheHandler):
             port=6379,
             db=0,
             expire_time=0,
+            namespace=None,
+            purge_mode='scan',
+            generation_interval=1,
         )
 
     def __init__(self, *args, **kw):
         super(RedisCacheHandler, self).__init__(*args, **kw)
         self.mc = None
+        self._prefix = ''
+        self._generations = False
+        self._generation = None
+        self._generation_interval = 0
+        self._next_generation_check = None
 
     def _setup(self, *args, **kw):
         super(RedisCacheHandler, self)._setup(*args, **kw)
@@ -150,6 +189,31 @@ class RedisCacheHandler(cache.CementCacheHandler):
             port=self._config('port', default=6379),
             db=self._config('db', default=0))
 
+        snapshot = config.get_snapshot(self.app.config)
+        section = self._meta.config_section
+
+        purge_mode = snapshot.get(section, 'purge_mode', 'scan')
+        if purge_mode not in PURGE_MODES:
+            raise exc.FrameworkError(
+                "Unknown cache purge_mode '%s' (must be one of %s)" %
+                (purge_mode, ', '.join(PURGE_MODES)))
+        self._generations = purge_mode == 'generation'
+        if self._generations and \
+                not snapshot.get_int(section, 'expire_time', 0):
+            raise exc.FrameworkError(
+                "The generation cache purge_mode requires a non-zero "
+                "expire_time (keys of previous generations are left to "
+                "expire)")
+        self._generation_interval = snapshot.get_int(
+            section, 'generation_interval', 0)
+
+        namespace = snapshot.get(section, 'namespace', None)
+        if namespace is None:
+            namespace = self.app._meta.label
+        self._prefix = ''
+        if namespace:
+            self._prefix = '%s:' % namespace
+
     def _config(self, key, default=None):
         """
         This is a simple wrapper, and is equivalent to:
@@ -173,7 +237,7 @@ class RedisCacheHandler(cache.CementCacheHandler):
 
         """
         LOG.debug("getting cache value using key '%s'" % key)
-        res = self.r.get(key)
+        res = self.r.get(self._key(key))
         if res is None:
             return fallback
         else:
@@ -188,18 +252,86 @@ class RedisCacheHandler(cache.CementCacheHandler):
         :param value: The value of the item to set.
         :param time: The expiration time (in seconds) to keep the item cached.
          Defaults to `expire_time` as defined in the applications
-         configuration.
+         configuration (which is also used instead of 0, with the
+         ``generation`` purge mode).
         :returns: ``None``
 
         """
-        if time is None:
-            time = int(self._config('expire_time'))
+        time = self._get_time(time)
 
+        key = self._key(key)
         if time == 0:
             self.r.set(key, value)
         else:
             self.r.setex(key, time, value)
 
+    def get_many(self, keys, fallback=None, **kw):
+        """
+        Get the values of several keys from the cache, with a single
+        ``MGET``.  Additional keyword arguments are ignored.
+
+        :param keys: The keys of the items in the cache to get.
+        :param fallback: The value to return for items that are not found
+         in the cache.
+        :returns: A dictionary of every key in `keys` mapped to its value
+         (or the `fallback`).
+        :rtype: ``dict``
+
+        """
+        keys = list(keys)
+        res = dict()
+        if not keys:
+            return res
+
+        LOG.debug("getting %s cache values" % len(keys))
+        generation = self._get_generation()
+        values = self.r.mget([self._key(key, generation) for key in keys])
+        for key, value in zip(keys, values):
+            if value is None:
+                res[key] = fallback
+            else:
+                res[key] = value.decode('utf-8')
+        return res
+
+    def set_many(self, data, time=None, **kw):
+        """
+        Set several values in the cache, with a single (non-transactional)
+        pipeline.  Additional keyword arguments are ignored.
+
+        :param data: A dictionary of the keys/values of the items to set.
+        :param time: The expiration time (in seconds) to keep the items
+         cached.  Defaults to `expire_time` as defined in the applications
+         configuration (which is also used instead of 0, with the
+         ``generation`` purge mode).
+        :returns: ``None``
+
+        """
+        time = self._get_time(time)
+
+        generation = self._get_generation()
+        pipe = self.r.pipeline(transaction=False)
+        for key, value in data.items():
+            key = self._key(key, generation)
+            if time == 0:
+                pipe.set(key, value)
+            else:
+                pipe.setex(key, time, value)
+        pipe.execute()
+
+    def delete_many(self, keys, **kw):
+        """
+        Delete several items from the cache, with a single ``DEL``.
+        Additional keyword arguments are ignored.
+
+        :param keys: The keys of the items to delete from the cache.
+        :returns: ``None``
+
+        """
+        generation = self._get_generation()
+        keys = [self._key(key, generation) for key in keys]
+        if keys:
+            self.r.delete(*keys)
+
     def delete(self, key, **kw):
         """
         Delete an item from the cache for the given ``key``.  Additional
@@ -209,21 +341,83 @@ class RedisCacheHandler(cache.CementCacheHandler):
         :returns: ``None``
 
         """
-        self.r.delete(key)
+        self.r.delete(self._key(key))
 
     def purge(self, **kw):
         """
-        Purge the entire cache, all keys and values will be lost.  Any
-        additional keyword arguments will be passed directly to the
-        redis ``flush_all()`` function.
+        Purge the entire cache (the keys of the application's namespace), all
+        keys and values will be lost.  With the ``scan`` purge mode, keys are
+        found with ``SCAN`` and deleted with ``UNLINK`` in batches, so that
+        the Redis server is never blocked for long.  With the ``generation``
+        purge mode, the generation number is incremented instead, and the
+        keys of previous generations are left to expire.  Any additional
+        keyword arguments are ignored.
 
         :returns: ``None``
 
         """
-        keys = self.r.keys('*')
-        if keys:
+        if self._generations:
+            self._generation = self.r.incr(self._generation_key())
+            self._next_generation_check = _clock() + \
+                self._generation_interval
+            return
+
+        pattern = '%s*' % _escape_pattern(self._prefix)
+        batch = []
+        for key in self.r.scan_iter(match=pattern, count=PURGE_BATCH):
+            batch.append(key)
+            if len(batch) >= PURGE_BATCH:
+                self._unlink(batch)
+                batch = []
+        if batch:
+            self._unlink(batch)
+
+    def _get_time(self, time):
+        # keys must always expire with the generation purge mode, as they
+        # are never deleted by purge()
+        if time is None or (time == 0 and self._generations):
+            snapshot = config.get_snapshot(self.app.config)
+            time = snapshot.get_int(self._meta.config_section, 'expire_time')
+        return time
+
+    def _key(self, key, generation=None):
+        # the key stored in redis for the given cache key
+        if not self._generations:
+            return '%s%s' % (self._prefix, key)
+        if generation is None:
+            generation = self._get_generation()
+        return '%s%s:%s' % (self._prefix, generation, key)
+
+    def _generation_key(self):
+        # can not collide with cache keys, which are '<prefix><number>:<key>',
+        # nor with keys of other applications when the namespace is empty
+        return '%s__cement_generation__' % self._prefix
+
+    def _get_generation(self):
+        # the current generation number, re-read every generation_interval
+        if not self._generations:
+            return None
+        now = _clock()
+        if self._generation is None or now >= self._next_generation_check:
+            self._generation = int(self.r.get(self._generation_key()) or 0)
+            self._next_generation_check = now + self._generation_interval
+        return self._generation
+
+    def _unlink(self, keys):
+        # UNLINK frees memory in the background (redis >= 4.0), fall back to
+        # DEL for older servers (or clients)
+        try:
+            self.r.unlink(*keys)
+        except (AttributeError, redis.exceptions.ResponseError):
             self.r.delete(*keys)
 
 
+def _escape_pattern(value):
+    # escape glob special characters for SCAN's MATCH
+    for char in '\\*?[]':
+        value = value.replace(char, '\\' + char)
+    return value
+
+
 def load(app):
     app.handler.register(RedisCacheHandler)
@@ -111,7 +111,7 @@ import smtplib
 from email.header import Header
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from ..core import mail
+from ..core import mail, config
 from ..utils.misc import minimal_logger, is_true
 
 LOG = minimal_logger(__name__)
@@ -153,24 +153,22 @@ class SMTPMailHandler(mail.CementMailHandler):
 
     def _get_params(self, **kw):
         params = dict()
+        snapshot = config.get_snapshot(self.app.config)
+        section = self._meta.config_section
 
         # some keyword args override configuration defaults
         for item in ['to', 'from_addr', 'cc', 'bcc', 'subject']:
-            config_item = self.app.config.get(self._meta.config_section, item)
+            config_item = snapshot.get(section, item)
             params[item] = kw.get(item, config_item)
 
         # others don't
         other_params = ['ssl', 'tls', 'host', 'port', 'auth', 'username',
                         'password', 'timeout']
         for item in other_params:
-            params[item] = self.app.config.get(self._meta.config_section,
-                                               item)
+            params[item] = snapshot.get(section, item)
 
         # also grab the subject_prefix
-        params['subject_prefix'] = self.app.config.get(
-            self._meta.config_section,
-            'subject_prefix'
-        )
+        params['subject_prefix'] = snapshot.get(section, 'subject_prefix')
 
         return params
 
@@ -0,0 +1,523 @@
+"""
+The SQLite Extension provides application caching and key/value store
+support on local disk, via an SQLite database.  Unlike the Memory
+Extension, cached items survive the process exiting, and are shared by all
+processes (i.e. separate invocations of a command line application) using
+the same database, without running a cache server.
+
+Requirements
+------------
+
+ * No external dependencies (Python must be built with ``sqlite3``).
+
+Configuration
+-------------
+
+This extension honors the following config settings
+under a ``[cache.sqlite]`` section in any configuration file:
+
+    * **path** - The file system path of the cache database.  Default:
+      ``~/.<app_label>/cache/cache.db``.  A database that does not exist is
+      created only readable and writable by the current user (in a
+      directory created with mode ``0700``).  Items are stored pickled, and
+      unpickling can execute arbitrary code, so the database must only be
+      writable by trusted users (do not share it with, or put it in a
+      directory writable by, other users).
+    * **expire_time** - The default time in seconds to expire items in the
+      cache.  Default: 0 (does not expire).
+    * **max_bytes** - The maximum total size in bytes of the (pickled)
+      items in the cache.  Items are evicted to stay below it.  Default:
+      104857600 (100MB, 0 for no limit).
+    * **eviction** - Which items are evicted first, ``lru`` (least recently
+      used) or ``lfu`` (least frequently used).  Default: ``lru``.
+    * **access_interval** - How often (in seconds) reading an item records
+      that it was used (its access time, and its number of hits), for
+      ``lru`` and ``lfu`` eviction.  Recording it is a write, so reading
+      items that were recorded within this interval does not wait on (or
+      block) writers.  With ``lfu`` eviction, an item is counted at most
+      once per interval.  Default: 5 (0 to record every read).
+    * **timeout** - How long (in seconds) to wait on other processes that
+      are writing to the database.  Default: 10.
+
+
+Configurations can be passed as defaults to a CementApp:
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+    from cement.utils.misc import init_defaults
+
+    defaults = init_defaults('myapp', 'cache.sqlite')
+    defaults['cache.sqlite']['expire_time'] = 3600
+    defaults['cache.sqlite']['max_bytes'] = 10485760
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            config_defaults = defaults
+            extensions = ['sqlite']
+            cache_handler = 'sqlite'
+
+
+Additionally, an application configuration file might have a section like
+the following:
+
+.. code-block:: text
+
+    [myapp]
+
+    # set the cache handler to use
+    cache_handler = sqlite
+
+
+    [cache.sqlite]
+
+    # path of the cache database
+    path = /var/cache/myapp/cache.db
+
+    # time in seconds that an item in the cache will expire
+    expire_time = 3600
+
+    # maximum total size of the cache in bytes
+    max_bytes = 10485760
+
+
+Usage
+-----
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['sqlite']
+            cache_handler = 'sqlite'
+
+    with MyApp() as app:
+        # Run the app
+        app.run()
+
+        # Set a cached value
+        app.cache.set('my_key', 'my value')
+
+        # Get a cached value
+        app.cache.get('my_key')
+
+        # Delete a cached value
+        app.cache.delete('my_key')
+
+        # Delete the entire cache
+        app.cache.purge()
+
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+from time import time as _now
+from ..core import cache, config, exc
+from ..utils import fs
+from ..utils.misc import minimal_logger
+
+LOG = minimal_logger(__name__)
+
+# how many stale (purged or expired) rows are deleted per set()
+CLEANUP_BATCH = 100
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS meta (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS cache (
+        generation INTEGER NOT NULL,
+        key NOT NULL,
+        value BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        expires REAL,
+        accessed REAL NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (generation, key)
+    )""",
+    "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)",
+    "CREATE INDEX IF NOT EXISTS cache_hits ON cache (hits, accessed)",
+    "CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)",
+    "INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0)",
+    "INSERT OR IGNORE INTO meta (name, value) VALUES ('bytes', 0)",
+]
+
+GENERATION = "(SELECT value FROM meta WHERE name = 'generation')"
+
+EVICTION_ORDER = dict(
+    lru='accessed',
+    lfu='hits, accessed',
+)
+
+
+class SqliteCacheHandler(cache.CementCacheHandler):
+
+    """
+    This class implements the :ref:`ICache <cement.core.cache>`
+    interface.  It provides a persistent cache on local disk using the
+    standard :py:mod:`sqlite3` library, with the database in write-ahead
+    logging (WAL) mode so that concurrent processes can read while another
+    one writes.  Reads only write (to record the use of items for eviction)
+    once per ``access_interval``.
+
+    Every item is stored under the current cache *generation*.  Purging the
+    cache only bumps the generation (O(1)), and the items of previous
+    generations are deleted a few at a time by later calls to ``set()``.
+    """
+
+    class Meta:
+
+        """Handler meta-data."""
+
+        interface = cache.ICache
+        label = 'sqlite'
+        config_defaults = dict(
+            path=None,
+            expire_time=0,
+            max_bytes=104857600,
+            eviction='lru',
+            access_interval=5,
+            timeout=10,
+        )
+
+    def __init__(self, *args, **kw):
+        super(SqliteCacheHandler, self).__init__(*args, **kw)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+        self.path = None
+
+    def _setup(self, *args, **kw):
+        super(SqliteCacheHandler, self)._setup(*args, **kw)
+        path = self._config('path')
+        if path is None:
+            path = os.path.join(fs.HOME_DIR, '.%s' % self.app._meta.label,
+                                'cache', 'cache.db')
+        self.path = fs.abspath(path)
+
+        eviction = self._config('eviction')
+        if eviction not in EVICTION_ORDER:
+            raise exc.FrameworkError(
+                "Unknown cache eviction '%s' (must be one of %s)" %
+                (eviction, ', '.join(sorted(EVICTION_ORDER.keys()))))
+
+    def _config(self, key):
+        """
+        This is a simple wrapper, and is equivalent to:
+        ``self.app.config.get('cache.sqlite', <key>)``.
+
+        :param key: The key to get a config value from the 'cache.sqlite'
+         config section.
+        :returns: The value of the given key.
+
+        """
+        return self.app.config.get(self._meta.config_section, key)
+
+    def _connect(self):
+        # connections can't be shared with forked processes, so every process
+        # opens its own
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        directory = os.path.dirname(self.path)
+        if not os.path.exists(directory):
+            try:
+                os.makedirs(directory, 0o700)
+            except OSError:                             # pragma: nocover
+                # created by another process meanwhile
+                if not os.path.isdir(directory):
+                    raise
+
+        # the database is only readable and writable by the current user
+        # (sqlite creates the -wal and -shm files with the same mode)
+        try:
+            os.close(os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                             0o600))
+        except OSError:
+            # already exists (and is used with the permissions it has)
+            pass
+
+        LOG.debug("opening cache database '%s'" % self.path)
+        conn = sqlite3.connect(self.path,
+                               timeout=float(self._config('timeout')),
+                               isolation_level=None,
+                               check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        with _Transaction(conn):
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+        self._conn = conn
+        self._pid = os.getpid()
+        return conn
+
+    def get(self, key, fallback=None, **kw):
+        """
+        Get a value from the cache.  Additional keyword arguments are ignored.
+
+        :param key: The key of the item in the cache to get.
+        :param fallback: The value to return if the item is not found in the
+         cache.
+        :returns: The value of the item in the cache, or the `fallback` value.
+
+        """
+        LOG.debug("getting cache value using key '%s'" % key)
+        return self.get_many([key], fallback)[key]
+
+    def get_many(self, keys, fallback=None, **kw):
+        """
+        Get the values of several keys from the cache, with one query per
+        (up to) ``CLEANUP_BATCH`` keys.  Additional keyword arguments are
+        ignored.
+
+        :param keys: The keys of the items in the cache to get.
+        :param fallback: The value to return for items that are not found
+         in the cache.
+        :returns: A dictionary of every key in `keys` mapped to its value
+         (or the `fallback`).
+        :rtype: ``dict``
+
+        """
+        keys = list(keys)
+        res = dict.fromkeys(keys, fallback)
+        now = _now()
+        snapshot = config.get_snapshot(self.app.config)
+        interval = float(snapshot.get(self._meta.config_section,
+                                      'access_interval', 0))
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(keys), CLEANUP_BATCH):
+                batch = keys[i:i + CLEANUP_BATCH]
+                params = ', '.join(['?'] * len(batch))
+                rows = conn.execute(
+                    "SELECT key, value, accessed FROM cache "
+                    "WHERE generation = %s AND key IN (%s) "
+                    "AND (expires IS NULL OR expires > ?)" %
+                    (GENERATION, params), batch + [now]).fetchall()
+
+                # only record the use of items not recorded recently, so
+                # that most reads don't take the write lock
+                touch = [row[0] for row in rows if row[2] <= now - interval]
+                if touch:
+                    params = ', '.join(['?'] * len(touch))
+                    conn.execute(
+                        "UPDATE cache SET accessed = ?, hits = hits + 1 "
+                        "WHERE generation = %s AND key IN (%s)" %
+                        (GENERATION, params), [now] + touch)
+                for key, value, accessed in rows:
+                    res[key] = pickle.loads(bytes(value))
+        return res
+
+    def set(self, key, value, time=None, **kw):
+        """
+        Set a value in the cache for the given ``key``.  Items are evicted
+        if the cache grows beyond ``max_bytes``.  Additional keyword
+        arguments are ignored.
+
+        :param key: The key of the item in the cache to set.
+        :param value: The (picklable) value of the item to set.
+        :param time: The expiration time (in seconds) to keep the item cached.
+         Defaults to `expire_time` as defined in the applications
+         configuration.
+        :returns: ``None``
+
+        """
+        self.set_many({key: value}, time=time)
+
+    def set_many(self, data, time=None, **kw):
+        """
+        Set several values in the cache, in a single transaction.  Items
+        are evicted if the cache grows beyond ``max_bytes``.  Additional
+        keyword arguments are ignored.
+
+        :param data: A dictionary of the keys/(picklable) values of the
+         items to set.
+        :param time: The expiration time (in seconds) to keep the items
+         cached.  Defaults to `expire_time` as defined in the applications
+         configuration.
+        :returns: ``None``
+
+        """
+        snapshot = config.get_snapshot(self.app.config)
+        section = self._meta.config_section
+        if time is None:
+            time = snapshot.get_int(section, 'expire_time')
+        max_bytes = snapshot.get_int(section, 'max_bytes', 0)
+
+        now = _now()
+        expires = None
+        if time:
+            expires = now + time
+
+        items = []
+        for key, value in data.items():
+            items.append((key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+
+        with self._lock:
+            conn = self._connect()
+            with _Transaction(conn):
+                generation = self._get_meta(conn, 'generation')
+                for key, value in items:
+                    row = conn.execute(
+                        "SELECT size FROM cache "
+                        "WHERE generation = ? AND key = ?",
+                        (generation, key)).fetchone()
+                    old_size = row[0] if row is not None else 0
+
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache (generation, key, "
+                        "value, size, expires, accessed, hits) "
+                        "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                        (generation, key, sqlite3.Binary(value), len(value),
+                         expires, now))
+                    self._add_bytes(conn, len(value) - old_size)
+
+                self._cleanup(conn, generation, now)
+                if max_bytes:
+                    self._evict(conn, generation, set(data.keys()),
+                                max_bytes)
+
+    def delete(self, key, **kw):
+        """
+        Delete an item from the cache for the given ``key``.  Additional
+        keyword arguments are ignored.
+
+        :param key: The key to delete from the cache.
+        :returns: True if the key existed, False otherwise.
+        :rtype: ``boolean``
+
+        """
+        with self._lock:
+            conn = self._connect()
+            with _Transaction(conn):
+                return self._delete(conn, key)
+
+    def delete_many(self, keys, **kw):
+        """
+        Delete several items from the cache, in a single transaction.
+        Additional keyword arguments are ignored.
+
+        :param keys: The keys of the items to delete from the cache.
+        :returns: ``None``
+
+        """
+        with self._lock:
+            conn = self._connect()
+            with _Transaction(conn):
+                for key in keys:
+                    self._delete(conn, key)
+
+    def _delete(self, conn, key):
+        generation = self._get_meta(conn, 'generation')
+        row = conn.execute(
+            "SELECT size, expires FROM cache "
+            "WHERE generation = ? AND key = ?",
+            (generation, key)).fetchone()
+        if row is None:
+            return False
+
+        conn.execute(
+            "DELETE FROM cache WHERE generation = ? AND key = ?",
+            (generation, key))
+        self._add_bytes(conn, -row[0])
+        return row[1] is None or row[1] > _now()
+
+    def purge(self, **kw):
+        """
+        Purge the entire cache, all keys and values will be lost.  This only
+        switches the cache to a new generation, the items of the previous
+        one are deleted later on.  Any additional keyword arguments are
+        ignored.
+
+        :returns: ``None``
+
+        """
+        with self._lock:
+            conn = self._connect()
+            with _Transaction(conn):
+                conn.execute("UPDATE meta SET value = value + 1 "
+                             "WHERE name = 'generation'")
+                conn.execute("UPDATE meta SET value = 0 WHERE name = 'bytes'")
+
+    def _get_meta(self, conn, name):
+        return conn.execute("SELECT value FROM meta WHERE name = ?",
+                            (name,)).fetchone()[0]
+
+    def _add_bytes(self, conn, size):
+        if size:
+            conn.execute("UPDATE meta SET value = value + ? "
+                         "WHERE name = 'bytes'", (size,))
+
+    def _cleanup(self, conn, generation, now):
+        # delete a batch of items from previous generations (not counted in
+        # the size of the cache), and a batch of expired items
+        conn.execute(
+            "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache "
+            "WHERE generation < ? LIMIT ?)", (generation, CLEANUP_BATCH))
+
+        rows = conn.execute(
+            "SELECT key, size FROM cache WHERE generation = ? "
+            "AND expires <= ? LIMIT ?",
+            (generation, now, CLEANUP_BATCH)).fetchall()
+        self._delete_rows(conn, generation, rows)
+
+    def _evict(self, conn, generation, keep, max_bytes):
+        # evict items (other than the ones just set) until within max_bytes
+        order = EVICTION_ORDER[self._config('eviction')]
+        while self._get_meta(conn, 'bytes') > max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM cache WHERE generation = ? "
+                "ORDER BY %s LIMIT ?" % order,
+                (generation, CLEANUP_BATCH + len(keep))).fetchall()
+            rows = [row for row in rows if row[0] not in keep]
+            if not rows:
+                break
+
+            excess = self._get_meta(conn, 'bytes') - max_bytes
+            evict = []
+            for row in rows:
+                evict.append(row)
+                excess -= row[1]
+                if excess <= 0:
+                    break
+            LOG.debug("evicting %s items from the sqlite cache" % len(evict))
+            self._delete_rows(conn, generation, evict)
+
+    def _delete_rows(self, conn, generation, rows):
+        for row_key, size in rows:
+            conn.execute(
+                "DELETE FROM cache WHERE generation = ? AND key = ?",
+                (generation, row_key))
+            self._add_bytes(conn, -size)
+
+
+class _Transaction(object):
+
+    # explicit transactions (the connection is in autocommit mode), taking
+    # the write lock up front so that concurrent writers wait on each other
+    # rather than fail to upgrade their lock
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is None:
+            self.conn.execute('COMMIT')
+        else:
+            self.conn.execute('ROLLBACK')
+
+
+def load(app):
+    app.handler.register(SqliteCacheHandler)
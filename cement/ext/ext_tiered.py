@@ -0,0 +1,474 @@
+"""
+The Tiered Extension provides application caching in two tiers: a small,
+short lived in-process cache (see :ref:`Memory <cement.ext.ext_memory>`) in
+front of any other cache handler, such as
+:ref:`Redis <cement.ext.ext_redis>` or
+:ref:`Memcached <cement.ext.ext_memcached>`.  Hot keys are served from
+process memory, without a round trip to the cache server on every ``get``.
+
+Note that an item changed or deleted by another process is only seen once
+it expires from the in-process tier, so its ``expire_time`` should be kept
+short.
+
+Requirements
+------------
+
+ * The requirements of the cache handler used as the second tier.
+
+Configuration
+-------------
+
+This extension honors the following config settings
+under a ``[cache.tiered]`` section in any configuration file:
+
+    * **backend** - The label of the (registered) cache handler used as the
+      second tier.  Its extension must be loaded, and it is configured by
+      its own config section.  Default: ``redis``.
+    * **expire_time** - The time in seconds to keep items in the
+      in-process tier.  Default: 5.
+    * **max_entries** - The maximum number of items in the in-process
+      tier.  Default: 1000.
+    * **max_bytes** - The maximum (approximate) size in bytes of the items
+      in the in-process tier.  Default: 0 (no limit).
+    * **purge_interval** - How often (in seconds) expired items are removed
+      from the in-process tier.  Default: 60 (0 to disable the sweep).
+    * **write_policy** - ``through`` to write to both tiers on ``set()`` and
+      ``delete()``, or ``behind`` to write to the in-process tier and queue
+      the writes to the second tier for a background thread.  Queued
+      writes are flushed when the application is closed.  Default:
+      ``through``.
+
+
+Configurations can be passed as defaults to a CementApp:
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+    from cement.utils.misc import init_defaults
+
+    defaults = init_defaults('myapp', 'cache.tiered')
+    defaults['cache.tiered']['backend'] = 'redis'
+    defaults['cache.tiered']['expire_time'] = 2
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            config_defaults = defaults
+            extensions = ['redis', 'tiered']
+            cache_handler = 'tiered'
+
+
+Additionally, an application configuration file might have a section like
+the following:
+
+.. code-block:: text
+
+    [myapp]
+
+    # set the cache handler to use
+    cache_handler = tiered
+
+
+    [cache.tiered]
+
+    # the cache handler of the second tier
+    backend = redis
+
+    # time in seconds that an item in the in-process tier will expire
+    expire_time = 2
+
+    # write to the second tier from a background thread
+    write_policy = behind
+
+
+    [cache.redis]
+
+    # time in seconds that an item in the second tier will expire
+    expire_time = 300
+
+
+Usage
+-----
+
+.. code-block:: python
+
+    with MyApp() as app:
+        # Run the app
+        app.run()
+
+        # Set a cached value (in both tiers)
+        app.cache.set('my_key', 'my value')
+
+        # Get a cached value (from the second tier on the first call, and
+        # from process memory after that)
+        app.cache.get('my_key')
+
+        # Delete a cached value
+        app.cache.delete('my_key')
+
+        # Delete the entire cache
+        app.cache.purge()
+
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from ..core import cache, config, exc
+from ..ext.ext_memory import MemoryCacheHandler
+from ..utils.misc import minimal_logger
+
+LOG = minimal_logger(__name__)
+
+# stands in for a missing item (as None is a valid cached value)
+MISSING = object()
+
+WRITE_POLICIES = ['through', 'behind']
+
+
+class TieredCacheHandler(cache.CementCacheHandler):
+
+    """
+    This class implements the :ref:`ICache <cement.core.cache>`
+    interface.  It layers a
+    :class:`cement.ext.ext_memory.MemoryCacheHandler` (configured by the
+    ``[cache.tiered]`` section) in front of another cache handler.  Items
+    are read from the in-process tier first, and items found in the second
+    tier are promoted to the in-process tier.
+    """
+
+    class Meta:
+
+        """Handler meta-data."""
+
+        interface = cache.ICache
+        label = 'tiered'
+        config_defaults = dict(
+            backend='redis',
+            expire_time=5,
+            max_entries=1000,
+            max_bytes=0,
+            purge_interval=60,
+            write_policy='through',
+        )
+
+    def __init__(self, *args, **kw):
+        super(TieredCacheHandler, self).__init__(*args, **kw)
+        self.local = None
+        self.remote = None
+        self._write_behind = False
+
+        # key -> (value, time, kw) of queued writes, or MISSING for deletes
+        self._pending = OrderedDict()
+        self._pending_lock = threading.Condition()
+
+        # key -> (value, time, kw) or MISSING of the write being written to
+        # the second tier, so that it is still seen until it is written
+        self._inflight = dict()
+
+        # held while popping and writing queued writes, so that they are
+        # written in order (by the writer thread, or flush())
+        self._write_lock = threading.Lock()
+        self._writer = None
+        self._writer_pid = None
+
+    def _setup(self, *args, **kw):
+        super(TieredCacheHandler, self)._setup(*args, **kw)
+        snapshot = config.get_snapshot(self.app.config)
+        section = self._meta.config_section
+
+        write_policy = snapshot.get(section, 'write_policy')
+        if write_policy not in WRITE_POLICIES:
+            raise exc.FrameworkError(
+                "Unknown cache write_policy '%s' (must be one of %s)" %
+                (write_policy, ', '.join(WRITE_POLICIES)))
+        self._write_behind = write_policy == 'behind'
+
+        backend = snapshot.get(section, 'backend')
+        if backend == self._meta.label:
+            raise exc.FrameworkError("The tiered cache handler can not use "
+                                     "itself as its backend")
+
+        self.local = MemoryCacheHandler(config_section=section)
+        self.local._setup(self.app)
+        self.remote = self.app.handler.resolve('cache', backend)
+        self.remote._setup(self.app)
+
+    def get(self, key, fallback=None, **kw):
+        """
+        Get a value from the in-process tier, or from the second tier (and
+        promote it to the in-process tier).  Additional keyword arguments
+        are passed to the second tier's ``get()``.
+
+        :param key: The key of the item in the cache to get.
+        :param fallback: The value to return if the item is not found in the
+         cache.
+        :returns: The value of the item in the cache, or the `fallback` value.
+
+        """
+        res = self.local.get(key, MISSING)
+        if res is not MISSING:
+            return res
+
+        if self._write_behind:
+            pending = self._get_pending([key])[0][1]
+            if pending is MISSING:
+                return fallback
+            elif pending is not None:
+                return pending[0]
+
+        res = self.remote.get(key, MISSING, **kw)
+        if res is MISSING:
+            return fallback
+
+        self.local.set(key, res)
+        return res
+
+    def set(self, key, value, time=None, **kw):
+        """
+        Set a value in both tiers for the given ``key``.  Additional keyword
+        arguments are passed to the second tier's ``set()``.
+
+        :param key: The key of the item in the cache to set.
+        :param value: The value of the item to set.
+        :param time: The expiration time (in seconds) to keep the item cached
+         in the second tier (and in the in-process tier, if shorter).
+         Defaults to `expire_time` as defined in the second tier's
+         configuration.
+        :returns: ``None``
+
+        """
+        self.local.set(key, value, time=self._get_local_time(time))
+
+        if self._write_behind:
+            self._queue(key, (value, time, kw))
+        else:
+            self.remote.set(key, value, time=time, **kw)
+
+    def get_many(self, keys, fallback=None, **kw):
+        """
+        Get the values of several keys from the in-process tier, and those
+        that are not found from the second tier (with a single
+        ``get_many()`` if it supports it), promoting them to the in-process
+        tier.  Additional keyword arguments are passed to the second tier.
+
+        :param keys: The keys of the items in the cache to get.
+        :param fallback: The value to return for items that are not found
+         in the cache.
+        :returns: A dictionary of every key in `keys` mapped to its value
+         (or the `fallback`).
+        :rtype: ``dict``
+
+        """
+        res = dict()
+        missing = []
+        for key in keys:
+            res[key] = self.local.get(key, MISSING)
+            if res[key] is MISSING:
+                missing.append(key)
+
+        if missing and self._write_behind:
+            pending = self._get_pending(missing)
+            missing = []
+            for key, value in pending:
+                if value is None:
+                    missing.append(key)
+                elif value is not MISSING:
+                    res[key] = value[0]
+
+        if missing:
+            if hasattr(self.remote, 'get_many'):
+                found = self.remote.get_many(missing, MISSING, **kw)
+            else:
+                found = dict((key, self.remote.get(key, MISSING, **kw))
+                             for key in missing)
+
+            promote = dict()
+            for key in missing:
+                if found[key] is not MISSING:
+                    res[key] = promote[key] = found[key]
+            self.local.set_many(promote)
+
+        for key in res:
+            if res[key] is MISSING:
+                res[key] = fallback
+        return res
+
+    def set_many(self, data, time=None, **kw):
+        """
+        Set several values in both tiers (with a single ``set_many()`` on
+        the second tier if it supports it).  Additional keyword arguments
+        are passed to the second tier.
+
+        :param data: A dictionary of the keys/values of the items to set.
+        :param time: The expiration time (in seconds) to keep the items
+         cached in the second tier (and in the in-process tier, if
+         shorter).  Defaults to `expire_time` as defined in the second
+         tier's configuration.
+        :returns: ``None``
+
+        """
+        self.local.set_many(data, time=self._get_local_time(time))
+
+        if self._write_behind:
+            for key, value in data.items():
+                self._queue(key, (value, time, kw))
+        elif hasattr(self.remote, 'set_many'):
+            self.remote.set_many(data, time=time, **kw)
+        else:
+            for key, value in data.items():
+                self.remote.set(key, value, time=time, **kw)
+
+    def delete_many(self, keys, **kw):
+        """
+        Delete several items from both tiers (with a single
+        ``delete_many()`` on the second tier if it supports it).
+        Additional keyword arguments are passed to the second tier.
+
+        :param keys: The keys of the items to delete from the cache.
+        :returns: ``None``
+
+        """
+        keys = list(keys)
+        self.local.delete_many(keys)
+
+        if self._write_behind:
+            for key in keys:
+                self._queue(key, MISSING)
+        elif hasattr(self.remote, 'delete_many'):
+            self.remote.delete_many(keys, **kw)
+        else:
+            for key in keys:
+                self.remote.delete(key, **kw)
+
+    def delete(self, key, **kw):
+        """
+        Delete an item from both tiers for the given ``key``.  Additional
+        keyword arguments are passed to the second tier's ``delete()``.
+
+        :param key: The key to delete from the cache.
+        :returns: The result of the second tier's ``delete()`` (``None``
+         with the ``behind`` write policy).
+
+        """
+        self.local.delete(key)
+        if self._write_behind:
+            self._queue(key, MISSING)
+        else:
+            return self.remote.delete(key, **kw)
+
+    def purge(self, **kw):
+        """
+        Purge both tiers entirely, all keys and values will be lost (and
+        queued writes are discarded).  A write that is already being written
+        to the second tier is waited for, so that it is purged as well.  Any
+        additional keyword arguments are passed to the second tier's
+        ``purge()``.
+
+        :returns: ``None``
+
+        """
+        with self._write_lock:
+            with self._pending_lock:
+                self._pending.clear()
+            self.local.purge()
+            self.remote.purge(**kw)
+
+    def flush(self):
+        """
+        Write all queued writes to the second tier now (with the ``behind``
+        write policy).  This is called when the application is closed.
+
+        :returns: ``None``
+
+        """
+        with self._write_lock:
+            while self._write_next():
+                pass
+
+    def _get_local_time(self, time):
+        # items never stay in the in-process tier longer than expire_time
+        if not time:
+            return None
+        snapshot = config.get_snapshot(self.app.config)
+        local_time = snapshot.get_int(self._meta.config_section,
+                                      'expire_time')
+        if not local_time or time < local_time:
+            return time
+        return local_time
+
+    def _get_pending(self, keys):
+        # the queued (or in flight) write of each key, or None
+        res = []
+        with self._pending_lock:
+            for key in keys:
+                pending = self._pending.get(key, None)
+                if pending is None:
+                    pending = self._inflight.get(key, None)
+                res.append((key, pending))
+        return res
+
+    def _write(self, key, pending):
+        try:
+            if pending is MISSING:
+                self.remote.delete(key)
+            else:
+                value, time, kw = pending
+                self.remote.set(key, value, time=time, **kw)
+        except Exception as e:
+            LOG.debug("unable to write '%s' to the second cache tier: %s" %
+                      (key, e))
+
+    def _queue(self, key, pending):
+        with self._pending_lock:
+            # only the latest write to a key matters
+            self._pending.pop(key, None)
+            self._pending[key] = pending
+            self._start_writer()
+            self._pending_lock.notify()
+
+    def _start_writer(self):
+        # threads don't survive a fork, so every process starts its own
+        if self._writer is not None and self._writer_pid == os.getpid():
+            return
+        self._writer = threading.Thread(target=self._run_writer)
+        self._writer.daemon = True
+        self._writer_pid = os.getpid()
+        self._writer.start()
+
+    def _run_writer(self):
+        while True:
+            with self._pending_lock:
+                while not self._pending:
+                    self._pending_lock.wait()
+            with self._write_lock:
+                self._write_next()
+
+    def _write_next(self):
+        # write the oldest queued write, returns False if there was none
+        with self._pending_lock:
+            if not self._pending:
+                return False
+            key, pending = self._pending.popitem(last=False)
+            self._inflight[key] = pending
+        try:
+            self._write(key, pending)
+        finally:
+            with self._pending_lock:
+                self._inflight.pop(key, None)
+        return True
+
+
+def flush_cache(app):
+    """
+    This is a ``pre_close`` hook that writes the queued writes of the
+    tiered cache handler to its second tier.
+
+    """
+    if isinstance(getattr(app, 'cache', None), TieredCacheHandler):
+        app.cache.flush()
+
+
+def load(app):
+    app.hook.register('pre_close', flush_cache)
+    app.handler.register(TieredCacheHandler)
@@ -0,0 +1,421 @@
+"""
+The Zygote Extension provides a pre-forking server mode for applications
+Built on Cement (tm).  A long-lived server process imports and sets up the
+application once, and then forks a child process per invocation that goes
+straight to ``app.run()``.  For applications that are invoked at a high
+frequency this removes the cost of starting Python, importing the
+application (and its plugins), and running ``app.setup()`` from every
+invocation.
+
+Invocations are made by a tiny client (``zygote_client()``) that passes its
+command line arguments, environment, working directory, and standard
+input/output/error file descriptors to the server over a unix socket.  If
+the server is not running, the client returns ``None`` so that the caller
+can fall back to running the application normally.
+
+Requirements
+------------
+
+ * Python 3.3+
+ * Available on Unix/Linux only
+
+
+Configuration
+-------------
+
+The zygote extension is configurable with the following settings under the
+``[zygote]`` section.
+
+    * **socket_path** - The filesystem path of the unix socket to listen on.
+      Default: ``~/.<app_label>/zygote.sock``
+    * **timeout** - Seconds to wait for a client to send its invocation,
+      before dropping the connection (invocations are received one at a
+      time, so a stalled client holds up everyone else).  Default: ``10``
+    * **max_request_size** - The maximum size (in bytes) of an invocation
+      (arguments and environment).  Larger invocations are dropped.
+      Default: ``1048576``
+
+An existing file at ``socket_path`` is only replaced if it is a unix socket
+owned by the current user.
+
+
+Usage
+-----
+
+The server is started from the application like any other long running
+process:
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['zygote']
+
+    with MyApp() as app:
+        app.zygote.serve()
+
+
+The client shim should be the application's entry point script, and avoid
+importing the application until it knows it has to:
+
+.. code-block:: python
+
+    import sys
+    from cement.ext.ext_zygote import zygote_client
+
+    code = zygote_client('~/.myapp/zygote.sock')
+    if code is None:
+        # the server is not running
+        from myapp.main import main
+        main()
+    else:
+        sys.exit(code)
+
+
+Note that everything that happens during ``app.setup()`` (i.e. parsing of
+configuration files) is done once by the server, so it must be restarted to
+pick up changes.
+
+"""
+
+import io
+import os
+import sys
+import json
+import array
+import stat
+import signal
+import socket
+import struct
+import traceback
+from ..core import exc
+from ..utils.misc import minimal_logger
+from ..utils.fs import abspath
+
+LOG = minimal_logger(__name__)
+
+HEADER = struct.Struct('!I')
+STATUS = struct.Struct('!i')
+NUM_FDS = 3
+
+
+def _recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError('connection closed by peer')
+        data += chunk
+    return data
+
+
+def zygote_client(socket_path, argv=None, env=None, cwd=None,
+                  stdin=None, stdout=None, stderr=None):
+    """
+    Run an invocation of the application on the zygote server listening at
+    ``socket_path``.  Signals ``SIGINT`` and ``SIGTERM`` received while
+    waiting are forwarded to the child process running the invocation.
+
+    :param socket_path: The filesystem path of the server's unix socket.
+    :param argv: The command line arguments (default: ``sys.argv[1:]``).
+    :param env: The environment (default: ``os.environ``).
+    :param cwd: The working directory (default: ``os.getcwd()``).
+    :param stdin: The file object to use as standard input
+     (default: ``sys.stdin``).
+    :param stdout: The file object to use as standard output
+     (default: ``sys.stdout``).
+    :param stderr: The file object to use as standard error
+     (default: ``sys.stderr``).
+    :returns: The exit code of the invocation (``int``), or ``None`` if the
+     server is not available.
+    :raises: cement.core.exc.FrameworkError - If the connection is closed
+     before an exit code is received (i.e. the child process died).
+
+    """
+    if not hasattr(socket, 'AF_UNIX') or \
+            not hasattr(socket.socket, 'sendmsg'):
+        return None
+
+    if argv is None:
+        argv = sys.argv[1:]
+    if env is None:
+        env = dict(os.environ)
+    if cwd is None:
+        cwd = os.getcwd()
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(abspath(socket_path))
+    except (OSError, socket.error):
+        sock.close()
+        return None
+
+    try:
+        fds = [
+            (stdin or sys.stdin).fileno(),
+            (stdout or sys.stdout).fileno(),
+            (stderr or sys.stderr).fileno(),
+        ]
+
+        # make sure anything buffered is written before the child writes
+        for f in [stdout or sys.stdout, stderr or sys.stderr]:
+            f.flush()
+
+        payload = json.dumps(dict(argv=list(argv), env=env, cwd=cwd))
+        payload = payload.encode('utf-8')
+        try:
+            sock.sendmsg(
+                [HEADER.pack(len(payload)) + payload],
+                [(socket.SOL_SOCKET, socket.SCM_RIGHTS,
+                  array.array('i', fds))],
+            )
+            pid = STATUS.unpack(_recv_exactly(sock, STATUS.size))[0]
+        except (EOFError, OSError):
+            # i.e. the invocation was too large, or took too long to send
+            raise exc.FrameworkError(
+                "The zygote server closed the connection before starting "
+                "the invocation")
+
+        def forward(signum, frame):
+            os.kill(pid, signum)
+
+        old_handlers = {}
+        for signum in [signal.SIGINT, signal.SIGTERM]:
+            old_handlers[signum] = signal.signal(signum, forward)
+        try:
+            data = _recv_exactly(sock, STATUS.size)
+        except EOFError:
+            raise exc.FrameworkError(
+                "The zygote child process (pid %s) died before reporting "
+                "an exit code" % pid)
+        finally:
+            for signum, handler in old_handlers.items():
+                signal.signal(signum, handler)
+
+        return STATUS.unpack(data)[0]
+    finally:
+        sock.close()
+
+
+class ZygoteServer(object):
+
+    """
+    A pre-forking server that forks the (already setup) application once
+    per invocation received on a unix socket.  See ``zygote_client()``.
+
+    :param app: The application object.
+
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.socket_path = None
+        self._sock = None
+        self._timeout = None
+        self._max_request_size = None
+        self._children = []
+
+    def serve(self, socket_path=None):
+        """
+        Listen for, and handle invocations until the process is signaled to
+        stop.
+
+        :param socket_path: The filesystem path of the unix socket to listen
+         on.  Defaults to the ``[zygote] -> socket_path`` setting.
+        :raises: cement.core.exc.FrameworkError - If the socket can not be
+         used, or something other than a socket owned by the current user
+         exists at ``socket_path``.
+
+        """
+        if not hasattr(socket.socket, 'recvmsg'):
+            raise exc.FrameworkError(                    # pragma: nocover
+                "The zygote extension requires Python 3.3+")
+
+        if socket_path is None:
+            socket_path = self.app.config.get('zygote', 'socket_path')
+        self.socket_path = abspath(socket_path)
+        self._timeout = float(self.app.config.get('zygote', 'timeout'))
+        self._max_request_size = int(
+            self.app.config.get('zygote', 'max_request_size'))
+
+        if not os.path.exists(os.path.dirname(self.socket_path)):
+            os.makedirs(os.path.dirname(self.socket_path))
+        if os.path.lexists(self.socket_path):
+            # i.e. left behind by a server that was killed, but don't remove
+            # anything else
+            st = os.lstat(self.socket_path)
+            if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+                raise exc.FrameworkError(
+                    "Refusing to replace '%s', " % self.socket_path +
+                    "it is not a unix socket owned by the current user")
+            os.remove(self.socket_path)
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # create the socket accessible only by the current user, rather
+        # than restricting it after the fact
+        umask = os.umask(0o177)
+        try:
+            self._sock.bind(self.socket_path)
+        finally:
+            os.umask(umask)
+        self._sock.listen(128)
+
+        # wake up periodically to reap finished children
+        self._sock.settimeout(1)
+
+        LOG.debug("zygote server listening on '%s'" % self.socket_path)
+        try:
+            while True:
+                try:
+                    conn, addr = self._sock.accept()
+                except socket.timeout:
+                    conn = None
+
+                self._reap()
+                if conn is not None:
+                    self._handle(conn)
+        finally:
+            self._sock.close()
+            self._sock = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def _reap(self):
+        for pid in list(self._children):
+            try:
+                res_pid, status = os.waitpid(pid, os.WNOHANG)
+            except OSError:
+                res_pid = pid
+            if res_pid == pid:
+                self._children.remove(pid)
+
+    def _handle(self, conn):
+        # invocations are received one at a time, don't wait forever
+        conn.settimeout(self._timeout)
+        fds = array.array('i')
+        try:
+            size = struct.calcsize('i') * NUM_FDS
+            data, ancdata, flags, addr = conn.recvmsg(
+                HEADER.size, socket.CMSG_LEN(size))
+
+            for level, type, cdata in ancdata:
+                if level == socket.SOL_SOCKET and \
+                        type == socket.SCM_RIGHTS:
+                    cdata = cdata[:len(cdata) - (len(cdata) % fds.itemsize)]
+                    fds.frombytes(cdata)
+
+            if len(data) < HEADER.size:
+                data += _recv_exactly(conn, HEADER.size - len(data))
+            length = HEADER.unpack(data)[0]
+            if length > self._max_request_size:
+                raise ValueError('request of %s bytes exceeds the maximum '
+                                 'of %s' % (length, self._max_request_size))
+            request = json.loads(_recv_exactly(conn, length).decode('utf-8'))
+        except (EOFError, ValueError, OSError, socket.error) as e:
+            LOG.debug('invalid zygote request: %s' % e)
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+            return
+
+        if len(fds) != NUM_FDS:
+            LOG.debug('invalid zygote request: expected %s fds' % NUM_FDS)
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+            return
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            code = 1
+            try:
+                self._sock.close()
+                conn.settimeout(None)
+                conn.sendall(STATUS.pack(os.getpid()))
+                code = self._run_child(request, fds)
+            finally:
+                try:
+                    conn.sendall(STATUS.pack(code))
+                finally:
+                    os._exit(code)
+
+        self._children.append(pid)
+        for fd in fds:
+            os.close(fd)
+        conn.close()
+
+    def _run_child(self, request, fds):  # pragma: no cover
+        # become the client process
+        for i, fd in enumerate(fds):
+            os.dup2(fd, i)
+            os.close(fd)
+
+        # the server's std streams might not be bound to fds 0/1/2 (i.e. if
+        # they were replaced), in which case wrap the client's fds
+        for i, name in enumerate(['stdin', 'stdout', 'stderr']):
+            try:
+                fileno = getattr(sys, name).fileno()
+            except (AttributeError, ValueError, io.UnsupportedOperation):
+                fileno = None
+            if fileno != i:
+                mode = 'r' if i == 0 else 'w'
+                setattr(sys, name, os.fdopen(i, mode, closefd=False))
+
+        os.environ.clear()
+        os.environ.update(request['env'])
+        os.chdir(request['cwd'])
+
+        argv = request['argv']
+        sys.argv = [sys.argv[0]] + argv
+        self.app._meta.argv = argv
+        if '--debug' in argv:
+            self.app._meta.debug = True
+
+        code = 0
+        try:
+            try:
+                self.app.run()
+            finally:
+                self.app.close()
+            code = self.app.exit_code
+        except SystemExit as e:
+            if e.code is None:
+                code = 0
+            elif isinstance(e.code, int):
+                code = e.code
+            else:
+                sys.stderr.write('%s\n' % e.code)
+                code = 1
+        except exc.CaughtSignal as e:
+            code = 128 + e.signum
+        except Exception:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+        return code
+
+
+def extend_app(app):
+    """
+    Sets the default ``[zygote]`` config section options, and adds the
+    ``app.zygote`` server object.
+
+    """
+    defaults = dict()
+    defaults['zygote'] = dict()
+    defaults['zygote']['socket_path'] = os.path.join(
+        '~', '.%s' % app._meta.label, 'zygote.sock')
+    defaults['zygote']['timeout'] = 10
+    defaults['zygote']['max_request_size'] = 1048576
+    app.config.merge(defaults, override=False)
+    app.extend('zygote', ZygoteServer(app))
+
+
+def load(app):
+    app.hook.register('post_setup', extend_app)
@@ -0,0 +1,171 @@
+"""
+Asyncio utilities.
+
+The functions in this module back the asyncio support of the framework
+(i.e. ``CementApp.run_async()``, ``HookManager.run_async()``, and
+controller functions defined with ``async def``), and require Python 3.6+.
+They should not be imported directly by code that must also run on older
+versions of Python.
+
+"""
+
+import types
+import asyncio
+import inspect
+from ..core import exc
+from ..utils.misc import minimal_logger
+
+LOG = minimal_logger(__name__)
+
+
+def _loop_is_running():
+    # asyncio.get_running_loop() was added in Python 3.7
+    if not hasattr(asyncio, 'get_running_loop'):        # pragma: nocover
+        return asyncio._get_running_loop() is not None  # pragma: nocover
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+async def run_hooks(name, groups, args, kwargs):
+    """
+    Run groups of hook functions, yielding their results.  The functions
+    within a group are called in order, and any awaitables they return
+    (i.e. from ``async def`` functions) are awaited concurrently with
+    ``asyncio.gather()``.  Groups are run one after the other, and results
+    are always yielded in group, then function order.
+
+    Results that are generators (or async generators) are expanded, the same
+    as ``HookManager.run()``.
+
+    :param name: The name of the hook (used for logging).
+    :param groups: A sequence of sequences of hook functions (i.e. grouped
+     by weight).
+    :param args: Positional arguments passed to every hook function.
+    :param kwargs: Keyword arguments passed to every hook function.
+
+    """
+    for funcs in groups:
+        results = []
+        pending = []
+        for func in funcs:
+            LOG.debug("running hook '%s' (%s) from %s" %
+                      (name, func, func.__module__))
+            res = func(*args, **kwargs)
+            if inspect.isawaitable(res):
+                pending.append(len(results))
+            results.append(res)
+
+        if pending:
+            done = await asyncio.gather(*[results[i] for i in pending])
+            for i, res in zip(pending, done):
+                results[i] = res
+
+        for res in results:
+            if isinstance(res, types.GeneratorType):
+                for _res in res:
+                    yield _res
+            elif inspect.isasyncgen(res):
+                async for _res in res:
+                    yield _res
+            else:
+                yield res
+
+
+def run_until_complete(coro):
+    """
+    Run a coroutine to completion on a new event loop, and return its
+    result (same as ``asyncio.run()`` on Python 3.7+).  This is used by
+    ``CementApp.run()`` to run controller functions that are coroutine
+    functions.
+
+    :param coro: The coroutine (or other awaitable) to run.
+    :returns: The result of the coroutine.
+    :raises: cement.core.exc.FrameworkError - If called from a running
+        event loop.
+
+    """
+    if _loop_is_running():
+        if inspect.iscoroutine(coro):
+            coro.close()
+        raise exc.FrameworkError(
+            "Can not run a coroutine from a running event loop, use "
+            "'await app.run_async()' instead of 'app.run()'")
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+async def run_app(app):
+    """
+    Run the application the same as ``CementApp.run()``, but running the
+    ``pre_run`` and ``post_run`` hooks with ``HookManager.run_async()``.
+
+    :param app: The application object.
+    :returns: The result of the executed controller function.
+
+    """
+    LOG.debug('running pre_run hook')
+    async for res in app.hook.run_async('pre_run', app):
+        pass
+
+    return_val = app._dispatch()
+    if inspect.isawaitable(return_val):
+        return_val = await return_val
+
+    LOG.debug('running post_run hook')
+    async for res in app.hook.run_async('post_run', app):
+        pass
+
+    return return_val
+
+
+async def close_app(app, code=None):
+    """
+    Close the application the same as ``CementApp.close()``, but running the
+    ``pre_close`` hook with ``HookManager.run_async()``.
+
+    :param app: The application object.
+    :param code: An exit code to exit with (``int``).
+
+    """
+    async for res in app.hook.run_async('pre_close', app):
+        pass
+
+    app._close(code)
+
+
+async def enter_app(app):
+    """
+    Setup the application when entering ``async with CementApp()``.
+
+    :param app: The application object.
+    :returns: The application object.
+
+    """
+    app.setup()
+    return app
+
+
+async def exit_app(app, exc_type=None):
+    """
+    Close the application with ``close_async()`` when exiting
+    ``async with CementApp()``, but only if there are no unhandled
+    exceptions (same as ``with CementApp()``).
+
+    :param app: The application object.
+    :param exc_type: The type of the unhandled exception, if any.
+
+    """
+    if exc_type is None:
+        await app.close_async()
@@ -0,0 +1,181 @@
+"""Batch mode utilities."""
+
+import sys
+import shlex
+import pickle
+import signal
+from collections import namedtuple
+from ..utils.fs import abspath
+
+# the application object of a parallel worker process
+_WORKER_APP = None
+
+BatchResult = namedtuple('BatchResult',
+                         ['argv', 'exit_code', 'result', 'rendered', 'error'])
+BatchResult.__doc__ = """
+The result of running one command line of a batch (see
+``CementApp.run_batch()``).
+
+    * **argv** - The command line arguments that were run.
+    * **exit_code** - The exit code of the command (``int``).
+    * **result** - The return value of the executed controller function.
+    * **rendered** - The last rendered ``(data, output_text)`` tuple, or
+      ``None`` if nothing was rendered.
+    * **error** - The exception that was raised, or ``None``.
+
+"""
+
+
+def parse_batch_line(line):
+    """
+    Parse a line of batch input into a list of command line arguments.
+    Lines are split using shell-like syntax, and blank lines and comments
+    (lines starting with ``#``) are ignored.
+
+    :param line: The line to parse.
+    :returns: ``list`` of arguments, or ``None`` if the line should be
+     ignored.
+
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    return shlex.split(line)
+
+
+def read_batch(path):
+    """
+    Generator that reads batch input from a file, yielding a list of command
+    line arguments per (non blank, non comment) line.
+
+    :param path: The file system path of the batch file, or ``-`` to read
+     from ``sys.stdin``.
+
+    """
+    if path == '-':
+        f = sys.stdin
+    else:
+        f = open(abspath(path), 'r')
+
+    try:
+        for line in f:
+            argv = parse_batch_line(line)
+            if argv is not None:
+                yield argv
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def exit_code_from(e):
+    """
+    Return the exit code that a ``SystemExit`` exception would exit with.
+
+    :param e: The ``SystemExit`` exception.
+    :returns: ``int``
+
+    """
+    if e.code is None:
+        return 0
+    elif isinstance(e.code, int):
+        return e.code
+    else:
+        sys.stderr.write('%s\n' % e.code)
+        return 1
+
+
+def can_run_parallel():
+    """
+    Whether or not batches can be run in parallel worker processes, which
+    requires Python 3.7+ and the ``fork`` multiprocessing start method (so
+    that workers inherit the already setup application).
+
+    :returns: ``boolean``
+
+    """
+    if sys.version_info < (3, 7):
+        return False                                # pragma: nocover
+
+    import multiprocessing
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def _init_worker(app):
+    global _WORKER_APP
+    _WORKER_APP = app
+
+    # interrupts are handled by the parent process, which stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _picklable(res):
+    # results are sent back to the parent process, replace anything that
+    # can not make the round trip
+    try:
+        pickle.loads(pickle.dumps(res))
+        return res
+    except Exception:
+        pass
+
+    fields = res._asdict()
+    for key in ['result', 'rendered', 'error']:
+        try:
+            pickle.loads(pickle.dumps(fields[key]))
+        except Exception:
+            if key == 'error':
+                fields[key] = Exception('%s: %s' % (type(res.error).__name__,
+                                                    res.error))
+            else:
+                fields[key] = None
+    return BatchResult(**fields)
+
+
+def _run_worker(argv):  # pragma: no cover
+    try:
+        res = _WORKER_APP.run_command(argv)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return _picklable(res)
+
+
+def run_parallel(app, argvs, workers, ordered=True):
+    """
+    Generator that runs command lines on a pool of worker processes, forked
+    from the (already setup) application, yielding a ``BatchResult`` per
+    command.  Every worker runs many commands, the same as
+    ``CementApp.run_batch()``.  Commands that have not started yet are
+    cancelled if the generator is closed early.
+
+    :param app: The application object.
+    :param argvs: A sequence of command lines (lists of arguments).
+    :param workers: The number of worker processes.
+    :param ordered: Whether to yield results in the order of ``argvs``, or
+     as they complete.
+
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('fork'),
+        initializer=_init_worker,
+        initargs=(app,),
+    )
+    futures = []
+    try:
+        for argv in argvs:
+            futures.append(executor.submit(_run_worker, argv))
+
+        if ordered is True:
+            completed = futures
+        else:
+            completed = as_completed(futures)
+
+        for future in completed:
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
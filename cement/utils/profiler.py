@@ -0,0 +1,170 @@
+"""Startup profiling utilities."""
+
+import time
+from contextlib import contextmanager
+
+try:
+    import tracemalloc
+except ImportError:                                 # pragma: nocover
+    tracemalloc = None                              # pragma: nocover
+
+# perf_counter/process_time were added in Python 3.3
+if hasattr(time, 'perf_counter'):                   # pragma: nocover
+    _wall_clock = time.perf_counter                 # pragma: nocover
+    _cpu_clock = time.process_time                  # pragma: nocover
+else:                                               # pragma: nocover
+    _wall_clock = time.time                         # pragma: nocover
+    _cpu_clock = time.clock                         # pragma: nocover
+
+
+class StartupProfiler(object):
+
+    """
+    Records wall time, CPU time, and allocated memory for named sections of
+    code.  Measurements are grouped (i.e. ``phases``, ``extensions``,
+    ``plugins``) and stored in the order that they complete.
+
+    When ``enabled`` is ``False`` measuring is a no-op, so the profiler can
+    be left in place on hot code paths without cost.
+
+    :param enabled: Whether or not to record measurements.
+    :param trace_memory: Whether or not to use ``tracemalloc`` to record
+     allocated memory (only available on Python 3.4+).
+
+    Usage:
+
+    .. code-block:: python
+
+        from cement.utils.profiler import StartupProfiler
+
+        profiler = StartupProfiler(enabled=True)
+        with profiler.measure('phases', 'load_stuff'):
+            load_stuff()
+        profiler.stop()
+
+        print(profiler.render())
+
+    """
+
+    def __init__(self, enabled=False, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory and tracemalloc is not None
+        self._started_tracing = False
+        self.stats = None
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded measurements."""
+        if self.enabled:
+            self.stats = dict(phases=[], extensions=[], plugins=[])
+        else:
+            self.stats = None
+
+    def start(self):
+        """
+        Start tracing memory allocations (if supported, and not already
+        being traced by something else).
+        """
+        if not self.enabled or not self.trace_memory:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        """Stop tracing memory allocations if we started tracing."""
+        if self._started_tracing is True:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _memory(self):
+        if self.trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return None
+
+    @contextmanager
+    def measure(self, group, label):
+        """
+        Context manager that records a measurement of the wrapped code as
+        ``label`` under ``group``.
+
+        :param group: The group to store the measurement under (i.e.
+         ``phases``).
+        :param label: The label of the measurement (i.e.
+         ``config_handler``).
+
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self.start()
+        mem_start = self._memory()
+        cpu_start = _cpu_clock()
+        wall_start = _wall_clock()
+        try:
+            yield
+        finally:
+            wall = _wall_clock() - wall_start
+            cpu = _cpu_clock() - cpu_start
+            mem_end = self._memory()
+            if mem_start is None or mem_end is None:
+                memory = None
+            else:
+                memory = mem_end - mem_start
+
+            if group not in self.stats:
+                self.stats[group] = []
+            self.stats[group].append(dict(
+                label=label,
+                wall=wall,
+                cpu=cpu,
+                memory=memory,
+            ))
+
+    def total(self, group='phases'):
+        """
+        Return the total wall time of all measurements within ``group``.
+
+        :param group: The group of measurements to total.
+        :returns: Total wall time in seconds.
+        :rtype: ``float``
+
+        """
+        if not self.enabled:
+            return 0.0
+        return sum([x['wall'] for x in self.stats.get(group, [])])
+
+    def render(self):
+        """
+        Render all recorded measurements as a plain text report.
+
+        :returns: The report text (``str``).
+
+        """
+        if not self.enabled:
+            return ''
+
+        lines = []
+        line_format = "  %-36s %10s %10s %12s"
+        for group in ['phases', 'extensions', 'plugins']:
+            items = self.stats.get(group, [])
+            if not items:
+                continue
+            lines.append('%s:' % group)
+            lines.append(line_format % ('label', 'wall (ms)', 'cpu (ms)',
+                                        'memory (KB)'))
+            for item in items:
+                if item['memory'] is None:
+                    memory = '-'
+                else:
+                    memory = '%.1f' % (item['memory'] / 1024.0)
+                lines.append(line_format % (item['label'],
+                                            '%.3f' % (item['wall'] * 1000),
+                                            '%.3f' % (item['cpu'] * 1000),
+                                            memory))
+            lines.append('')
+
+        lines.append('total startup time: %.3f ms' %
+                     (self.total('phases') * 1000))
+        return '\n'.join(lines) + '\n'
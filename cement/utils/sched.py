@@ -0,0 +1,254 @@
+"""Scheduling utilities for long running applications."""
+
+import time
+import errno
+import random
+import select
+import signal
+import socket
+from ..core import exc
+from ..utils.misc import minimal_logger
+
+LOG = minimal_logger(__name__)
+
+if hasattr(time, 'monotonic'):
+    _clock = time.monotonic
+else:
+    _clock = time.time                                  # pragma: nocover
+
+FIXED_DELAY = 'fixed_delay'
+FIXED_RATE = 'fixed_rate'
+
+
+class Scheduler(object):
+
+    """
+    Runs a function repeatedly (see ``CementApp.run_forever()``), waiting
+    between runs without polling.  The wait ends early when ``wake()`` is
+    called (i.e. from another thread, a signal handler, or a hook), and
+    reloading only happens on demand, when requested with
+    ``wake(reload=True)`` or by one of the ``reload_signals``.
+
+    :param interval: The number of seconds between runs.
+    :param mode: Either ``fixed_delay`` (wait ``interval`` seconds after a
+     run completes), or ``fixed_rate`` (start a run every ``interval``
+     seconds, regardless of how long runs take).
+    :param jitter: The maximum number of (random) seconds added to every
+     wait, to spread out the runs of many processes.
+    :param backoff: The maximum number of seconds to wait after runs that
+     raised an exception.  The wait is doubled for every consecutive failed
+     run, up to ``backoff``.  If ``None``, runs that fail are scheduled the
+     same as runs that succeed.
+    :param skip_missed: Whether ``fixed_rate`` runs that were missed
+     (because a run took longer than ``interval``) are skipped, rather than
+     started back to back to catch up.  Runs never overlap either way.
+    :param reload_signals: A list of signal numbers that request a reload
+     while ``run()`` is running.  Defaults to ``[signal.SIGHUP]`` where
+     available.
+
+    Usage:
+
+    .. code-block:: python
+
+        from cement.utils.sched import Scheduler
+
+        with MyApp() as app:
+            app.run_forever(scheduler=Scheduler(60, mode='fixed_rate',
+                                                jitter=5, backoff=600))
+
+    """
+
+    def __init__(self, interval, mode=FIXED_DELAY, jitter=0, backoff=None,
+                 skip_missed=True, reload_signals=None):
+        if mode not in [FIXED_DELAY, FIXED_RATE]:
+            raise exc.FrameworkError("Invalid scheduler mode '%s'" % mode)
+        if reload_signals is None:
+            reload_signals = []
+            if hasattr(signal, 'SIGHUP'):
+                reload_signals.append(signal.SIGHUP)
+
+        self.interval = float(interval)
+        self.mode = mode
+        self.jitter = float(jitter)
+        self.backoff = backoff
+        self.skip_missed = skip_missed
+        self.reload_signals = reload_signals
+        self.runs = 0
+        self.failures = 0
+        self._stopped = False
+        self._woken = False
+        self._reload_requested = False
+        self._wakeup = None
+
+    def wake(self, reload=False):
+        """
+        Start the next run now, rather than waiting for it to be due.  This
+        is safe to call from other threads and signal handlers.
+
+        :param reload: Whether to reload before the next run.
+
+        """
+        if reload is True:
+            self._reload_requested = True
+        self._woken = True
+        self._notify()
+
+    def stop(self):
+        """
+        Stop running once the current run (if any) has completed.  This is
+        safe to call from other threads, signal handlers, and the function
+        being run.
+
+        """
+        self._stopped = True
+        self._notify()
+
+    def _notify(self):
+        wakeup = self._wakeup
+        if wakeup is None:
+            return
+        try:
+            wakeup[1].send(b'\0')
+        except (OSError, socket.error):
+            # the buffer is full, so the scheduler is already being woken
+            pass
+
+    def _wait(self, deadline):
+        # block until the deadline or wake()/stop() are called, returns
+        # whether it was woken
+        reader = self._wakeup[0]
+        while not (self._woken or self._stopped):
+            remaining = deadline - _clock()
+            if remaining <= 0:
+                break
+            try:
+                select.select([reader], [], [], remaining)
+            except (OSError, select.error) as e:
+                if e.args[0] != errno.EINTR:            # pragma: nocover
+                    raise                               # pragma: nocover
+            try:
+                while reader.recv(1024):
+                    pass
+            except (OSError, socket.error):
+                pass
+
+        woken = self._woken
+        self._woken = False
+        return woken
+
+    def next_run(self, scheduled, finished):
+        """
+        Return when the next run is due (before jitter is applied).
+
+        :param scheduled: When the last run was due.
+        :param finished: When the last run finished.
+        :returns: ``float`` (in the same time base as the arguments).
+
+        """
+        if self.failures > 0 and self.backoff is not None:
+            delay = min(self.interval * (2 ** self.failures),
+                        float(self.backoff))
+            return finished + delay
+
+        if self.mode == FIXED_DELAY:
+            return finished + self.interval
+
+        next_run = scheduled + self.interval
+        if next_run < finished and self.skip_missed is True:
+            missed = int((finished - next_run) // self.interval) + 1
+            LOG.debug('skipping %s missed run(s)' % missed)
+            next_run = next_run + (missed * self.interval)
+        return next_run
+
+    def _handle_signal(self, signum, frame):
+        LOG.debug('caught signal %s, reloading' % signum)
+        self.wake(reload=True)
+
+    def _set_signal_handlers(self):
+        saved = {}
+        for signum in self.reload_signals:
+            try:
+                saved[signum] = signal.signal(signum, self._handle_signal)
+            except ValueError:
+                # not the main thread
+                LOG.debug('unable to handle signal %s' % signum)
+        return saved
+
+    def _call(self, func, error_func):
+        # returns whether func succeeded, counting consecutive failures
+        try:
+            func()
+        except exc.CaughtSignal:
+            raise
+        except Exception as e:
+            self.failures += 1
+            if error_func is None:
+                raise
+            error_func(e)
+            return False
+        self.failures = 0
+        return True
+
+    def run(self, func, reload_func=None, error_func=None):
+        """
+        Call ``func`` repeatedly, until ``stop()`` is called or an exception
+        is raised by one of the callbacks.
+
+        :param func: The function to run.
+        :param reload_func: The function to call when a reload is requested
+         (before the next run).  If it raises an exception, the exception is
+         handled the same as one raised by ``func``, and the reload is tried
+         again (instead of the run) when the next run is due.
+        :param error_func: The function to call with any exception raised by
+         ``func`` or ``reload_func`` (other than ``CaughtSignal``, which is
+         re-raised).  If ``None``, exceptions are re-raised.  The count of
+         consecutive failures (``failures``, used for the ``backoff``) is
+         reset by every call that succeeds.
+
+        """
+        self._stopped = False
+        self._wakeup = socket.socketpair()
+        for sock in self._wakeup:
+            sock.setblocking(False)
+        saved_handlers = self._set_signal_handlers()
+
+        try:
+            next_run = _clock()
+            run_at = next_run
+            while not self._stopped:
+                if self._wait(run_at) is True:
+                    next_run = _clock()
+                if self._stopped:
+                    break
+
+                reloaded = True
+                if self._reload_requested is True:
+                    self._reload_requested = False
+                    if reload_func is not None:
+                        try:
+                            reloaded = self._call(reload_func, error_func)
+                        finally:
+                            # reloading may have installed other handlers
+                            # (i.e. CementApp.reload() sets up the signal
+                            # handlers)
+                            self._set_signal_handlers()
+                        if reloaded is False:
+                            # retry the reload (rather than run) when due
+                            self._reload_requested = True
+
+                if reloaded is True:
+                    self._call(func, error_func)
+                    self.runs += 1
+
+                next_run = self.next_run(next_run, _clock())
+                run_at = next_run
+                if self.jitter > 0:
+                    run_at = run_at + random.uniform(0, self.jitter)
+        finally:
+            for signum, handler in saved_handlers.items():
+                if handler is None:
+                    handler = signal.SIG_DFL            # pragma: nocover
+                signal.signal(signum, handler)
+            for sock in self._wakeup:
+                sock.close()
+            self._wakeup = None
@@ -0,0 +1,419 @@
+"""Setup snapshot utilities."""
+
+import os
+import sys
+import json
+import pickle
+import hashlib
+from ..utils.misc import minimal_logger
+from ..utils.fs import abspath
+
+LOG = minimal_logger(__name__)
+
+SNAPSHOT_FORMAT = 1
+CONFIG_CACHE_FORMAT = 1
+
+# os.replace() is Python 3.3+, where os.rename() fails on Windows if the
+# target exists (on POSIX rename already replaces it atomically)
+_replace = getattr(os, 'replace', os.rename)
+
+
+def write_private(path, content):
+    """
+    Atomically write ``content`` to the file at ``path``, readable only by
+    the current user.  Missing parent directories are created with mode
+    ``0700``, and the file is created with mode ``0600`` (cache files might
+    hold secrets, i.e. passwords from configuration files).
+
+    :param path: The file system path to write.
+    :param content: The ``bytes`` to write.
+    :raises: ``OSError``/``IOError`` if the file could not be written.
+
+    """
+    path = abspath(path)
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path), 0o700)
+
+    tmp_path = '%s.%s.tmp' % (path, os.getpid())
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    try:
+        fd = os.open(tmp_path, flags, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+
+        # atomically replace the existing file
+        _replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def is_private(path):
+    """
+    Whether or not the file or directory at ``path`` is owned by the current
+    user, and not writable by anyone else.  Always ``True`` on platforms
+    without user ids (i.e. Windows).
+
+    :param path: The file system path to check.
+    :returns: ``boolean``
+
+    """
+    if not hasattr(os, 'getuid'):
+        return True                                 # pragma: nocover
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def fingerprint(path):
+    """
+    Return a JSON serializable fingerprint of the file or directory at
+    ``path`` that changes whenever the path is modified.  Files are
+    fingerprinted by modification time and size, directories by their
+    (sorted) listing, and paths that do not exist by ``None``.
+
+    :param path: The file system path to fingerprint.
+    :returns: ``list`` or ``None``
+
+    """
+    path = abspath(path)
+    try:
+        if os.path.isdir(path):
+            return ['dir', sorted(os.listdir(path))]
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    mtime = getattr(stat, 'st_mtime_ns', None)
+    if mtime is None:
+        mtime = repr(stat.st_mtime)                 # pragma: nocover
+    return ['file', mtime, stat.st_size]
+
+
+class SetupSnapshot(object):
+
+    """
+    Stores the results of expensive setup work (i.e. parsing configuration
+    files) in a cache file, along with fingerprints of every input that the
+    work depended on.  On the next run the snapshot is only used if the
+    ``key`` is identical, and none of the tracked inputs have changed since
+    the snapshot was written.
+
+    Snapshot data must survive a JSON round trip unchanged (i.e. no tuples,
+    or non-string keys), data that does not is not stored.  Failing to read
+    or write the snapshot file is never fatal, the snapshot is simply not
+    used.  The snapshot file is only readable by the current user.
+
+    :param path: The file system path of the snapshot file.
+    :param key: Any JSON serializable object describing the static inputs
+     of the snapshot (i.e. application meta options).
+
+    Usage:
+
+    .. code-block:: python
+
+        from cement.utils.snapshot import SetupSnapshot
+
+        snapshot = SetupSnapshot('~/.myapp/setup.snapshot', key=['myapp'])
+        snapshot.load()
+
+        data = snapshot.get('config')
+        if data is None:
+            data = parse_config_files(files)
+            snapshot.track(*files)
+            snapshot.set('config', data)
+
+        snapshot.save()
+
+    """
+
+    def __init__(self, path, key=None):
+        self.path = abspath(path)
+        self.key = self._hash(key)
+        self._data = {}
+        self._inputs = {}
+        self._dirty = False
+        self._hit = False
+
+    def _hash(self, key):
+        key = json.dumps(key, sort_keys=True, default=repr)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    @property
+    def hit(self):
+        """
+        Whether or not valid snapshot data was loaded, and used without
+        modification.
+        """
+        return self._hit
+
+    def load(self):
+        """
+        Load the snapshot file if it exists, was written with the same key,
+        and all of its tracked inputs are unchanged.
+
+        :returns: ``True`` if the snapshot was loaded, ``False`` otherwise.
+
+        """
+        self._data = {}
+        self._inputs = {}
+        self._dirty = False
+        self._hit = False
+
+        if not os.path.exists(self.path):
+            LOG.debug("setup snapshot '%s' does not exist" % self.path)
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                snapshot = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            LOG.debug("unable to read setup snapshot '%s': %s" %
+                      (self.path, e))
+            return False
+
+        if not isinstance(snapshot, dict) or \
+                snapshot.get('format') != SNAPSHOT_FORMAT or \
+                snapshot.get('key') != self.key:
+            LOG.debug("setup snapshot '%s' is stale (key mismatch)" %
+                      self.path)
+            return False
+
+        inputs = snapshot.get('inputs', {})
+        for path in sorted(inputs.keys()):
+            if fingerprint(path) != inputs[path]:
+                LOG.debug("setup snapshot '%s' is stale ('%s' changed)" %
+                          (self.path, path))
+                return False
+
+        LOG.debug("loaded setup snapshot '%s'" % self.path)
+        self._data = snapshot.get('data', {})
+        self._inputs = inputs
+        self._hit = True
+        return True
+
+    def track(self, *paths):
+        """
+        Track one or more file system paths as inputs of the snapshot.  If
+        any of them change (or are created/removed) the snapshot is no
+        longer used.
+
+        :param paths: The file system paths to track.
+
+        """
+        for path in paths:
+            path = abspath(path)
+            if path not in self._inputs:
+                self._inputs[path] = fingerprint(path)
+                self._dirty = True
+                self._hit = False
+
+    def get(self, name, default=None):
+        """
+        Get the snapshot data stored under ``name``.
+
+        :param name: The name of the data.
+        :param default: The value returned if ``name`` does not exist.
+
+        """
+        return self._data.get(name, default)
+
+    def set(self, name, value):
+        """
+        Set the snapshot data stored under ``name``.  Data is not written
+        until ``save()`` is called.  Data that would not be restored as is
+        (because it is not JSON serializable, or would come back different,
+        i.e. tuples as lists) is not stored, so that it is computed again
+        rather than restored differently on the next run.
+
+        :param name: The name of the data.
+        :param value: The JSON serializable data.
+        :returns: ``True`` if the data was stored, ``False`` otherwise.
+
+        """
+        try:
+            stored = json.loads(json.dumps(value)) == value
+        except (TypeError, ValueError):
+            stored = False
+
+        if stored is False:
+            LOG.debug("not storing '%s' in setup snapshot '%s' (it does not "
+                      "survive a JSON round trip)" % (name, self.path))
+            if name in self._data:
+                del self._data[name]
+                self._dirty = True
+            self._hit = False
+            return False
+
+        self._data[name] = value
+        self._dirty = True
+        self._hit = False
+        return True
+
+    def save(self):
+        """
+        Write the snapshot file if anything has changed since it was loaded.
+
+        :returns: ``True`` if the snapshot was written, ``False`` otherwise.
+
+        """
+        if not self._dirty:
+            return False
+
+        snapshot = dict(
+            format=SNAPSHOT_FORMAT,
+            key=self.key,
+            inputs=self._inputs,
+            data=self._data,
+        )
+        try:
+            content = json.dumps(snapshot, sort_keys=True)
+            write_private(self.path, content.encode('utf-8'))
+        except (IOError, OSError, TypeError, ValueError) as e:
+            LOG.debug("unable to write setup snapshot '%s': %s" %
+                      (self.path, e))
+            return False
+
+        LOG.debug("wrote setup snapshot '%s'" % self.path)
+        self._dirty = False
+        return True
+
+
+class ParsedConfigCache(object):
+
+    """
+    Caches the sections parsed from individual configuration files in a
+    cache directory (one pickle file per configuration file), so that
+    unchanged files do not have to be parsed again on the next run.
+
+    Entries are keyed by the path of the configuration file and the config
+    handler class that parsed it, and are only used if the file's
+    fingerprint (see ``fingerprint()``) and the source file of the handler
+    class are unchanged.  Failing to read or write a cache entry is never
+    fatal, the file is simply parsed.
+
+    Entries are written readable only by the current user, and are only
+    unpickled if both the entry and the cache directory are owned by the
+    current user and not writable by anyone else (unpickling a file that
+    someone else could write would allow them to run arbitrary code).
+
+    :param cache_dir: The file system path of the cache directory.
+
+    Usage:
+
+    .. code-block:: python
+
+        from cement.utils.snapshot import ParsedConfigCache
+
+        cache = ParsedConfigCache('~/.myapp/cache/config')
+
+        data = cache.get(path, handler_class)
+        if data is None:
+            data = parse_config_file(path)
+            cache.set(path, handler_class, data)
+
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = abspath(cache_dir)
+        self._handler_fingerprints = {}
+
+    def _handler_id(self, handler_class):
+        return "%s.%s" % (handler_class.__module__, handler_class.__name__)
+
+    def _handler_fingerprint(self, handler_class):
+        # changes to the handler's source invalidate what it parsed
+        handler_id = self._handler_id(handler_class)
+        if handler_id not in self._handler_fingerprints:
+            module = sys.modules.get(handler_class.__module__, None)
+            path = getattr(module, '__file__', None)
+            if path is not None:
+                path = fingerprint(path)
+            self._handler_fingerprints[handler_id] = path
+        return self._handler_fingerprints[handler_id]
+
+    def _entry_path(self, path, handler_class):
+        key = "%s:%s" % (self._handler_id(handler_class), path)
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, '%s.cache' % name)
+
+    def get(self, path, handler_class):
+        """
+        Get the sections parsed from ``path`` by ``handler_class``.
+
+        :param path: The file system path of the configuration file.
+        :param handler_class: The config handler class that parses it.
+        :returns: A ``dict`` of section dicts, or ``None`` if there is no
+         valid cache entry.
+
+        """
+        path = abspath(path)
+        entry_path = self._entry_path(path, handler_class)
+        if not os.path.exists(entry_path):
+            return None
+        elif not is_private(self.cache_dir) or not is_private(entry_path):
+            LOG.debug("ignoring config cache '%s' (it, or its directory, "
+                      "is not private to the current user)" % entry_path)
+            return None
+
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+        except (IOError, OSError):
+            return None
+        except Exception as e:
+            LOG.debug("unable to read config cache '%s': %s" %
+                      (entry_path, e))
+            return None
+
+        if not isinstance(entry, dict) or \
+                entry.get('format') != CONFIG_CACHE_FORMAT or \
+                entry.get('path') != path or \
+                entry.get('handler') != self._handler_id(handler_class):
+            return None
+
+        if entry.get('handler_fingerprint') != \
+                self._handler_fingerprint(handler_class) or \
+                entry.get('fingerprint') != fingerprint(path):
+            LOG.debug("config cache for '%s' is stale" % path)
+            return None
+
+        LOG.debug("loaded config cache for '%s'" % path)
+        return entry.get('data')
+
+    def set(self, path, handler_class, data):
+        """
+        Store the sections parsed from ``path`` by ``handler_class``.  The
+        file is fingerprinted now, so this should be called right after it
+        was parsed.
+
+        :param path: The file system path of the configuration file.
+        :param handler_class: The config handler class that parsed it.
+        :param data: A (picklable) ``dict`` of section dicts.
+        :returns: ``True`` if the entry was written, ``False`` otherwise.
+
+        """
+        path = abspath(path)
+        entry_path = self._entry_path(path, handler_class)
+        entry = dict(
+            format=CONFIG_CACHE_FORMAT,
+            path=path,
+            fingerprint=fingerprint(path),
+            handler=self._handler_id(handler_class),
+            handler_fingerprint=self._handler_fingerprint(handler_class),
+            data=data,
+        )
+        try:
+            content = pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+            write_private(entry_path, content)
+        except Exception as e:
+            LOG.debug("unable to write config cache '%s': %s" %
+                      (entry_path, e))
+            return False
+
+        LOG.debug("wrote config cache for '%s'" % path)
+        return True
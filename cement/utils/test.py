@@ -5,7 +5,7 @@ import unittest
 import shutil
 from tempfile import mkstemp, mkdtemp
 from ..core import backend, foundation
-from ..utils.misc import rando
+from ..utils.misc import init_defaults, rando
 
 # shortcuts
 from nose import SkipTest       # noqa
@@ -115,4 +115,21 @@ class CementCoreTestCase(CementTestCase):
 
 @attr('ext')
 class CementExtTestCase(CementTestCase):
-    pass
+
+    def make_cache_app(self, cache_handler, config=None, **kw):
+        """
+        Create and setup an app using the cache handler (and the extension)
+        of the given label, with the given ``cache.<label>`` config settings.
+        Additional keyword arguments are passed to the app.
+
+        """
+        section = 'cache.%s' % cache_handler
+        defaults = init_defaults('tests', section)
+        defaults[section].update(config or {})
+        app = self.make_app('tests',
+                            config_defaults=defaults,
+                            extensions=[cache_handler],
+                            cache_handler=cache_handler,
+                            **kw)
+        app.setup()
+        return app
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmark parsing large YAML configuration files with and without
+``CementApp.Meta.config_cache``.  The first cached run parses the files and
+writes the cache, later runs load them from the cache as long as the files
+are unchanged.
+
+Requires ``pyYaml``.
+
+Usage:
+
+    $ python scripts/bench_config_cache.py [LINES ...]
+
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from timeit import default_timer
+
+from cement.core.foundation import CementApp
+from cement.utils.misc import rando
+
+FILES = 3
+RUNS = 5
+
+
+def write_config(path, lines):
+    # sections of 50 keys each, with a mix of value types
+    with open(path, 'w') as f:
+        for i in range(lines // 50):
+            f.write('section_%s:\n' % i)
+            for j in range(50):
+                if j % 3 == 0:
+                    f.write('    key_%s: %s\n' % (j, i * j))
+                elif j % 3 == 1:
+                    f.write('    key_%s: true\n' % j)
+                else:
+                    f.write('    key_%s: "value %s of section %s"\n' %
+                            (j, j, i))
+
+
+def bench(config_files, cache_dir):
+    app = CementApp(rando()[:12],
+                    argv=[],
+                    exit_on_close=False,
+                    extensions=['yaml'],
+                    config_handler='yaml',
+                    config_files=config_files,
+                    config_cache=cache_dir is not None,
+                    config_cache_dir=cache_dir)
+    start = default_timer()
+    app.setup()
+    elapsed = default_timer() - start
+    app.close()
+    return elapsed
+
+
+def main(counts):
+    print('%-8s %12s %12s %12s' % ('lines', 'parse (ms)', 'first (ms)',
+                                   'cached (ms)'))
+    for lines in counts:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            config_files = []
+            for i in range(FILES):
+                path = os.path.join(tmp_dir, 'config_%s.yml' % i)
+                write_config(path, lines)
+                config_files.append(path)
+            cache_dir = os.path.join(tmp_dir, 'cache')
+
+            parse = min(bench(config_files, None) for i in range(RUNS))
+            first = bench(config_files, cache_dir)
+            cached = min(bench(config_files, cache_dir) for i in range(RUNS))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        print('%-8s %12.3f %12.3f %12.3f' % (lines, parse * 1000,
+                                             first * 1000, cached * 1000))
+
+
+if __name__ == '__main__':
+    counts = [int(x) for x in sys.argv[1:]] or [1000, 5000, 20000]
+    main(counts)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark ArgparseController nesting/embedding resolution against a large
+number of synthetic controllers.  Resolution should scale linearly, meaning
+the time per controller should stay (roughly) flat as the count grows.
+
+Usage:
+
+    $ python scripts/bench_controller_nesting.py [COUNT ...]
+
+"""
+
+import sys
+from timeit import default_timer
+
+from cement.core.foundation import CementApp
+from cement.ext.ext_argparse import ArgparseController, expose
+from cement.utils.misc import rando
+
+SHAPES = ['wide', 'deep', 'mixed']
+
+
+class Base(ArgparseController):
+
+    class Meta:
+        label = 'base'
+
+    @expose(hide=True)
+    def default(self):
+        pass
+
+
+def make_controllers(shape, count):
+    controllers = []
+    for i in range(count):
+        label = 'synthetic_%s' % i
+        if shape == 'wide':
+            stacked_on = 'base'
+        elif shape == 'deep':
+            stacked_on = 'base' if i == 0 else 'synthetic_%s' % (i - 1)
+        else:
+            # a tree where every controller has up to 10 children
+            stacked_on = 'base' if i < 10 else 'synthetic_%s' % (i // 10 - 1)
+
+        if shape != 'deep' and i % 2:
+            stacked_type = 'embedded'
+        else:
+            stacked_type = 'nested'
+
+        meta = type('Meta', (object,), dict(label=label,
+                                            stacked_on=stacked_on,
+                                            stacked_type=stacked_type))
+        controllers.append(type('Synthetic%s' % i, (ArgparseController,),
+                                dict(Meta=meta)))
+    return controllers
+
+
+def bench(shape, count):
+    app = CementApp(rando()[:12],
+                    argv=[],
+                    exit_on_close=False,
+                    handlers=[Base] + make_controllers(shape, count))
+    app.setup()
+    try:
+        controllers = [c() for c in app.handler.list('controller')
+                       if c is not Base]
+        for contr in controllers:
+            contr._setup(app)
+
+        start = default_timer()
+        resolved = app.controller._resolve_controllers(controllers)
+        elapsed = default_timer() - start
+        assert len(resolved) == count + 1
+    finally:
+        app.close()
+
+    return elapsed
+
+
+def main(counts):
+    print('%-8s %10s %12s %16s' % ('shape', 'count', 'total (ms)',
+                                   'per contr (us)'))
+    for shape in SHAPES:
+        for count in counts:
+            elapsed = bench(shape, count)
+            print('%-8s %10s %12.3f %16.3f' % (shape, count, elapsed * 1000,
+                                               elapsed / count * 1000000))
+
+
+if __name__ == '__main__':
+    counts = [int(x) for x in sys.argv[1:]] or [1000, 2000, 4000, 8000]
+    main(counts)
@@ -9,14 +9,18 @@ class MyCacheHandler(cache.CementCacheHandler):
     class Meta:
         label = 'my_cache_handler'
 
+    def __init__(self, *args, **kw):
+        super(MyCacheHandler, self).__init__(*args, **kw)
+        self.items = dict()
+
     def get(self, key, fallback=None):
-        pass
+        return self.items.get(key, fallback)
 
     def set(self, key, value):
-        pass
+        self.items[key] = value
 
     def delete(self, key):
-        pass
+        self.items.pop(key, None)
 
     def purge(self):
         pass
@@ -35,3 +39,12 @@ class CacheTestCase(test.CementCoreTestCase):
         self.app.cache.get('foo')
         self.app.cache.delete('foo')
         self.app.cache.purge()
+
+    def test_base_handler_many(self):
+        self.app.setup()
+        self.app.cache.set_many(dict(foo='bar', bar='baz'))
+        self.eq(self.app.cache.get_many(['foo', 'bar', 'bogus'], 'fb'),
+                dict(foo='bar', bar='baz', bogus='fb'))
+        self.app.cache.delete_many(['foo', 'bogus'])
+        self.eq(self.app.cache.get_many(['foo', 'bar']),
+                dict(foo=None, bar='baz'))
@@ -84,3 +84,126 @@ class ConfigTestCase(test.CementCoreTestCase):
         self.app._meta.config_files = [self.tmp_file]
         self.app.setup()
         self.eq(self.app.config.get('my_section', 'my_param'), 'my_value')
+
+    def test_get_key_sections(self):
+        f = open(self.tmp_file, 'w+')
+        f.write(CONFIG)
+        f.close()
+        self.app._meta.config_files = [self.tmp_file]
+        self.app.setup()
+        self.eq(self.app.config.get_key_sections('my_param'),
+                ['my_section'])
+        self.eq(self.app.config.get_key_sections('bogus_key'), [])
+
+        # kept up to date by set() and merge()
+        self.app.config.add_section('other_section')
+        self.app.config.set('other_section', 'my_param', 'other_value')
+        self.app.config.merge(dict(third_section=dict(my_param='third')))
+        self.eq(sorted(self.app.config.get_key_sections('my_param')),
+                ['my_section', 'other_section', 'third_section'])
+
+        # and rebuilt after parsing a file
+        f = open(self.tmp_file, 'w+')
+        f.write("[fourth_section]\nmy_param = fourth\n")
+        f.close()
+        self.app.config.parse_file(self.tmp_file)
+        self.ok('fourth_section' in
+                self.app.config.get_key_sections('my_param'))
+
+        self.app.config.remove_section('my_section')
+        self.ok('my_section' not in
+                self.app.config.get_key_sections('my_param'))
+
+    def test_config_override_multiple_sections(self):
+        defaults = dict()
+        defaults['test'] = dict(foo='bar')
+        defaults['other'] = dict(foo='bar')
+        defaults['third'] = dict(bar='foo')
+
+        self.app = self.make_app(
+            config_defaults=defaults,
+            argv=['--foo=not_bar'],
+            arguments_override_config=True,
+        )
+        self.app.setup()
+        self.app.args.add_argument('--foo', action='store')
+        self.app.run()
+        self.eq(self.app.config.get('test', 'foo'), 'not_bar')
+        self.eq(self.app.config.get('other', 'foo'), 'not_bar')
+        self.eq(self.app.config.keys('third'), ['bar'])
+
+    def test_config_override_parsed_args_only(self):
+        defaults = dict()
+        defaults['test'] = dict(foo='bar')
+
+        self.app = self.make_app(
+            config_defaults=defaults,
+            argv=['--foo=not_bar'],
+            arguments_override_config=True,
+        )
+        self.app.setup()
+        self.app.args.add_argument('--foo', action='store')
+
+        # only the parsed arguments are looked up (not every attribute of the
+        # parsed arguments object)
+        looked_up = []
+        get_key_sections = self.app.config.get_key_sections
+
+        def get_key_sections_counted(key):
+            looked_up.append(key)
+            return get_key_sections(key)
+
+        self.app.config.get_key_sections = get_key_sections_counted
+        self.app.run()
+        self.eq(sorted(set(looked_up)),
+                sorted(vars(self.app.pargs).keys()))
+        self.eq(self.app.config.get('test', 'foo'), 'not_bar')
+
+    def test_get_snapshot(self):
+        defaults = dict()
+        defaults['test'] = dict(foo='bar', count='10', enabled='true')
+        self.app = self.make_app(config_defaults=defaults)
+        self.app.setup()
+
+        snapshot = self.app.config.get_snapshot()
+        self.ok(snapshot is self.app.config.get_snapshot())
+        self.ok(snapshot.has_section('test'))
+        self.eq(snapshot.get('test', 'foo'), 'bar')
+        self.eq(snapshot.get('test', 'bogus', 'fallback'), 'fallback')
+        self.eq(snapshot.get_int('test', 'count'), 10)
+        self.eq(snapshot.get_bool('test', 'enabled'), True)
+        self.eq(snapshot.get_int('test', 'bogus', 5), 5)
+        self.ok('foo' in snapshot.keys('test'))
+
+        # changing the config makes a new snapshot, and leaves the old one
+        self.app.config.set('test', 'count', '20')
+        new_snapshot = self.app.config.get_snapshot()
+        self.ok(new_snapshot is not snapshot)
+        self.eq(new_snapshot.get_int('test', 'count'), 20)
+        self.eq(snapshot.get_int('test', 'count'), 10)
+
+        self.app.config.merge(dict(other=dict(foo='baz')))
+        self.eq(self.app.config.get_snapshot().get('other', 'foo'), 'baz')
+
+        f = open(self.tmp_file, 'w+')
+        f.write(CONFIG)
+        f.close()
+        self.app.config.parse_file(self.tmp_file)
+        self.eq(self.app.config.get_snapshot().get('my_section', 'my_param'),
+                'my_value')
+
+    def test_get_snapshot_without_support(self):
+        self.app.setup()
+        config_obj = self.app.config
+        config_obj.set(self.app._meta.config_section, 'foo', 'bar')
+
+        class NoSnapshotConfig(object):
+
+            def get_sections(self):
+                return config_obj.get_sections()
+
+            def get_section_dict(self, section):
+                return config_obj.get_section_dict(section)
+
+        snapshot = config.get_snapshot(NoSnapshotConfig())
+        self.eq(snapshot.get(self.app._meta.config_section, 'foo'), 'bar')
@@ -1,6 +1,7 @@
 """Tests for cement.core.controller."""
 
 import re
+import sys
 from cement.core import exc, controller
 from cement.utils import test
 from cement.utils.misc import rando, init_defaults
@@ -154,6 +155,48 @@ class BadStackType(controller.CementBaseController):
         ]
 
 
+class SubController(TestController):
+
+    class Meta:
+        label = 'base'
+
+    # no longer exposed
+    def some_command(self):
+        pass
+
+    @controller.expose()
+    def another_command(self):
+        pass
+
+
+class CountingEmbedded(Embedded):
+
+    instances = 0
+
+    class Meta:
+        label = 'counting_embedded'
+
+    def __init__(self, *args, **kw):
+        super(CountingEmbedded, self).__init__(*args, **kw)
+        CountingEmbedded.instances += 1
+
+    @controller.expose()
+    def counting_cmd1(self):
+        pass
+
+
+class EmbeddedOnEmbedded(controller.CementBaseController):
+
+    class Meta:
+        label = 'embedded_on_embedded'
+        stacked_on = 'counting_embedded'
+        stacked_type = 'embedded'
+
+    @controller.expose()
+    def embedded_on_embedded_cmd1(self):
+        pass
+
+
 class ControllerTestCase(test.CementCoreTestCase):
 
     def test_default(self):
@@ -371,3 +414,46 @@ class ControllerTestCase(test.CementCoreTestCase):
             help = app.controller._help_text
             # self.ok(usage.startswith('%s (sub-commands ...)' % \
             #         self.app._meta.label))
+
+    def test_get_exposed(self):
+        if sys.version_info >= (3, 6):
+            # built when the class is defined
+            self.ok('__cement_exposed__' in TestController.__dict__)
+
+        labels = [x['label'] for x in controller.get_exposed(TestController)]
+        self.eq(labels, ['default', 'some-command'])
+
+        labels = [x['label'] for x in controller.get_exposed(SubController)]
+        self.eq(labels, ['another-command', 'default'])
+
+        # the registry can be re-built for classes that were modified
+        def patched_command(self):
+            pass
+
+        SubController.patched_command = controller.expose()(patched_command)
+        try:
+            controller.register_exposed(SubController)
+            labels = [x['label']
+                      for x in controller.get_exposed(SubController)]
+            self.eq(labels, ['another-command', 'default', 'patched-command'])
+        finally:
+            del SubController.patched_command
+            controller.register_exposed(SubController)
+
+    def test_collect_instantiates_once(self):
+        CountingEmbedded.instances = 0
+        app = self.make_app(argv=['embedded-on-embedded-cmd1'])
+        app.handler.register(TestController)
+        app.handler.register(CountingEmbedded)
+        app.handler.register(EmbeddedOnEmbedded)
+        app.setup()
+
+        # registration validates an instance
+        CountingEmbedded.instances = 0
+        app.run()
+        self.eq(CountingEmbedded.instances, 1)
+
+        check = 'embedded-on-embedded-cmd1' in app.controller._dispatch_map
+        self.ok(check)
+        check = 'counting-cmd1' in app.controller._dispatch_map
+        self.ok(check)
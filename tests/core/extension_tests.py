@@ -1,8 +1,33 @@
 """Tests for cement.core.extension."""
 
+import os
+import sys
 from cement.core import exc, backend, extension, output, interface
 from cement.utils import test
 
+LAZY_EXTENSION = """
+from cement.core import output
+
+
+class LazyOutputHandler(output.CementOutputHandler):
+    class Meta:
+        interface = output.IOutput
+        label = 'lazy'
+        overridable = True
+
+    def render(self, data_dict, **kw):
+        return 'lazy'
+
+
+def lazy_hook(app):
+    pass
+
+
+def load(app):
+    app.hook.register('pre_close', lazy_hook)
+    app.handler.register(LazyOutputHandler)
+"""
+
 
 class IBogus(interface.Interface):
 
@@ -52,3 +77,124 @@ class ExtensionTestCase(test.CementCoreTestCase):
 
         res = 'cement.ext.ext_json' in ext.get_loaded_extensions()
         self.ok(res)
+
+    def _lazy_app(self, **kw):
+        # write out a fresh extension module that has not been imported
+        pkg = 'lazy_pkg_%s' % self.rando
+        mod = '%s.ext_lazy' % pkg
+        os.makedirs(os.path.join(self.tmp_dir, pkg))
+        open(os.path.join(self.tmp_dir, pkg, '__init__.py'), 'w').close()
+        with open(os.path.join(self.tmp_dir, pkg, 'ext_lazy.py'), 'w') as f:
+            f.write(LAZY_EXTENSION)
+        sys.path.insert(0, self.tmp_dir)
+
+        manifest = {}
+        manifest[mod] = dict(
+            handlers=dict(output=['lazy']),
+            overridable=dict(output=['lazy']),
+            hooks=['pre_close'],
+        )
+        app = self.make_app(lazy_extensions=True,
+                            extension_manifest=manifest,
+                            extensions=[mod],
+                            **kw)
+        return (app, mod)
+
+    def tearDown(self):
+        super(ExtensionTestCase, self).tearDown()
+        if self.tmp_dir in sys.path:
+            sys.path.remove(self.tmp_dir)
+
+    def test_lazy_extension_get(self):
+        app, mod = self._lazy_app()
+        app.setup()
+        self.ok(mod not in sys.modules)
+        self.ok(mod in app.ext.get_lazy_extensions())
+        self.ok(mod not in app.ext.get_loaded_extensions())
+        self.ok(app.handler.registered('output', 'lazy'))
+
+        han = app.handler.get('output', 'lazy')
+        self.eq(han.__name__, 'LazyOutputHandler')
+        self.ok(mod in sys.modules)
+        self.ok(mod in app.ext.get_loaded_extensions())
+        self.ok(mod not in app.ext.get_lazy_extensions())
+
+        # loading it again is a no-op
+        app.ext.load_extension(mod)
+        app.ext._load_lazy_extension(mod)
+
+    def test_lazy_extension_resolve(self):
+        app, mod = self._lazy_app(output_handler='lazy')
+        app.setup()
+        self.ok(mod in sys.modules)
+        self.eq(app.render(dict(foo='bar'), out=None), 'lazy')
+
+    def test_lazy_extension_override_option(self):
+        app, mod = self._lazy_app(argv=['-o', 'lazy'])
+        app.setup()
+
+        # offered as a choice without loading it
+        self.ok(mod not in sys.modules)
+        app.run()
+        self.ok(mod in sys.modules)
+        self.eq(app.output._meta.label, 'lazy')
+
+    def test_lazy_extension_hook(self):
+        app, mod = self._lazy_app()
+        app.setup()
+        self.ok(mod not in sys.modules)
+        app.close()
+        self.ok(mod in sys.modules)
+
+    def test_lazy_extension_not_in_manifest(self):
+        app = self.make_app(lazy_extensions=True,
+                            extensions=['cement.ext.ext_alarm'])
+        app.setup()
+        res = 'cement.ext.ext_alarm' in app.ext.get_loaded_extensions()
+        self.ok(res)
+
+    def test_manifest_declares_hooks(self):
+        # the manifest must declare every hook an extension registers, or
+        # lazily loading it from one of those hooks would miss that hook
+        class Recorder(object):
+            def __init__(self):
+                self.hooks = []
+
+            def register(self, *args, **kw):
+                if len(args) > 1:
+                    self.hooks.append(args[0])
+
+        for ext_module, manifest in extension.EXTENSION_MANIFEST.items():
+            try:
+                __import__(ext_module, globals(), locals(), [], 0)
+            except ImportError:
+                continue
+            app = Recorder()
+            app.hook = Recorder()
+            app.handler = Recorder()
+            sys.modules[ext_module].load(app)
+            for name in app.hook.hooks:
+                self.ok(name in manifest.get('hooks', []),
+                        "%s registers undeclared hook '%s'" %
+                        (ext_module, name))
+
+    def test_lazy_extension_hooks_when(self):
+        # running the hooks of the json/yaml extensions doesn't load them
+        # unless their output handler is overridden via command line
+        mods = ['cement.ext.ext_json', 'cement.ext.ext_yaml']
+        saved = dict((mod, sys.modules.pop(mod, None)) for mod in mods)
+        try:
+            app = self.make_app(lazy_extensions=True,
+                                extensions=['json', 'yaml'],
+                                argv=[])
+            app.setup()
+            app.run()
+            app.render(dict(foo='bar'))
+            app.close()
+            for mod in mods:
+                self.ok(mod not in sys.modules)
+                self.ok(mod in app.ext.get_lazy_extensions())
+        finally:
+            for mod, module in saved.items():
+                if module is not None:
+                    sys.modules[mod] = module
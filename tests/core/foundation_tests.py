@@ -4,13 +4,14 @@ import os
 import sys
 import json
 import signal
+import mock
 from time import sleep
 from cement.core import foundation, exc, backend, config, extension, plugin
 from cement.core.handler import CementBaseHandler
 from cement.core.controller import CementBaseController, expose
 from cement.core import log, output, hook, arg, controller
 from cement.core.interface import Interface
-from cement.utils import test
+from cement.utils import test, sched
 from cement.core.exc import CaughtSignal
 from cement.utils.misc import init_defaults, rando, minimal_logger
 from nose.plugins.attrib import attr
@@ -66,6 +67,40 @@ class BogusBaseController(controller.CementBaseController):
         label = 'bad_base_controller_label'
 
 
+class BatchController(controller.CementBaseController):
+
+    class Meta:
+        label = 'base'
+        arguments = [
+            (['--foo'], dict(action='store', dest='foo')),
+        ]
+
+    @expose()
+    def render_foo(self):
+        self.app.render(dict(foo=self.app.pargs.foo))
+        return self.app.pargs.foo
+
+    @expose()
+    def config_foo(self):
+        return self.app.config.get(self.app._meta.label, 'foo')
+
+    @expose()
+    def fail(self):
+        raise HookTestException('batch failure')
+
+    @expose()
+    def exit_code(self):
+        self.app.exit_code = 3
+
+    @expose()
+    def pid(self):
+        return os.getpid()
+
+    @expose()
+    def unpicklable(self):
+        return lambda: None
+
+
 def my_hook_one(app):
     return 1
 
@@ -510,6 +545,63 @@ class FoundationTestCase(test.CementCoreTestCase):
         finally:
             signal.alarm(0) 
 
+    def test_run_forever_scheduler(self):
+        runs = []
+        reloads = []
+        scheduler = sched.Scheduler(0.01, backoff=0.02)
+
+        class Controller(CementBaseController):
+            class Meta:
+                label = 'base'
+
+            @expose()
+            def runit(self):
+                runs.append(True)
+                if len(runs) == 1:
+                    # reload on demand
+                    os.kill(os.getpid(), signal.SIGHUP)
+                elif len(runs) == 2:
+                    raise Exception("Fake some error")
+                else:
+                    scheduler.stop()
+
+        app = self.make_app(base_controller=Controller, argv=['runit'])
+        with app as app:
+            app.hook.register('pre_reload', lambda app: reloads.append(app))
+            app.run_forever(tb=False, scheduler=scheduler)
+
+        self.eq(len(runs), 3)
+        self.eq(len(reloads), 1)
+        self.eq(scheduler.failures, 0)
+
+    def test_run_forever_scheduler_reload_twice(self):
+        runs = []
+        reloads = []
+        scheduler = sched.Scheduler(0.01)
+
+        class Controller(CementBaseController):
+            class Meta:
+                label = 'base'
+
+            @expose()
+            def runit(self):
+                runs.append(True)
+                if len(runs) < 3:
+                    # every reload re-installs the app's signal handlers
+                    os.kill(os.getpid(), signal.SIGHUP)
+                else:
+                    scheduler.stop()
+
+        app = self.make_app(base_controller=Controller, argv=['runit'])
+        with app as app:
+            # (hooks registered here do not survive the first reload)
+            reload = app.reload
+            app.reload = lambda: reloads.append(reload())
+            app.run_forever(tb=False, scheduler=scheduler)
+
+        self.eq(len(runs), 3)
+        self.eq(len(reloads), 2)
+
     def test_add_template_directory(self):
         self.app.setup()
         
@@ -545,3 +637,384 @@ class FoundationTestCase(test.CementCoreTestCase):
         app.setup()
         self.eq(app.log._meta.debug_format, DEBUG_FORMAT)
 
+    def test_startup_stats_disabled(self):
+        self.app.setup()
+        self.eq(self.app.startup_stats, None)
+
+    def test_profile_startup(self):
+        app = self.make_app(APP,
+                            profile_startup=True,
+                            profile_startup_report=False,
+                            extensions=['json'],
+                            )
+        app.setup()
+        stats = app.startup_stats
+        labels = [x['label'] for x in stats['phases']]
+        self.ok('lay_cement' in labels)
+        self.ok('extension_handler' in labels)
+        self.ok('controllers' in labels)
+        for item in stats['phases']:
+            self.ok(item['wall'] >= 0)
+            self.ok(item['cpu'] >= 0)
+
+        exts = [x['label'] for x in stats['extensions']]
+        self.ok('cement.ext.ext_json' in exts)
+        app.close()
+
+    def test_profile_startup_setup_error(self):
+        def pre_setup(app):
+            raise HookTestException('setup failure')
+
+        app = self.make_app(APP, profile_startup=True)
+        self.ok(app._profiler._started_tracing)
+        app.hook.register('pre_setup', pre_setup)
+        try:
+            app.setup()
+        except HookTestException:
+            pass
+
+        # memory tracing is stopped even though setup failed
+        self.eq(app._profiler._started_tracing, False)
+
+    def test_profile_startup_via_argv(self):
+        app = self.make_app(APP, argv=['--profile-startup'],
+                            profile_startup_option=True)
+        app.setup()
+        app.run()
+        self.eq(app._meta.profile_startup, True)
+        self.ok(len(app.startup_stats['phases']) > 0)
+        self.eq(app.pargs.profile_startup, True)
+
+        app.reload()
+        labels = [x['label'] for x in app.startup_stats['phases']]
+        self.eq(labels.count('lay_cement'), 1)
+
+    def test_profile_startup_option_disabled(self):
+        # the option is not added (or honored) unless enabled
+        app = self.make_app(APP, argv=['--profile-startup'])
+        self.eq(app._meta.profile_startup, False)
+        app.setup()
+        self.ok('--profile-startup' not in app.args.format_help())
+        app.args.add_argument('--profile-startup', dest='profile_startup',
+                              action='store_true')
+        app.run()
+        self.eq(app.startup_stats, None)
+        self.eq(app.pargs.profile_startup, True)
+
+    def test_setup_snapshot(self):
+        config_file = os.path.join(self.tmp_dir, 'app.conf')
+        snapshot_file = os.path.join(self.tmp_dir, 'setup.snapshot')
+        with open(config_file, 'w') as f:
+            f.write("[my-app-test]\nfoo = bar\n")
+
+        def make_app():
+            app = self.make_app('my-app-test',
+                                config_files=[config_file],
+                                setup_snapshot=True,
+                                setup_snapshot_file=snapshot_file)
+            app.setup()
+            return app
+
+        app = make_app()
+        self.eq(app._snapshot.hit, False)
+        self.eq(app.config.get('my-app-test', 'foo'), 'bar')
+        self.ok(os.path.exists(snapshot_file))
+
+        app = make_app()
+        self.eq(app._snapshot.hit, True)
+        self.eq(app.config.get('my-app-test', 'foo'), 'bar')
+
+        # changing a config file invalidates the snapshot
+        with open(config_file, 'w') as f:
+            f.write("[my-app-test]\nfoo = not-bar\n")
+
+        app = make_app()
+        self.eq(app._snapshot.hit, False)
+        self.eq(app.config.get('my-app-test', 'foo'), 'not-bar')
+
+    def test_config_cache(self):
+        config_file = os.path.join(self.tmp_dir, 'app.conf')
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        with open(config_file, 'w') as f:
+            f.write("[my-app-test]\nfoo = bar\n")
+
+        def make_app():
+            app = self.make_app('my-app-test',
+                                config_files=[config_file],
+                                config_cache=True,
+                                config_cache_dir=cache_dir)
+            app.setup()
+            return app
+
+        app = make_app()
+        self.eq(app.config.get('my-app-test', 'foo'), 'bar')
+        self.eq(len(os.listdir(cache_dir)), 1)
+        cache = app._config_cache
+        self.eq(cache.get(config_file, app.config.__class__),
+                {'my-app-test': {'foo': 'bar'}})
+
+        app = make_app()
+        self.eq(app.config.get('my-app-test', 'foo'), 'bar')
+
+        # changing the config file invalidates its cache entry
+        with open(config_file, 'w') as f:
+            f.write("[my-app-test]\nfoo = not-bar\n")
+
+        app = make_app()
+        self.eq(app.config.get('my-app-test', 'foo'), 'not-bar')
+
+    def test_config_cache_disabled(self):
+        self.app.setup()
+        self.eq(self.app._config_cache, None)
+
+    def test_incremental_reload(self):
+        config_file = os.path.join(self.tmp_dir, 'app.conf')
+        with open(config_file, 'w') as f:
+            f.write("[my-app-test]\nfoo = bar\n")
+
+        reloads = []
+
+        def post_reload(app, changes):
+            reloads.append(changes)
+
+        app = self.make_app('my-app-test',
+                            config_files=[config_file],
+                            config_defaults=dict(my_section=dict(a='b')),
+                            incremental_reload=True)
+        app.setup()
+        app.extend('some_extra_member', dict())
+        app.hook.register('post_reload', post_reload)
+        log_handler = app.log
+        mail = app.mail
+
+        # nothing changed
+        app.reload()
+        self.eq(reloads, [{}])
+        self.ok(app.mail is mail)
+
+        # only the handlers whose config changed are setup again
+        with open(config_file, 'w') as f:
+            f.write("[my-app-test]\nfoo = not-bar\n" +
+                    "[my_section]\na = c\n" +
+                    "[mail.dummy]\nsubject_prefix = PREFIX\n")
+        app.reload()
+        self.eq(reloads[-1], {'my-app-test': ['foo'],
+                              'my_section': ['a'],
+                              'mail.dummy': ['subject_prefix']})
+        self.eq(app.config.get('my-app-test', 'foo'), 'not-bar')
+        self.eq(app.config.get('mail.dummy', 'subject_prefix'), 'PREFIX')
+        self.ok(app.log is log_handler)
+        self.ok(app.mail is not mail)
+        self.ok(hasattr(app, 'some_extra_member'))
+
+        # removed keys are reset to their defaults
+        with open(config_file, 'w') as f:
+            f.write("[my-app-test]\nfoo = not-bar\n" +
+                    "[mail.dummy]\nsubject_prefix = PREFIX\n")
+        app.reload()
+        self.eq(reloads[-1], {'my_section': ['a']})
+        self.eq(app.config.get('my_section', 'a'), 'b')
+        self.ok(hasattr(app, 'some_extra_member'))
+
+        # removed keys without a default require a full reload
+        with open(config_file, 'w') as f:
+            f.write("[mail.dummy]\nsubject_prefix = PREFIX\n")
+        app.reload()
+        self.eq(len(reloads), 3)
+        self.eq(app.config.keys('my-app-test').count('foo'), 0)
+        self.ok(app.log is not log_handler)
+        self.eq(hasattr(app, 'some_extra_member'), False)
+
+    def test_reload_hooks(self):
+        reloads = []
+
+        def pre_reload(app):
+            reloads.append('pre')
+
+        def post_reload(app, changes):
+            reloads.append(changes)
+
+        self.app.setup()
+        self.app.hook.register('pre_reload', pre_reload)
+        self.app.hook.register('post_reload', post_reload)
+        self.app.reload()
+
+        # hooks are re-defined by a full reload, so only pre_reload ran
+        self.eq(reloads, ['pre'])
+        self.ok(self.app.hook.defined('post_reload'))
+
+    def test_setup_snapshot_disabled(self):
+        self.app.setup()
+        self.eq(self.app._snapshot, None)
+
+    def test_run_batch(self):
+        app = self.make_app(APP, base_controller=BatchController)
+        app.setup()
+        results = app.run_batch([
+            ['render-foo', '--foo', 'bar'],
+            'render-foo',
+            'render-foo --foo "bar baz"',
+        ])
+        self.eq([res.exit_code for res in results], [0, 0, 0])
+        self.eq([res.result for res in results], ['bar', None, 'bar baz'])
+        self.eq(results[0].rendered[0], dict(foo='bar'))
+        self.eq(results[1].rendered[0], dict(foo=None))
+        self.eq(results[2].argv, ['render-foo', '--foo', 'bar baz'])
+        self.eq(app.exit_code, 0)
+
+        # the original arguments are restored
+        self.eq(app.argv, [])
+
+    def test_run_batch_skip_lines(self):
+        app = self.make_app(APP, base_controller=BatchController)
+        app.setup()
+        results = app.run_batch(['', '  ', '# a comment',
+                                 'render-foo --foo bar'])
+        self.eq([res.argv for res in results],
+                [['render-foo', '--foo', 'bar']])
+
+    def test_run_batch_config_overrides(self):
+        defaults = init_defaults(APP)
+        defaults[APP]['foo'] = 'default'
+        app = self.make_app(APP, base_controller=BatchController,
+                            config_defaults=defaults,
+                            arguments_override_config=True)
+        app.setup()
+
+        # overridden config settings don't leak into the next command
+        results = app.run_batch([['config-foo', '--foo', 'bar'],
+                                 ['config-foo']])
+        self.eq([res.result for res in results], ['bar', 'default'])
+        self.eq(app.config.get(APP, 'foo'), 'default')
+
+    def test_run_command(self):
+        app = self.make_app(APP, base_controller=BatchController)
+        app.setup()
+        res = app.run_command(['render-foo', '--foo', 'bar'])
+        self.eq(res.result, 'bar')
+        self.eq(res.rendered[0], dict(foo='bar'))
+
+        res = app.run_command(['exit-code'])
+        self.eq(res.exit_code, 3)
+        self.eq(app.exit_code, 3)
+        res = app.run_command(['fail'])
+        self.ok(isinstance(res.error, HookTestException))
+        self.eq(app.argv, [])
+
+    def test_run_batch_errors(self):
+        app = self.make_app(APP, base_controller=BatchController)
+        app.setup()
+        results = app.run_batch([
+            ['fail'],
+            ['exit-code'],
+            ['render-foo', '--bogus'],
+            ['render-foo', '--foo', 'bar'],
+        ])
+        self.eq([res.exit_code for res in results], [1, 3, 2, 0])
+        self.ok(isinstance(results[0].error, HookTestException))
+        self.eq(results[1].error, None)
+        self.eq(results[3].result, 'bar')
+        self.eq(app.exit_code, 3)
+
+        results = app.run_batch([['fail'], ['render-foo']],
+                                stop_on_error=True)
+        self.eq(len(results), 1)
+
+    def test_batch_mode(self):
+        batch_file = os.path.join(self.tmp_dir, 'batch.txt')
+        with open(batch_file, 'w') as f:
+            f.write("# a comment\n\nrender-foo --foo bar\nexit-code\n")
+
+        app = self.make_app(APP, base_controller=BatchController,
+                            batch_mode=True,
+                            argv=['--batch', batch_file])
+        app.setup()
+        results = app.run()
+        self.eq([res.argv for res in results],
+                [['render-foo', '--foo', 'bar'], ['exit-code']])
+        self.eq(app.exit_code, 3)
+
+        # other arguments are prepended to every line
+        app = self.make_app(APP, base_controller=BatchController,
+                            batch_mode=True,
+                            argv=['--batch=%s' % batch_file, '--debug'])
+        app.setup()
+        results = app.run()
+        self.eq(results[0].argv, ['--debug', 'render-foo', '--foo', 'bar'])
+
+    def test_batch_mode_stdin(self):
+        app = self.make_app(APP, base_controller=BatchController,
+                            batch_mode=True,
+                            argv=['--batch', '-'])
+        app.setup()
+
+        batch_file = os.path.join(self.tmp_dir, 'batch.txt')
+        with open(batch_file, 'w') as f:
+            f.write("render-foo --foo bar\n")
+
+        with open(batch_file, 'r') as f:
+            with mock.patch('sys.stdin', f):
+                results = app.run()
+        self.eq(results[0].result, 'bar')
+
+    def test_batch_mode_disabled(self):
+        app = self.make_app(APP, base_controller=BatchController,
+                            argv=['render-foo', '--foo', 'bar'])
+        app.setup()
+        self.eq(app.run(), 'bar')
+
+    def test_run_many(self):
+        app = self.make_app(APP, base_controller=BatchController)
+        app.setup()
+        argvs = [['render-foo', '--foo', str(i)] for i in range(20)]
+        results = app.run_many(argvs + ['fail', 'exit-code'], workers=2)
+        self.eq([res.result for res in results[:20]],
+                [str(i) for i in range(20)])
+        self.eq(results[5].rendered[0], dict(foo='5'))
+        self.eq([res.exit_code for res in results[20:]], [1, 3])
+        self.ok(isinstance(results[20].error, HookTestException))
+        self.eq(app.exit_code, 3)
+
+        # commands are run by (more than one) worker process
+        results = app.run_many([['pid']] * 20, workers=2)
+        pids = set([res.result for res in results])
+        self.ok(os.getpid() not in pids)
+        self.ok(len(pids) <= 2)
+
+        results = app.run_many(argvs, workers=2, ordered=False)
+        self.eq(sorted([int(res.result) for res in results]), list(range(20)))
+
+    def test_run_many_unpicklable(self):
+        app = self.make_app(APP, base_controller=BatchController)
+        app.setup()
+        results = app.run_many([['unpicklable']], workers=2)
+        self.eq(results[0].exit_code, 0)
+        self.eq(results[0].result, None)
+
+    def test_run_many_serial(self):
+        app = self.make_app(APP, base_controller=BatchController)
+        app.setup()
+        results = app.run_many([['pid'], ['pid']], workers=1)
+        self.eq([res.result for res in results], [os.getpid()] * 2)
+
+    def test_batch_mode_parallel(self):
+        batch_file = os.path.join(self.tmp_dir, 'batch.txt')
+        with open(batch_file, 'w') as f:
+            f.write("pid\npid\nexit-code\n")
+
+        app = self.make_app(APP, base_controller=BatchController,
+                            batch_mode=True,
+                            argv=['--parallel', '2', '--batch', batch_file])
+        app.setup()
+        results = app.run()
+        self.eq(len(results), 3)
+        self.ok(os.getpid() not in [res.result for res in results[:2]])
+        self.eq(app.exit_code, 3)
+
+    @test.raises(exc.FrameworkError)
+    def test_batch_mode_parallel_invalid(self):
+        app = self.make_app(APP, base_controller=BatchController,
+                            batch_mode=True,
+                            argv=['--parallel=bogus', '--batch', '-'])
+        app.setup()
+        app.run()
@@ -5,6 +5,7 @@ from cement.core import interface
 from cement.utils import test
 from cement.ext import ext_dummy
 from cement.ext.ext_configparser import ConfigParserConfigHandler
+from cement.ext.ext_argparse import ArgparseController, expose
 
 
 class BogusOutputHandler(meta.MetaMixin):
@@ -138,7 +139,8 @@ class HandlerTestCase(test.CementCoreTestCase):
         self.app.setup()
         self.ok(self.app.handler.registered('output', 'dummy'))
         self.eq(self.app.handler.registered('output', 'bogus_handler'), False)
-        self.eq(self.app.handler.registered('bogus_type', 'bogus_handler'), False)
+        self.eq(self.app.handler.registered('bogus_type', 'bogus_handler'),
+                False)
 
     @test.raises(exc.FrameworkError)
     def test_get_bogus_handler(self):
@@ -197,6 +199,41 @@ class HandlerTestCase(test.CementCoreTestCase):
         self.app.setup()
         self.eq(self.app.handler.registered('output', 'dummy'), True)
 
+    def test_register_lazy(self):
+        self.app.setup()
+        loaded = []
+
+        def loader():
+            loaded.append(True)
+            self.app.handler.register(TestHandler)
+
+        self.app.handler.define(TestInterface)
+        self.app.handler.register_lazy('test', 'test', loader)
+        self.eq(self.app.handler.registered('test', 'test'), True)
+        self.eq(self.app.handler.list_lazy('test'), dict(test=False))
+        self.eq(self.app.handler.list('test', load_lazy=False), [])
+        self.eq(loaded, [])
+
+        self.eq(self.app.handler.get('test', 'test'), TestHandler)
+        self.eq(loaded, [True])
+        self.eq(self.app.handler.list_lazy('test'), {})
+
+        # already registered, so nothing to do
+        self.app.handler.register_lazy('test', 'test', loader)
+        self.eq(self.app.handler.list_lazy('test'), {})
+
+    def test_register_lazy_list(self):
+        self.app.setup()
+
+        def loader():
+            self.app.handler.register(TestHandler)
+
+        self.app.handler.define(TestInterface)
+        self.app.handler.register_lazy('test', 'test', loader,
+                                       overridable=True)
+        self.eq(self.app.handler.list_lazy('test'), dict(test=True))
+        self.eq(self.app.handler.list('test'), [TestHandler])
+
     def test_handler_get_fallback(self):
         self.app.setup()
         self.eq(self.app.handler.get('log', 'foo', 'bar'), 'bar')
@@ -212,6 +249,147 @@ class HandlerTestCase(test.CementCoreTestCase):
                 interface = BadInterface
         self.app.handler.register(BadHandler)
 
+    def test_register_does_not_instantiate(self):
+        class NoInitHandler(TestHandler):
+            def __init__(self, *args, **kw):
+                raise Exception('handler should not be instantiated')
+
+        self.app.handler.define(TestInterface)
+        self.app.handler.register(NoInitHandler)
+        self.eq(self.app.handler.get('test', 'test'), NoInitHandler)
+
+    def test_validation_cached(self):
+        validated = []
+
+        def validator(obj):
+            validated.append(obj._meta.label)
+
+        class CountingInterface(TestInterface):
+            class IMeta:
+                label = 'counting'
+
+        CountingInterface.IMeta.validator = staticmethod(validator)
+
+        class CountingHandler(TestHandler):
+            class Meta:
+                interface = CountingInterface
+                label = 'counting'
+
+        self.app.handler.define(CountingInterface)
+        self.app.handler.register(CountingHandler)
+        self.app.handler.register(CountingHandler, force=True)
+        self.eq(validated, ['counting'])
+
+        # changing the meta data invalidates the cached result
+        CountingHandler.Meta.label = 'counting2'
+        self.app.handler.register(CountingHandler)
+        self.eq(validated, ['counting', 'counting2'])
+
+    def test_validation_meta_set_in_init(self):
+        class InitLabelHandler(DuplicateHandler):
+            class Meta:
+                label = None
+
+            def __init__(self, *args, **kw):
+                super(InitLabelHandler, self).__init__(*args, **kw)
+                self._meta.label = 'init_label'
+
+        self.app.handler.register(InitLabelHandler)
+        self.eq(self.app.handler.get('output', 'init_label'),
+                InitLabelHandler)
+
+    def test_validation_members_set_in_init(self):
+        class InitMemberHandler(meta.MetaMixin):
+            class Meta:
+                interface = output.IOutput
+                label = 'init_member'
+                config_section = 'output.init_member'
+                config_defaults = {}
+
+            def __init__(self, *args, **kw):
+                super(InitMemberHandler, self).__init__(*args, **kw)
+                self._setup = lambda app: None
+                self.render = lambda data, template=None: ''
+
+        self.app.handler.register(InitMemberHandler)
+        self.eq(self.app.handler.get('output', 'init_member'),
+                InitMemberHandler)
+
+    def test_handler_override_options_not_validated(self):
+        app = self.make_app(defer_handler_validation=True,
+                            handler_override_options={'output': []},
+                            output_handler='dummy')
+        app.setup()
+        app.handler.register_many([BogusOutputHandler2])
+        app.handler.register_many([DuplicateHandler], force=True)
+        app.run()
+
+        # the bogus handler is only validated once it is used
+        self.eq(app.handler.registered('output', 'bogus_handler'), True)
+
+    def test_register_many_deferred(self):
+        app = self.make_app(defer_handler_validation=True)
+        app.setup()
+        app.handler.register_many([BogusOutputHandler2])
+
+        # not validated until it is used
+        self.eq(app.handler.registered('output', 'bogus_handler'), True)
+        try:
+            app.handler.get('output', 'bogus_handler')
+            self.ok(False)
+        except exc.InterfaceError:
+            pass
+        self.eq(app.handler.registered('output', 'bogus_handler'), False)
+
+        app.handler.register_many([BogusOutputHandler2])
+        try:
+            app.handler.list('output')
+            self.ok(False)
+        except exc.InterfaceError:
+            pass
+
+        # valid handlers resolve as usual
+        app.handler.register_many([DuplicateHandler], force=True)
+        han = app.handler.resolve('output', 'dummy')
+        self.ok(isinstance(han, DuplicateHandler))
+
+    def test_register_many_deferred_controllers(self):
+        class Base(ArgparseController):
+            class Meta:
+                label = 'base'
+
+        class Used(ArgparseController):
+            class Meta:
+                label = 'used'
+                stacked_on = 'base'
+                stacked_type = 'nested'
+
+            @expose()
+            def cmd(self):
+                return 'used'
+
+        class Unused(ArgparseController):
+            class Meta:
+                label = 'unused'
+                stacked_on = 'base'
+                stacked_type = 'nested'
+
+        app = self.make_app(defer_handler_validation=True,
+                            handlers=[Base, Used, Unused],
+                            argv=['used', 'cmd'])
+        app.setup()
+        self.eq(sorted(app.handler.__deferred_handlers__.keys()),
+                [('controller', 'unused'), ('controller', 'used')])
+
+        # only the controller that is dispatched to is validated
+        self.eq(app.run(), 'used')
+        self.eq(list(app.handler.__deferred_handlers__.keys()),
+                [('controller', 'unused')])
+
+    @test.raises(exc.InterfaceError)
+    def test_register_many(self):
+        self.app.handler.register_many([BogusOutputHandler2])
+
 
 class DeprecatedHandlerTestCase(test.CementCoreTestCase):
 
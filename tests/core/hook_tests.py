@@ -52,10 +52,26 @@ class HookTestCase(test.CementCoreTestCase):
             self.eq(e.msg, "Hook name 'nosetests_hook' already defined!")
             raise
 
+    def test_register_lazy(self):
+        def loader():
+            self.app.hook.define('lazy_hook')
+            self.app.hook.register('lazy_hook', cement_hook_one)
+
+        self.app.hook.register_lazy('lazy_hook', loader)
+        self.eq(self.app.hook.defined('lazy_hook'), False)
+
+        results = [res for res in self.app.hook.run('lazy_hook')]
+        self.eq(results, ['kapla 1'])
+
+        # the loader is only ever called once
+        results = [res for res in self.app.hook.run('lazy_hook')]
+        self.eq(results, ['kapla 1'])
+
     def test_hooks_registered(self):
         self.app.hook.register('nosetests_hook', cement_hook_one, weight=99)
         self.app.hook.register('nosetests_hook', cement_hook_two, weight=-1)
-        self.app.hook.register('some_bogus_hook', cement_hook_three, weight=-99)
+        self.app.hook.register('some_bogus_hook', cement_hook_three,
+                               weight=-99)
         self.eq(len(self.app.hook.__hooks__['nosetests_hook']), 2)
 
     def test_run(self):
@@ -84,6 +100,60 @@ class HookTestCase(test.CementCoreTestCase):
         self.ok(self.app.hook.defined('nosetests_hook'))
         self.eq(self.app.hook.defined('some_bogus_hook'), False)
 
+    def test_register_sorted(self):
+        self.app.hook.register('nosetests_hook', cement_hook_one, weight=5)
+        self.app.hook.register('nosetests_hook', cement_hook_two, weight=-5)
+        self.app.hook.register('nosetests_hook', cement_hook_three, weight=5)
+        self.app.hook.register('nosetests_hook', nosetests_hook, weight=0)
+
+        # hooks of the same weight keep the order they were registered in
+        funcs = [h[2] for h in self.app.hook.__hooks__['nosetests_hook']]
+        self.eq(funcs, [cement_hook_two, nosetests_hook,
+                        cement_hook_one, cement_hook_three])
+
+        results = [res for res in self.app.hook.run('nosetests_hook')]
+        self.eq(results, ['kapla 2', 'kapla 4', 'kapla 1', 'kapla 3'])
+
+    def test_run_cache(self):
+        self.app.hook.register('nosetests_hook', cement_hook_one, weight=99)
+        results = [res for res in self.app.hook.run('nosetests_hook')]
+        self.eq(results, ['kapla 1'])
+
+        # registering invalidates the cached hooks
+        self.app.hook.register('nosetests_hook', cement_hook_two, weight=-1)
+        results = [res for res in self.app.hook.run('nosetests_hook')]
+        self.eq(results, ['kapla 2', 'kapla 1'])
+
+        # as do hooks registered with the deprecated module functions
+        app = self.make_app(use_backend_globals=True)
+        app.hook.define('nosetests_hook')
+        app.hook.register('nosetests_hook', cement_hook_one)
+        results = [res for res in app.hook.run('nosetests_hook')]
+        self.eq(results, ['kapla 1'])
+
+        hook.register('nosetests_hook', cement_hook_two, weight=-1)
+        results = [res for res in app.hook.run('nosetests_hook')]
+        self.eq(results, ['kapla 2', 'kapla 1'])
+
+    def test_unregister(self):
+        self.app.hook.register('nosetests_hook', cement_hook_one)
+        self.app.hook.register('nosetests_hook', cement_hook_two)
+        self.app.hook.register('nosetests_hook', cement_hook_one, weight=10)
+        results = [res for res in self.app.hook.run('nosetests_hook')]
+        self.eq(results, ['kapla 1', 'kapla 2', 'kapla 1'])
+
+        res = self.app.hook.unregister('nosetests_hook', cement_hook_one)
+        self.eq(res, True)
+        self.eq(len(self.app.hook.__hooks__['nosetests_hook']), 1)
+        results = [res for res in self.app.hook.run('nosetests_hook')]
+        self.eq(results, ['kapla 2'])
+
+        # not registered, or not defined
+        res = self.app.hook.unregister('nosetests_hook', cement_hook_one)
+        self.eq(res, False)
+        res = self.app.hook.unregister('some_bogus_hook', cement_hook_one)
+        self.eq(res, False)
+
     def test_framework_hooks(self):
         app = self.make_app(APP, argv=['--quiet'])
         app.hook.register('pre_setup', cement_hook_one)
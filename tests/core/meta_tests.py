@@ -23,3 +23,30 @@ class MetaTestCase(test.CementCoreTestCase):
         self.eq(t._meta.option_two, 'some other value')
         self.eq(hasattr(t._meta, 'option_three'), False)
         self.eq(t.option_three, 'value three')
+
+    def test_meta_cache(self):
+        class Child(TestMeta):
+
+            class Meta:
+                option_two = 'child value two'
+
+        t1 = Child(option_one='kwarg value one')
+        self.eq(t1._meta.option_one, 'kwarg value one')
+        self.eq(t1._meta.option_two, 'child value two')
+        self.ok('__cement_meta_cache__' in Child.__dict__)
+
+        # kwargs are not merged into the cached defaults
+        t2 = Child()
+        self.eq(t2._meta.option_one, 'value one')
+        self.ok(t1._meta is not t2._meta)
+
+        # changes to the class Meta (or a parent's) are picked up
+        Child.Meta.option_two = 'changed value two'
+        TestMeta.Meta.option_one = 'changed value one'
+        try:
+            t3 = Child()
+            self.eq(t3._meta.option_one, 'changed value one')
+            self.eq(t3._meta.option_two, 'changed value two')
+            self.eq(TestMeta()._meta.option_one, 'changed value one')
+        finally:
+            TestMeta.Meta.option_one = 'value one'
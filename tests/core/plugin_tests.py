@@ -365,3 +365,42 @@ class PluginTestCase(test.CementCoreTestCase):
 
         res = 'ext_json' in app.plugin.get_enabled_plugins()
         self.ok(res)
+
+    def test_load_plugins_from_setup_snapshot(self):
+        f = open(os.path.join(self.tmp_dir, 'myplugin.conf'), 'w')
+        f.write(CONF)
+        f.close()
+
+        f = open(os.path.join(self.tmp_dir, 'myplugin.py'), 'w')
+        f.write(PLUGIN)
+        f.close()
+
+        def make_app():
+            app = self.make_app(APP,
+                                config_files=[],
+                                plugin_config_dir=self.tmp_dir,
+                                plugin_dir=self.tmp_dir,
+                                plugin_bootstrap=None,
+                                setup_snapshot=True,
+                                setup_snapshot_file=self.tmp_file,
+                                )
+            app.setup()
+            return app
+
+        app = make_app()
+        self.eq(app._snapshot.hit, False)
+
+        app = make_app()
+        self.eq(app._snapshot.hit, True)
+        self.ok('myplugin' in app.plugin.get_enabled_plugins())
+        self.ok('myplugin' in app.plugin.get_loaded_plugins())
+        self.eq(app.config.get('myplugin', 'foo'), 'bar')
+
+        # disabling the plugin invalidates the snapshot
+        f = open(os.path.join(self.tmp_dir, 'myplugin.conf'), 'w')
+        f.write(CONF2)
+        f.close()
+
+        app = make_app()
+        self.eq(app._snapshot.hit, False)
+        self.ok('myplugin' in app.plugin.get_disabled_plugins())
@@ -7,6 +7,8 @@ from argparse import ArgumentError
 from cement.ext.ext_argparse import ArgparseArgumentHandler
 from cement.ext.ext_argparse import ArgparseController, expose
 from cement.ext.ext_argparse import _clean_label, _clean_func
+from cement.ext.ext_argparse import _CONTROLLER_ORDER_CACHE, \
+    _CONTROLLER_ORDER_CACHE_SIZE
 from cement.utils import test
 from cement.utils.misc import rando, init_defaults
 from cement.core import handler
@@ -235,6 +237,67 @@ class Aliases(ArgparseController):
         return "Inside Aliases.aliases_cmd1"
 
 
+class MissingParent(ArgparseController):
+
+    class Meta:
+        label = 'missing_parent'
+        stacked_on = 'bogus_parent'
+
+
+class CycleOne(ArgparseController):
+
+    class Meta:
+        label = 'cycle_one'
+        stacked_on = 'cycle_two'
+        stacked_type = 'nested'
+
+
+class CycleTwo(ArgparseController):
+
+    class Meta:
+        label = 'cycle_two'
+        stacked_on = 'cycle_one'
+        stacked_type = 'nested'
+
+
+def synthetic_controllers(count):
+    # half in one deep chain of nested controllers, and half embedded on base
+    controllers = []
+    for i in range(count):
+        if i < count / 2:
+            stacked_on = 'base' if i == 0 else 'synthetic_%s' % (i - 1)
+            stacked_type = 'nested'
+        else:
+            stacked_on = 'base'
+            stacked_type = 'embedded'
+
+        meta = type('Meta', (object,), dict(label='synthetic_%s' % i,
+                                            stacked_on=stacked_on,
+                                            stacked_type=stacked_type))
+        controllers.append(type('Synthetic%s' % i, (ArgparseController,),
+                                dict(Meta=meta)))
+    return controllers
+
+
+def tree_controllers(tree):
+    # controllers from (label, stacked_on, stacked_type), in that order
+    controllers = []
+    for label, stacked_on, stacked_type in tree:
+        meta = type('Meta', (object,), dict(label=label,
+                                            stacked_on=stacked_on,
+                                            stacked_type=stacked_type))
+        controllers.append(type('Tree_%s' % label, (ArgparseController,),
+                                dict(Meta=meta)))
+    return controllers
+
+
+class LazyBase(Base):
+
+    class Meta:
+        label = 'base'
+        lazy_parsers = True
+
+
 class ArgparseExtTestCase(test.CementExtTestCase):
 
     def setUp(self):
@@ -621,3 +684,196 @@ class ArgparseExtTestCase(test.CementExtTestCase):
             self.ok(res)
             res = 'some-other-argument' in app.args.unknown_args
             self.ok(res)
+
+    def test_dispatch_twice(self):
+        with self.app as app:
+            app._meta.argv = ['cmd1']
+            self.eq(app.run(), "Inside Base.cmd1")
+
+            app._meta.argv = ['third', 'fifth', 'cmd5']
+            self.eq(app.run(), "Inside Fifth.cmd5")
+
+    def test_controller_order_cache(self):
+        with self.app as app:
+            app._meta.argv = ['cmd1']
+            app.run()
+            order = [c.__class__ for c in app.controller._controllers]
+            key = tuple(app.handler.list('controller'))
+            self.eq(_CONTROLLER_ORDER_CACHE[key], order[1:])
+
+        self.setUp()
+        with self.app as app:
+            app._meta.argv = ['third', 'fifth', 'sixth', 'cmd6']
+            self.eq(app.run(), "Inside Sixth.cmd6")
+            self.eq([c.__class__ for c in app.controller._controllers],
+                    order)
+
+    def _lazy_app(self):
+        self.reset_backend()
+        return self.make_app(APP,
+                             argument_handler=ArgparseArgumentHandler,
+                             handlers=[
+                                 Sixth,
+                                 LazyBase,
+                                 Second,
+                                 Third,
+                                 Fourth,
+                                 Fifth,
+                                 Seventh,
+                             ],
+                             )
+
+    def test_lazy_parsers(self):
+        with self._lazy_app() as app:
+            app._meta.argv = ['--foo=bar', 'third', '--foo3=bar3',
+                              'fifth', '--foo5=bar5', 'cmd5']
+            self.eq(app.run(), "Inside Fifth.cmd5")
+            self.eq(app.pargs.foo3, 'bar3')
+            self.eq(app.pargs.foo5, 'bar5')
+
+            contr = app.controller
+            self.eq(contr._built_commands, ['fifth.cmd5'])
+            self.ok('third' in contr._sub_parser_parents.keys())
+            self.ok('fifth' in contr._sub_parser_parents.keys())
+
+            # listed in help, but not built
+            self.ok('sixth' in contr._sub_parsers.keys())
+            self.ok('sixth' not in contr._sub_parser_parents.keys())
+            self.ok('second.cmd2' in contr._command_parsers.keys())
+
+            # subsequent runs build what they need
+            app._meta.argv = ['--foo2=bar2', 'cmd2', '--cmd2-foo=bar']
+            self.eq(app.run(), "Inside Second.cmd2 : Foo > bar")
+
+            app._meta.argv = ['third', 'fifth', 'sixth', 'cmd6']
+            self.eq(app.run(), "Inside Sixth.cmd6")
+            self.ok('sixth' in contr._sub_parser_parents.keys())
+
+    def test_lazy_parsers_commands(self):
+        commands = [
+            (['cmd1'], "Inside Base.cmd1"),
+            (['cmd2'], "Inside Second.cmd2"),
+            (['third', 'cmd3'], "Inside Third.cmd3"),
+            (['third', 'cmd4'], "Inside Fourth.cmd4"),
+            (['third', 'fifth', 'cmd5'], "Inside Fifth.cmd5"),
+            (['third', 'fifth', 'sixth', 'cmd6'], "Inside Sixth.cmd6"),
+            (['third', 'cmd7'], "Inside Seventh.cmd7"),
+        ]
+        for argv, expected in commands:
+            with self._lazy_app() as app:
+                app._meta.argv = argv
+                self.eq(app.run(), expected)
+
+    def test_lazy_parsers_help(self):
+        with self.app as app:
+            app._meta.argv = ['cmd1']
+            app.run()
+            full_help = app.args.format_help()
+
+        with self._lazy_app() as app:
+            app._meta.argv = ['cmd1']
+            app.run()
+            self.eq(app.args.format_help(), full_help)
+
+    def test_controller_order(self):
+        with self.app as app:
+            app._meta.argv = ['cmd1']
+            app.run()
+            labels = [c._meta.label for c in app.controller._controllers]
+            self.eq(labels, ['base', 'third', 'second', 'fifth', 'fourth',
+                             'sixth', 'seventh'])
+
+    def test_controller_order_multi_level(self):
+        # same as the order of earlier versions (which was not breadth first)
+        self.reset_backend()
+        controllers = tree_controllers([
+            ('g1', 'c1', 'nested'),
+            ('c1', 'base', 'nested'),
+            ('c2', 'base', 'nested'),
+            ('e1', 'c1', 'embedded'),
+            ('g2', 'c2', 'nested'),
+            ('gg1', 'g1', 'nested'),
+            ('c3', 'base', 'embedded'),
+            ('gg2', 'g2', 'embedded'),
+            ('g3', 'c1', 'nested'),
+            ('ggg1', 'gg1', 'nested'),
+        ])
+        self.app = self.make_app(APP,
+                                 argument_handler=ArgparseArgumentHandler,
+                                 handlers=[Base] + controllers,
+                                 )
+        with self.app as app:
+            app.controller._setup_controllers()
+            labels = [c._meta.label for c in app.controller._controllers]
+            self.eq(labels, ['base', 'c2', 'c1', 'c3', 'g2', 'g3', 'g1',
+                             'e1', 'gg1', 'gg2', 'ggg1'])
+
+    def test_controller_order_cache_size(self):
+        for i in range(_CONTROLLER_ORDER_CACHE_SIZE + 8):
+            self.reset_backend()
+            app = self.make_app(APP,
+                                argument_handler=ArgparseArgumentHandler,
+                                handlers=[Base] + synthetic_controllers(2),
+                                )
+            with app:
+                app.controller._setup_controllers()
+        self.eq(len(_CONTROLLER_ORDER_CACHE), _CONTROLLER_ORDER_CACHE_SIZE)
+
+    @test.raises(FrameworkError)
+    def test_controller_missing_parent(self):
+        self.reset_backend()
+        self.app = self.make_app(APP,
+                                 argument_handler=ArgparseArgumentHandler,
+                                 handlers=[Base, MissingParent],
+                                 )
+        try:
+            with self.app as app:
+                app.run()
+        except FrameworkError as e:
+            self.ok(re.match("(.*)'bogus_parent'(.*)", e.msg))
+            raise
+
+    @test.raises(FrameworkError)
+    def test_controller_cycle(self):
+        self.reset_backend()
+        self.app = self.make_app(APP,
+                                 argument_handler=ArgparseArgumentHandler,
+                                 handlers=[Base, CycleOne, CycleTwo],
+                                 )
+        try:
+            with self.app as app:
+                app.run()
+        except FrameworkError as e:
+            self.ok(re.match("(.*)'cycle_one', 'cycle_two'(.*)", e.msg))
+            raise
+
+    def test_many_controllers(self):
+        self.reset_backend()
+        controllers = synthetic_controllers(1200)
+        self.app = self.make_app(APP,
+                                 argument_handler=ArgparseArgumentHandler,
+                                 handlers=[Base] + controllers,
+                                 )
+        with self.app as app:
+            app.controller._setup_controllers()
+            labels = [c._meta.label for c in app.controller._controllers]
+            self.eq(len(labels), 1201)
+
+            # parents are always resolved before their children
+            for i in range(1, 600):
+                a = labels.index('synthetic_%s' % (i - 1))
+                b = labels.index('synthetic_%s' % i)
+                self.ok(a < b)
+
+    def test_collect_commands_registry(self):
+        if sys.version_info >= (3, 6):
+            # built when the class is defined
+            self.ok('__cement_exposed__' in Second.__dict__)
+
+        with self.app as app:
+            app._meta.argv = ['cmd1']
+            app.run()
+            second = app.controller._controllers_map['second']
+            commands = second._collect_commands()
+            self.eq([c['label'] for c in commands], ['cmd2'])
+            self.eq(commands[0]['controller'], second)
@@ -0,0 +1,232 @@
+"""Tests for cement.ext.ext_cmdserver."""
+
+import os
+import sys
+import time
+import socket
+import signal
+import stat
+from cement.core import exc
+from cement.ext import ext_cmdserver
+from cement.ext.ext_argparse import ArgparseController, expose
+from cement.ext.ext_cmdserver import command_client, send_message, \
+    recv_message, HEADER
+from cement.utils import test
+
+
+class CommandServerController(ArgparseController):
+
+    class Meta:
+        label = 'base'
+        arguments = [
+            (['--name'], dict(default='world')),
+        ]
+
+    @expose()
+    def hello(self):
+        self.app.render(dict(name=self.app.pargs.name))
+        sys.stdout.write('hello %s\n' % self.app.pargs.name)
+
+    @expose()
+    def pid(self):
+        sys.stdout.write('%s\n' % os.getpid())
+
+    @expose()
+    def fail(self):
+        sys.stderr.write('failing\n')
+        self.app.exit_code = 3
+
+    @expose()
+    def error(self):
+        raise Exception('command server error')
+
+    @expose()
+    def die(self):
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+@test.attr('cmdserver')
+class CommandServerExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(CommandServerExtTestCase, self).setUp()
+        self.socket_path = os.path.join(self.tmp_dir, 'run', 'cmd.sock')
+        self.app = self.make_app('tests',
+                                 extensions=['cmdserver', 'json'],
+                                 output_handler='json',
+                                 handlers=[CommandServerController],
+                                 argv=[],
+                                 )
+        self.app.setup()
+        self.pid = None
+
+    def serve(self, **kw):
+        self.pid = os.fork()
+        if self.pid == 0:  # pragma: no cover
+            try:
+                self.app.cmdserver.serve(self.socket_path, **kw)
+            finally:
+                os._exit(0)
+
+        for i in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        if self.pid is not None:
+            os.kill(self.pid, signal.SIGTERM)
+            os.waitpid(self.pid, 0)
+        super(CommandServerExtTestCase, self).tearDown()
+
+    def test_cmdserver(self):
+        self.serve(workers=2)
+        res = command_client(self.socket_path, ['--name', 'server', 'hello'])
+        self.eq(res['exit_code'], 0)
+        self.eq(res['rendered'], '{"name": "server"}')
+        self.ok(res['stdout'].endswith('hello server\n'))
+        self.eq(res['stderr'], '')
+
+        # state is reset between requests
+        res = command_client(self.socket_path, ['hello'])
+        self.eq(res['rendered'], '{"name": "world"}')
+
+        # the server cleans up its workers and socket when stopped
+        os.kill(self.pid, signal.SIGTERM)
+        os.waitpid(self.pid, 0)
+        self.pid = None
+        self.eq(os.path.exists(self.socket_path), False)
+
+    def test_cmdserver_exit_code(self):
+        self.serve(workers=1)
+        res = command_client(self.socket_path, ['fail'])
+        self.eq(res['exit_code'], 3)
+        self.eq(res['stderr'], 'failing\n')
+
+        res = command_client(self.socket_path, ['error'])
+        self.eq(res['exit_code'], 1)
+        self.ok(res['stderr'].find('command server error') >= 0)
+
+        res = command_client(self.socket_path, ['--bogus'])
+        self.eq(res['exit_code'], 2)
+        self.ok(res['stderr'].find('unrecognized arguments') >= 0)
+
+    def test_cmdserver_max_requests(self):
+        self.serve(workers=1, max_requests=2)
+        pids = []
+        for i in range(4):
+            res = command_client(self.socket_path, ['pid'], timeout=10)
+            pids.append(int(res['stdout'].strip()))
+
+        self.ok(self.pid not in pids)
+        self.eq(pids[0], pids[1])
+        self.eq(pids[2], pids[3])
+        self.ok(pids[1] != pids[2])
+
+    def test_cmdserver_no_workers(self):
+        self.serve(workers=0)
+        res = command_client(self.socket_path, ['pid'])
+        self.eq(int(res['stdout'].strip()), self.pid)
+
+    def test_cmdserver_invalid_request(self):
+        self.serve(workers=1)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.socket_path)
+        try:
+            send_message(sock, dict(bogus=True))
+            res = recv_message(sock)
+        finally:
+            sock.close()
+        self.eq(res['exit_code'], 2)
+
+    def test_cmdserver_stalled_client(self):
+        self.app.config.set('cmdserver', 'timeout', 0.5)
+        self.serve(workers=1)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(10)
+        sock.connect(self.socket_path)
+        try:
+            # the connection is dropped, and the worker serves the next
+            self.eq(sock.recv(1), b'')
+            res = command_client(self.socket_path, ['hello'], timeout=10)
+            self.eq(res['exit_code'], 0)
+        finally:
+            sock.close()
+
+    def test_cmdserver_max_request_size(self):
+        self.app.config.set('cmdserver', 'max_request_size', 64)
+        self.serve(workers=1)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(10)
+        sock.connect(self.socket_path)
+        try:
+            sock.sendall(HEADER.pack(2 ** 31))
+            self.eq(sock.recv(1), b'')
+        finally:
+            sock.close()
+
+        res = command_client(self.socket_path, ['hello'], timeout=10)
+        self.eq(res['exit_code'], 0)
+
+    def test_cmdserver_workers_failing(self):
+        # the server gives up on workers that fail right after starting
+        def bogus_serve_requests(max_requests):
+            raise Exception('bogus worker')
+
+        self.app.cmdserver._serve_requests = bogus_serve_requests
+        failures = ext_cmdserver.WORKER_MAX_FAILURES
+        ext_cmdserver.WORKER_MAX_FAILURES = 3
+        try:
+            self.serve(workers=2)
+        finally:
+            ext_cmdserver.WORKER_MAX_FAILURES = failures
+
+        for i in range(100):
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+            if pid != 0:
+                self.pid = None
+                break
+            time.sleep(0.05)
+        self.eq(self.pid, None)
+        self.eq(os.path.exists(self.socket_path), False)
+
+    @test.raises(exc.FrameworkError)
+    def test_cmdserver_socket_path_not_a_socket(self):
+        path = os.path.join(self.tmp_dir, 'not-a-socket')
+        with open(path, 'w') as f:
+            f.write('important')
+        try:
+            self.app.cmdserver.serve(path)
+        finally:
+            self.eq(open(path, 'r').read(), 'important')
+
+    def test_cmdserver_defaults(self):
+        path = os.path.join('~', '.tests', 'cmdserver.sock')
+        self.eq(self.app.config.get('cmdserver', 'socket_path'), path)
+        self.eq(self.app.config.get('cmdserver', 'workers'), 4)
+        self.eq(self.app.config.get('cmdserver', 'max_requests'), 1000)
+        self.eq(self.app.config.get('cmdserver', 'timeout'), 30)
+        self.eq(self.app.config.get('cmdserver', 'max_request_size'),
+                1048576)
+
+    def test_command_client_no_server(self):
+        path = os.path.join(self.tmp_dir, 'bogus.sock')
+        self.eq(command_client(path, []), None)
+
+    def test_cmdserver_socket_permissions(self):
+        self.serve(workers=1)
+        mode = stat.S_IMODE(os.stat(self.socket_path).st_mode)
+        self.eq(mode, 0o600)
+
+    @test.raises(exc.FrameworkError)
+    def test_cmdserver_worker_died(self):
+        self.serve(workers=1)
+        try:
+            command_client(self.socket_path, ['die'])
+        except exc.FrameworkError as e:
+            self.ok(e.msg.find('closed the connection') >= 0)
+
+            # the worker is replaced
+            res = command_client(self.socket_path, ['hello'])
+            self.eq(res['exit_code'], 0)
+            raise
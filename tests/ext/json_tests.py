@@ -81,3 +81,26 @@ class JsonExtTestCase(test.CementExtTestCase):
         app.setup()
         app.run()
         app.render(dict(foo='bar'))
+
+    def test_lazy_extension_suppresses_output(self):
+        # ext_json is only loaded when its hooks are first run, which must be
+        # before (not while) running the post_argument_parsing hook
+        ext_json = sys.modules.pop('cement.ext.ext_json', None)
+        stdout = sys.stdout
+        try:
+            app = self.make_app(APP,
+                                extensions=['json'],
+                                lazy_extensions=True,
+                                argv=['-o', 'json'],
+                                )
+            app.setup()
+            self.ok('cement.ext.ext_json' not in sys.modules)
+            app.run()
+            self.ok('cement.ext.ext_json' in sys.modules)
+            self.ok(sys.stdout is not stdout)
+            app._unsuppress_output()
+            self.ok(sys.stdout is stdout)
+        finally:
+            sys.stdout = stdout
+            if ext_json is not None:
+                sys.modules['cement.ext.ext_json'] = ext_json
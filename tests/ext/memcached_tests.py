@@ -66,6 +66,16 @@ class MemcachedExtTestCase(test.CementTestCase):
     def test_memcached_delete(self):
         self.app.cache.delete(self.key)
 
+    def test_memcached_many(self):
+        keys = ['%s-%s' % (self.key, i) for i in range(3)]
+        self.app.cache.set_many(dict((key, 1004) for key in keys))
+        res = self.app.cache.get_many(keys + [self.key], 'fallback')
+        self.eq(res[self.key], 'fallback')
+        self.eq(res[keys[0]], 1004)
+
+        self.app.cache.delete_many(keys)
+        self.eq(self.app.cache.get_many(keys), dict.fromkeys(keys))
+
     def test_memcached_purge(self):
         self.app.cache.set(self.key, 1002)
         self.app.cache.purge()
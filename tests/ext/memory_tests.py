@@ -0,0 +1,118 @@
+"""Tests for cement.ext.ext_memory."""
+
+import threading
+from time import sleep
+from cement.utils import test
+
+
+class MemoryExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(MemoryExtTestCase, self).setUp()
+        self.app = self.make_cache_app('memory')
+
+    def test_memory_set(self):
+        self.app.cache.set('my_key', 1001)
+        self.eq(self.app.cache.get('my_key'), 1001)
+
+        # values that are None are cached too
+        self.app.cache.set('none_key', None)
+        self.eq(self.app.cache.get('none_key', 'fallback'), None)
+
+    def test_memory_get(self):
+        # get empty value
+        self.eq(self.app.cache.get('my_key'), None)
+
+        # get empty value with fallback
+        self.eq(self.app.cache.get('my_key', 1234), 1234)
+
+    def test_memory_delete(self):
+        self.app.cache.set('my_key', 1001)
+        self.eq(self.app.cache.delete('my_key'), True)
+        self.eq(self.app.cache.delete('my_key'), False)
+        self.eq(self.app.cache.get('my_key'), None)
+
+    def test_memory_purge(self):
+        self.app.cache.set('my_key', 1002)
+        self.app.cache.purge()
+        self.eq(self.app.cache.get('my_key'), None)
+
+    def test_memory_many(self):
+        self.app.cache.set_many(dict(foo=1, bar=2), time=60)
+        self.eq(self.app.cache.get_many(['foo', 'bar', 'baz'], 0),
+                dict(foo=1, bar=2, baz=0))
+        self.app.cache.delete_many(['foo', 'baz'])
+        self.eq(self.app.cache.get_many(['foo', 'bar']),
+                dict(foo=None, bar=2))
+
+    def test_memory_expire(self):
+        self.app.cache.set('my_key', 1003, time=0.1)
+        self.app.cache.set('other_key', 1003)
+        sleep(0.2)
+        self.eq(self.app.cache.get('my_key'), None)
+        self.eq(self.app.cache.get('other_key'), 1003)
+
+    def test_memory_expire_time_config(self):
+        self.app = self.make_cache_app('memory', dict(expire_time='1'))
+        self.app.cache.set('my_key', 1004)
+        self.ok(self.app.cache._items['my_key'][1] is not None)
+
+    def test_memory_purge_expired(self):
+        self.app.cache.set('my_key', 1005, time=0.1)
+        sleep(0.2)
+
+        # expired items are removed on the next set once the purge_interval
+        # is due, not only on get
+        self.app.cache._next_purge = 0
+        self.app.cache.set('other_key', 1005)
+        self.eq(list(self.app.cache._items.keys()), ['other_key'])
+
+    def test_memory_purge_expired_disabled(self):
+        self.app = self.make_cache_app('memory', dict(purge_interval=0))
+        self.app.cache.set('my_key', 1006, time=0.1)
+        sleep(0.2)
+
+        # no sweep on set, though expired items are still never returned
+        self.app.cache.set('other_key', 1006)
+        self.eq(list(self.app.cache._items.keys()), ['my_key', 'other_key'])
+        self.eq(self.app.cache.get('my_key'), None)
+
+    def test_memory_max_entries(self):
+        self.app = self.make_cache_app('memory', dict(max_entries=3))
+        for i in range(3):
+            self.app.cache.set(i, i)
+
+        # the least recently used item is evicted
+        self.app.cache.get(0)
+        self.app.cache.set(3, 3)
+        self.eq(self.app.cache.get(1), None)
+        self.eq(sorted(self.app.cache._items.keys()), [0, 2, 3])
+
+    def test_memory_max_bytes(self):
+        self.app = self.make_cache_app('memory',
+                                       dict(max_entries=0, max_bytes=1000))
+        for i in range(100):
+            self.app.cache.set(i, 'x' * 100)
+        self.ok(self.app.cache._bytes <= 1000)
+        self.ok(len(self.app.cache._items) < 100)
+        self.eq(self.app.cache.get(99), 'x' * 100)
+
+        # items larger than max_bytes are still cached on their own
+        self.app.cache.set('big', 'x' * 2000)
+        self.eq(list(self.app.cache._items.keys()), ['big'])
+
+    def test_memory_threads(self):
+        self.app = self.make_cache_app('memory', dict(max_entries=50))
+
+        def worker(n):
+            for i in range(1000):
+                self.app.cache.set('%s-%s' % (n, i % 100), i)
+                self.app.cache.get('%s-%s' % (n, (i + 1) % 100))
+
+        threads = [threading.Thread(target=worker, args=(n,))
+                   for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.eq(len(self.app.cache._items), 50)
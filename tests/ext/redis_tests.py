@@ -4,7 +4,8 @@ import sys
 import redis
 from time import sleep
 from random import random
-from cement.core import handler
+from cement.core import exc, handler
+from cement.ext import ext_redis
 from cement.utils import test
 from cement.utils.misc import init_defaults
 
@@ -44,11 +45,129 @@ class RedisExtTestCase(test.CementTestCase):
     def test_redis_delete(self):
         self.app.cache.delete(self.key)
 
+    def test_redis_many(self):
+        keys = ['%s-%s' % (self.key, i) for i in range(3)]
+        self.app.cache.set_many(dict((key, 1004) for key in keys))
+        res = self.app.cache.get_many(keys + [self.key], 'fallback')
+        self.eq(res[self.key], 'fallback')
+        self.eq(int(res[keys[0]]), 1004)
+
+        self.app.cache.delete_many(keys)
+        self.eq(self.app.cache.get_many(keys), dict.fromkeys(keys))
+
+    def test_redis_set_many_expire(self):
+        self.app.cache.set_many({self.key: 1005}, time=2)
+        sleep(3)
+        self.eq(self.app.cache.get(self.key), None)
+
     def test_redis_purge(self):
         self.app.cache.set(self.key, 1002)
         self.app.cache.purge()
         self.eq(self.app.cache.get(self.key), None)
 
+    def test_redis_namespace(self):
+        self.app.cache.set(self.key, 1006)
+        self.eq(self.app.cache.r.get('tests:%s' % self.key), b'1006')
+        self.eq(self.app.cache.r.get(self.key), None)
+
+    def test_redis_purge_namespace(self):
+        # keys outside of the namespace are not purged
+        self.app.cache.r.set(self.key, 1007)
+        try:
+            self.app.cache.set(self.key, 1007)
+            self.app.cache.purge()
+            self.eq(self.app.cache.get(self.key), None)
+            self.eq(self.app.cache.r.get(self.key), b'1007')
+        finally:
+            self.app.cache.r.delete(self.key)
+
+    def test_redis_purge_batches(self):
+        keys = ['%s-%s' % (self.key, i)
+                for i in range(ext_redis.PURGE_BATCH + 1)]
+        self.app.cache.set_many(dict((key, 1008) for key in keys))
+        self.app.cache.purge()
+        self.eq(self.app.cache.get_many(keys), dict.fromkeys(keys))
+
+    def test_redis_purge_generation(self):
+        defaults = init_defaults('tests', 'cache.redis')
+        defaults['cache.redis']['host'] = '127.0.0.1'
+        defaults['cache.redis']['purge_mode'] = 'generation'
+        defaults['cache.redis']['generation_interval'] = 0
+        defaults['cache.redis']['expire_time'] = 60
+        app = self.make_app('tests',
+                            config_defaults=defaults,
+                            extensions=['redis'],
+                            cache_handler='redis',
+                            )
+        app.setup()
+        app.cache.set(self.key, 1009)
+        self.eq(int(app.cache.get(self.key)), 1009)
+
+        # keys are never left without a ttl, as purge() does not delete them
+        app.cache.set_many({self.key: 1009}, time=0)
+        self.ok(0 < app.cache.r.ttl(app.cache._key(self.key)) <= 60)
+
+        generation = app.cache._get_generation()
+        app.cache.purge()
+        self.eq(app.cache._get_generation(), generation + 1)
+        self.eq(app.cache.get(self.key), None)
+
+        app.cache.set(self.key, 1010, time=0)
+        self.eq(int(app.cache.get(self.key)), 1010)
+        self.ok(0 < app.cache.r.ttl(app.cache._key(self.key)) <= 60)
+        app.cache.delete(self.key)
+
+    def test_redis_purge_generation_no_namespace(self):
+        defaults = init_defaults('tests', 'cache.redis')
+        defaults['cache.redis']['host'] = '127.0.0.1'
+        defaults['cache.redis']['namespace'] = ''
+        defaults['cache.redis']['purge_mode'] = 'generation'
+        defaults['cache.redis']['expire_time'] = 60
+        app = self.make_app('tests',
+                            config_defaults=defaults,
+                            extensions=['redis'],
+                            cache_handler='redis',
+                            )
+        app.setup()
+
+        # the generation number never shares a key with application data
+        self.eq(app.cache._generation_key(), '__cement_generation__')
+        app.cache.r.set('generation', 'not a number')
+        generation = app.cache._get_generation()
+        app.cache.purge()
+        self.eq(app.cache._get_generation(), generation + 1)
+        self.eq(app.cache.r.get('generation'), b'not a number')
+        app.cache.r.delete('generation')
+
+    @test.raises(exc.FrameworkError)
+    def test_redis_purge_generation_no_expire_time(self):
+        # the default expire_time of 0 would leak every purged generation
+        defaults = init_defaults('tests', 'cache.redis')
+        defaults['cache.redis']['host'] = '127.0.0.1'
+        defaults['cache.redis']['purge_mode'] = 'generation'
+        app = self.make_app('tests',
+                            config_defaults=defaults,
+                            extensions=['redis'],
+                            cache_handler='redis',
+                            )
+        app.setup()
+
+    @test.raises(exc.FrameworkError)
+    def test_redis_bad_purge_mode(self):
+        defaults = init_defaults('tests', 'cache.redis')
+        defaults['cache.redis']['host'] = '127.0.0.1'
+        defaults['cache.redis']['purge_mode'] = 'bogus'
+        app = self.make_app('tests',
+                            config_defaults=defaults,
+                            extensions=['redis'],
+                            cache_handler='redis',
+                            )
+        app.setup()
+
+    def test_escape_pattern(self):
+        self.eq(ext_redis._escape_pattern('my*app?[1]:'),
+                'my\\*app\\?\\[1\\]:')
+
     def test_memcache_expire(self):
         self.app.cache.set(self.key, 1003, time=2)
         sleep(3)
@@ -0,0 +1,154 @@
+"""Tests for cement.ext.ext_sqlite."""
+
+import os
+import sqlite3
+from time import sleep
+from cement.core import exc
+from cement.utils import test
+
+
+class SqliteExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(SqliteExtTestCase, self).setUp()
+        self.path = os.path.join(self.tmp_dir, 'cache', 'cache.db')
+        self.app = self.make_cache_app('sqlite', dict(path=self.path))
+
+    def count_rows(self):
+        conn = self.app.cache._connect()
+        return conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def test_sqlite_set(self):
+        self.app.cache.set('my_key', dict(foo=[1, 2]))
+        self.eq(self.app.cache.get('my_key'), dict(foo=[1, 2]))
+        self.ok(os.path.exists(self.path))
+
+    def test_sqlite_private(self):
+        self.app.cache.set('my_key', 1000)
+        self.eq(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.eq(os.stat(os.path.dirname(self.path)).st_mode & 0o777, 0o700)
+
+    def test_sqlite_get(self):
+        # get empty value
+        self.eq(self.app.cache.get('my_key'), None)
+
+        # get empty value with fallback
+        self.eq(self.app.cache.get('my_key', 1234), 1234)
+
+    def test_sqlite_delete(self):
+        self.app.cache.set('my_key', 1001)
+        self.eq(self.app.cache.delete('my_key'), True)
+        self.eq(self.app.cache.delete('my_key'), False)
+        self.eq(self.app.cache.get('my_key'), None)
+
+    def test_sqlite_many(self):
+        data = dict(('key-%s' % i, i) for i in range(250))
+        self.app.cache.set_many(data)
+        res = self.app.cache.get_many(list(data.keys()) + ['bogus'], 'fb')
+        self.eq(res.pop('bogus'), 'fb')
+        self.eq(res, data)
+
+        self.app.cache.set_many(dict(foo=1, bar=2), time=0.1)
+        sleep(0.2)
+        self.eq(self.app.cache.get_many(['foo', 'bar', 'key-1']),
+                dict(foo=None, bar=None, **{'key-1': 1}))
+
+        self.app.cache.delete_many(['key-%s' % i for i in range(200)])
+        self.eq(self.app.cache.get('key-199'), None)
+        self.eq(self.app.cache.get('key-200'), 200)
+
+    def test_sqlite_persistent(self):
+        self.app.cache.set('my_key', 1002)
+
+        self.app = self.make_cache_app('sqlite', dict(path=self.path))
+        self.eq(self.app.cache.get('my_key'), 1002)
+
+    def test_sqlite_purge(self):
+        self.app.cache.set('my_key', 1003)
+        self.app.cache.purge()
+        self.eq(self.app.cache.get('my_key'), None)
+
+        # purged items are deleted by later sets
+        self.eq(self.count_rows(), 1)
+        self.app.cache.set('other_key', 1003)
+        self.eq(self.count_rows(), 1)
+        self.eq(self.app.cache.get('other_key'), 1003)
+
+    def test_sqlite_expire(self):
+        self.app.cache.set('my_key', 1004, time=0.1)
+        sleep(0.2)
+        self.eq(self.app.cache.get('my_key'), None)
+
+        # expired items are deleted by later sets
+        self.app.cache.set('other_key', 1004)
+        self.eq(self.count_rows(), 1)
+
+    def test_sqlite_max_bytes_lru(self):
+        self.app = self.make_cache_app('sqlite', dict(path=self.path,
+                                                      max_bytes=2000,
+                                                      access_interval=0))
+        for i in range(10):
+            self.app.cache.set(i, 'x' * 100)
+            sleep(0.01)
+        self.app.cache.get(0)
+        for i in range(10, 30):
+            self.app.cache.set(i, 'x' * 100)
+            sleep(0.01)
+
+        conn = self.app.cache._connect()
+        self.ok(self.app.cache._get_meta(conn, 'bytes') <= 2000)
+        self.eq(self.app.cache.get(1), None)
+        self.eq(self.app.cache.get(29), 'x' * 100)
+
+    def test_sqlite_max_bytes_lfu(self):
+        self.app = self.make_cache_app('sqlite', dict(path=self.path,
+                                                      max_bytes=2000,
+                                                      eviction='lfu',
+                                                      access_interval=0))
+        self.app.cache.set('hot', 'x' * 100)
+        for i in range(5):
+            self.app.cache.get('hot')
+        for i in range(30):
+            self.app.cache.set(i, 'x' * 100)
+        self.eq(self.app.cache.get('hot'), 'x' * 100)
+        self.eq(self.app.cache.get(0), None)
+
+    def test_sqlite_access_interval(self):
+        self.app = self.make_cache_app('sqlite', dict(path=self.path,
+                                                      timeout=0.1))
+        self.app.cache.set('my_key', 1006)
+
+        # reads of recently used items don't wait on a writer
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self.eq(self.app.cache.get('my_key'), 1006)
+        finally:
+            conn.execute('ROLLBACK')
+            conn.close()
+
+        conn = self.app.cache._connect()
+        self.eq(conn.execute("SELECT hits FROM cache").fetchone()[0], 0)
+
+    @test.raises(exc.FrameworkError)
+    def test_sqlite_bad_eviction(self):
+        self.make_cache_app('sqlite', dict(path=self.path, eviction='bogus'))
+
+    def test_sqlite_processes(self):
+        self.app.cache.set('my_key', 1005)
+        pids = []
+        for n in range(4):
+            pid = os.fork()
+            if pid == 0:                                # pragma: nocover
+                try:
+                    for i in range(20):
+                        self.app.cache.set('%s-%s' % (n, i), i)
+                finally:
+                    os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            os.waitpid(pid, 0)
+
+        for n in range(4):
+            self.eq(self.app.cache.get('%s-19' % n), 19)
+        self.eq(self.app.cache.get('my_key'), 1005)
@@ -0,0 +1,216 @@
+"""Tests for cement.ext.ext_tiered."""
+
+import threading
+from time import sleep
+from cement.core import exc
+from cement.ext.ext_memory import MemoryCacheHandler
+from cement.utils import test
+
+
+class CountingCacheHandler(MemoryCacheHandler):
+
+    class Meta:
+        label = 'counting'
+
+    def __init__(self, *args, **kw):
+        super(CountingCacheHandler, self).__init__(*args, **kw)
+        self.calls = []
+
+    def get(self, key, *args, **kw):
+        self.calls.append(('get', key))
+        return super(CountingCacheHandler, self).get(key, *args, **kw)
+
+    def set(self, key, value, time=None, **kw):
+        self.calls.append(('set', key, time))
+        return super(CountingCacheHandler, self).set(key, value, time, **kw)
+
+    def get_many(self, keys, *args, **kw):
+        self.calls.append(('get_many', list(keys)))
+        return super(CountingCacheHandler, self).get_many(keys, *args, **kw)
+
+    def set_many(self, data, time=None, **kw):
+        self.calls.append(('set_many', sorted(data.keys()), time))
+        return super(CountingCacheHandler, self).set_many(data, time, **kw)
+
+    def delete_many(self, keys, **kw):
+        self.calls.append(('delete_many', list(keys)))
+        return super(CountingCacheHandler, self).delete_many(keys, **kw)
+
+    def delete(self, key, **kw):
+        self.calls.append(('delete', key))
+        return super(CountingCacheHandler, self).delete(key, **kw)
+
+
+class SlowCacheHandler(CountingCacheHandler):
+
+    class Meta:
+        label = 'slow'
+
+    def __init__(self, *args, **kw):
+        super(SlowCacheHandler, self).__init__(*args, **kw)
+        self.slow = False
+        self.writing = threading.Event()
+        self.proceed = threading.Event()
+
+    def set(self, key, value, time=None, **kw):
+        if self.slow is True:
+            self.writing.set()
+            self.proceed.wait(5)
+        return super(SlowCacheHandler, self).set(key, value, time, **kw)
+
+
+class TieredExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(TieredExtTestCase, self).setUp()
+        self.app = self.make_tiered_app()
+
+    def tearDown(self):
+        super(TieredExtTestCase, self).tearDown()
+        self.app.cache.flush()
+
+    def make_tiered_app(self, **kw):
+        config = dict(backend='counting')
+        config.update(kw)
+        return self.make_cache_app('tiered', config,
+                                   handlers=[CountingCacheHandler,
+                                             SlowCacheHandler])
+
+    def test_tiered_set(self):
+        self.app.cache.set('my_key', 1001)
+        self.eq(self.app.cache.local.get('my_key'), 1001)
+        self.eq(self.app.cache.remote.get('my_key'), 1001)
+        self.eq(self.app.cache.get('my_key'), 1001)
+
+    def test_tiered_get(self):
+        # get empty value
+        self.eq(self.app.cache.get('my_key'), None)
+
+        # get empty value with fallback
+        self.eq(self.app.cache.get('my_key', 1234), 1234)
+
+    def test_tiered_promote(self):
+        remote = self.app.cache.remote
+        remote.set('my_key', 1002)
+        remote.calls = []
+
+        # the first get reads from the second tier, later ones don't
+        for i in range(3):
+            self.eq(self.app.cache.get('my_key'), 1002)
+        self.eq(remote.calls, [('get', 'my_key')])
+
+    def test_tiered_many(self):
+        remote = self.app.cache.remote
+        self.app.cache.set_many(dict(foo=1, bar=2), time=60)
+        self.eq(remote.calls[0], ('set_many', ['bar', 'foo'], 60))
+
+        remote.set('baz', 3)
+        remote.calls = []
+        self.eq(self.app.cache.get_many(['foo', 'bar', 'baz', 'bogus'], 0),
+                dict(foo=1, bar=2, baz=3, bogus=0))
+
+        # only the keys not in the in-process tier are read from the second
+        # tier (at once), and promoted
+        self.eq(remote.calls[0], ('get_many', ['baz', 'bogus']))
+        self.eq(self.app.cache.local.get('baz'), 3)
+
+        self.app.cache.delete_many(['foo', 'baz'])
+        self.eq(self.app.cache.get_many(['foo', 'bar', 'baz']),
+                dict(foo=None, bar=2, baz=None))
+        self.eq(remote.get('foo'), None)
+
+    def test_tiered_many_write_behind(self):
+        self.app = self.make_tiered_app(write_policy='behind')
+        remote = self.app.cache.remote
+        self.app.cache.set_many(dict(foo=1, bar=2))
+        self.app.cache.delete_many(['bar'])
+        self.app.cache.local.purge()
+        self.eq(self.app.cache.get_many(['foo', 'bar']),
+                dict(foo=1, bar=None))
+
+        self.app.cache.flush()
+        self.eq(remote.get_many(['foo', 'bar']), dict(foo=1, bar=None))
+
+    def test_tiered_local_expire(self):
+        self.app = self.make_tiered_app(expire_time=1)
+        self.app.cache.set('my_key', 1003, time=0.1)
+        self.app.cache.set('other_key', 1003, time=60)
+        self.eq(self.app.cache.remote.calls[-1], ('set', 'other_key', 60))
+
+        # the in-process tier never keeps items longer than expire_time
+        sleep(0.2)
+        self.eq(self.app.cache.local.get('my_key'), None)
+        self.eq(self.app.cache.local.get('other_key'), 1003)
+        sleep(1)
+        self.eq(self.app.cache.local.get('other_key'), None)
+        self.eq(self.app.cache.get('other_key'), 1003)
+
+    def test_tiered_delete(self):
+        self.app.cache.set('my_key', 1004)
+        self.eq(self.app.cache.delete('my_key'), True)
+        self.eq(self.app.cache.get('my_key'), None)
+        self.eq(self.app.cache.remote.get('my_key'), None)
+
+    def test_tiered_purge(self):
+        self.app.cache.set('my_key', 1005)
+        self.app.cache.purge()
+        self.eq(self.app.cache.get('my_key'), None)
+        self.eq(self.app.cache.remote.get('my_key'), None)
+
+    def test_tiered_write_behind(self):
+        self.app = self.make_tiered_app(write_policy='behind')
+        remote = self.app.cache.remote
+        self.app.cache.set('my_key', 1006)
+        self.app.cache.set('other_key', 1006)
+        self.app.cache.delete('other_key')
+
+        # queued writes are seen before they are written
+        self.app.cache.local.purge()
+        self.eq(self.app.cache.get('my_key'), 1006)
+        self.eq(self.app.cache.get('other_key'), None)
+
+        self.app.cache.flush()
+        self.eq(remote.get('my_key'), 1006)
+        self.eq(remote.get('other_key'), None)
+
+    def test_tiered_write_behind_inflight(self):
+        self.app = self.make_tiered_app(write_policy='behind', backend='slow')
+        remote = self.app.cache.remote
+        remote.set('my_key', 'old')
+        remote.slow = True
+        try:
+            self.app.cache.set('my_key', 'new')
+            self.ok(remote.writing.wait(5))
+
+            # the write being written is seen, rather than the old value
+            self.app.cache.local.purge()
+            self.eq(self.app.cache.get('my_key'), 'new')
+            self.app.cache.local.purge()
+            self.eq(self.app.cache.get_many(['my_key']), dict(my_key='new'))
+
+            # purge() waits for the write, rather than it restoring the key
+            purge = threading.Thread(target=self.app.cache.purge)
+            purge.start()
+            sleep(0.1)
+            self.ok(purge.is_alive())
+        finally:
+            remote.proceed.set()
+        purge.join(5)
+        self.eq(remote.get('my_key'), None)
+        self.eq(self.app.cache.get('my_key'), None)
+
+    def test_tiered_write_behind_close(self):
+        self.app = self.make_tiered_app(write_policy='behind')
+        for i in range(100):
+            self.app.cache.set(i, i)
+        self.app.close()
+        self.eq(self.app.cache._pending, {})
+        self.eq(self.app.cache.remote.get(99), 99)
+
+    @test.raises(exc.FrameworkError)
+    def test_tiered_bad_write_policy(self):
+        self.make_tiered_app(write_policy='bogus')
+
+    @test.raises(exc.FrameworkError)
+    def test_tiered_bad_backend(self):
+        self.make_tiered_app(backend='tiered')
@@ -0,0 +1,166 @@
+"""Tests for cement.ext.ext_zygote."""
+
+import os
+import sys
+import time
+import signal
+import socket
+import stat
+from cement.core import exc
+from cement.ext.ext_argparse import ArgparseController, expose
+from cement.ext.ext_zygote import zygote_client, HEADER
+from cement.utils import test
+
+
+class ZygoteController(ArgparseController):
+
+    class Meta:
+        label = 'base'
+        arguments = [
+            (['--name'], dict(default='world')),
+        ]
+
+    @expose()
+    def hello(self):
+        sys.stdout.write('hello %s from %s in %s\n' %
+                         (self.app.pargs.name, os.getpid(), os.getcwd()))
+
+    @expose()
+    def env(self):
+        sys.stdout.write('%s\n' % os.environ['ZYGOTE_TEST'])
+
+    @expose()
+    def fail(self):
+        self.app.exit_code = 3
+
+    @expose()
+    def error(self):
+        raise Exception('zygote error')
+
+    @expose()
+    def die(self):
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+@test.attr('zygote')
+class ZygoteExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(ZygoteExtTestCase, self).setUp()
+        self.socket_path = os.path.join(self.tmp_dir, 'run', 'zygote.sock')
+        self.app = self.make_app('tests',
+                                 extensions=['zygote'],
+                                 handlers=[ZygoteController],
+                                 argv=[],
+                                 )
+        self.app.setup()
+        self.app.config.set('zygote', 'timeout', 1)
+        self.app.config.set('zygote', 'max_request_size', 65536)
+        self.pid = os.fork()
+        if self.pid == 0:  # pragma: no cover
+            try:
+                self.app.zygote.serve(self.socket_path)
+            finally:
+                os._exit(0)
+
+        for i in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        os.kill(self.pid, signal.SIGKILL)
+        os.waitpid(self.pid, 0)
+        super(ZygoteExtTestCase, self).tearDown()
+
+    def invoke(self, argv, **kw):
+        path = os.path.join(self.tmp_dir, 'output')
+        with open(os.devnull, 'r') as stdin, open(path, 'w') as f:
+            code = zygote_client(self.socket_path, argv=argv,
+                                 stdin=stdin, stdout=f, stderr=f, **kw)
+        with open(path, 'r') as f:
+            return (code, f.read())
+
+    def test_zygote(self):
+        code, output = self.invoke(['--name', 'zygote', 'hello'],
+                                   cwd=self.tmp_dir)
+        self.eq(code, 0)
+        self.ok(output.startswith('hello zygote from '))
+        self.ok(output.endswith(' in %s\n' % self.tmp_dir))
+
+        # every invocation is run by a new child
+        pid = int(output.split()[3])
+        self.ok(pid not in [os.getpid(), self.pid])
+        code, output = self.invoke(['hello'])
+        self.ok(output.startswith('hello world from '))
+        self.ok(int(output.split()[3]) != pid)
+
+    def test_zygote_env(self):
+        env = dict(os.environ)
+        env['ZYGOTE_TEST'] = 'from the client'
+        code, output = self.invoke(['env'], env=env)
+        self.eq(code, 0)
+        self.eq(output, 'from the client\n')
+
+    def test_zygote_exit_code(self):
+        code, output = self.invoke(['fail'])
+        self.eq(code, 3)
+
+        code, output = self.invoke(['error'])
+        self.eq(code, 1)
+        self.ok(output.find('zygote error') >= 0)
+
+    def test_zygote_default_socket_path(self):
+        path = os.path.join('~', '.tests', 'zygote.sock')
+        self.eq(self.app.config.get('zygote', 'socket_path'), path)
+
+    def test_zygote_client_no_server(self):
+        path = os.path.join(self.tmp_dir, 'bogus.sock')
+        self.eq(zygote_client(path, argv=[]), None)
+
+    def test_zygote_socket_permissions(self):
+        mode = stat.S_IMODE(os.stat(self.socket_path).st_mode)
+        self.eq(mode, 0o600)
+
+    @test.raises(exc.FrameworkError)
+    def test_zygote_child_died(self):
+        self.invoke(['die'])
+
+    def test_zygote_stalled_client(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(10)
+        sock.connect(self.socket_path)
+        try:
+            # the connection is dropped, rather than blocking the server
+            code, output = self.invoke(['hello'])
+            self.eq(code, 0)
+            self.eq(sock.recv(1), b'')
+        finally:
+            sock.close()
+
+    def test_zygote_max_request_size(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(10)
+        sock.connect(self.socket_path)
+        try:
+            sock.sendall(HEADER.pack(2 ** 31))
+            self.eq(sock.recv(1), b'')
+        finally:
+            sock.close()
+
+        code, output = self.invoke(['hello'])
+        self.eq(code, 0)
+
+    @test.raises(exc.FrameworkError)
+    def test_zygote_request_too_large(self):
+        self.invoke(['env'], env=dict(ZYGOTE_TEST='x' * 65536))
+
+    @test.raises(exc.FrameworkError)
+    def test_zygote_socket_path_not_a_socket(self):
+        path = os.path.join(self.tmp_dir, 'not-a-socket')
+        with open(path, 'w') as f:
+            f.write('important')
+        try:
+            self.app.zygote.serve(path)
+        finally:
+            self.eq(open(path, 'r').read(), 'important')
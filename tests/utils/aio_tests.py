@@ -0,0 +1,237 @@
+"""Tests for cement.utils.aio."""
+
+import asyncio
+from cement.core import exc, controller
+from cement.ext import ext_argparse
+from cement.utils import test
+
+
+def run_until_complete(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def collect(agen):
+    return [res async for res in agen]
+
+
+def sync_hook(*args, **kw):
+    return 'sync'
+
+
+def generator_hook(*args, **kw):
+    for i in range(2):
+        yield 'generator %s' % i
+
+
+async def async_generator_hook(*args, **kw):
+    for i in range(2):
+        yield 'async generator %s' % i
+
+
+class AsyncController(controller.CementBaseController):
+
+    class Meta:
+        label = 'base'
+
+    @controller.expose()
+    async def cmd1(self):
+        await asyncio.sleep(0)
+        return 'async cmd1'
+
+    @controller.expose()
+    def cmd2(self):
+        return 'sync cmd2'
+
+
+class AsyncArgparseController(ext_argparse.ArgparseController):
+
+    class Meta:
+        label = 'base'
+
+    @ext_argparse.expose()
+    async def cmd1(self):
+        await asyncio.sleep(0)
+        return 'async cmd1'
+
+
+class AsyncNestedArgparseController(ext_argparse.ArgparseController):
+
+    class Meta:
+        label = 'nested'
+        stacked_on = 'base'
+        stacked_type = 'nested'
+
+    @ext_argparse.expose()
+    async def cmd2(self):
+        await asyncio.sleep(0)
+        return 'async nested cmd2'
+
+
+class AsyncHookTestCase(test.CementCoreTestCase):
+
+    def setUp(self):
+        super(AsyncHookTestCase, self).setUp()
+        self.app = self.make_app()
+        self.app.hook.define('nosetests_hook')
+
+    def test_run_async(self):
+        async def async_hook(*args, **kw):
+            await asyncio.sleep(0)
+            return 'async'
+
+        self.app.hook.register('nosetests_hook', async_generator_hook,
+                               weight=10)
+        self.app.hook.register('nosetests_hook', async_hook)
+        self.app.hook.register('nosetests_hook', sync_hook)
+        self.app.hook.register('nosetests_hook', generator_hook, weight=-10)
+
+        results = run_until_complete(
+            collect(self.app.hook.run_async('nosetests_hook')))
+        self.eq(results, ['generator 0', 'generator 1', 'async', 'sync',
+                          'async generator 0', 'async generator 1'])
+
+    def test_run_async_concurrent(self):
+        # each hook waits on the other, so only completes if they are run
+        # concurrently
+        events = dict()
+
+        async def hook_one(app):
+            events['one'].set()
+            await events['two'].wait()
+            return 'one'
+
+        async def hook_two(app):
+            events['two'].set()
+            await events['one'].wait()
+            return 'two'
+
+        async def main():
+            events['one'] = asyncio.Event()
+            events['two'] = asyncio.Event()
+            coro = collect(self.app.hook.run_async('nosetests_hook', self.app))
+            return await asyncio.wait_for(coro, 5)
+
+        self.app.hook.register('nosetests_hook', hook_one)
+        self.app.hook.register('nosetests_hook', hook_two)
+
+        results = run_until_complete(main())
+        self.eq(results, ['one', 'two'])
+
+    def test_run_async_weight_order(self):
+        order = []
+
+        async def hook_one(app):
+            await asyncio.sleep(0.01)
+            order.append('one')
+
+        async def hook_two(app):
+            order.append('two')
+
+        self.app.hook.register('nosetests_hook', hook_one, weight=-1)
+        self.app.hook.register('nosetests_hook', hook_two)
+
+        run_until_complete(
+            collect(self.app.hook.run_async('nosetests_hook', self.app)))
+        self.eq(order, ['one', 'two'])
+
+    @test.raises(exc.FrameworkError)
+    def test_run_async_bad_hook(self):
+        self.app.hook.run_async('some_bogus_hook')
+
+
+class AsyncAppTestCase(test.CementCoreTestCase):
+
+    def test_run_async(self):
+        ran = []
+
+        async def async_hook(app):
+            await asyncio.sleep(0)
+            ran.append(app)
+
+        app = self.make_app(argv=[])
+        app.setup()
+        for name in ['pre_run', 'post_run', 'pre_close']:
+            app.hook.register(name, async_hook)
+
+        run_until_complete(app.run_async())
+        self.eq(len(ran), 2)
+
+        run_until_complete(app.close_async())
+        self.eq(len(ran), 3)
+
+    def test_async_with(self):
+        closed = []
+
+        async def pre_close(app):
+            closed.append(app)
+
+        async def main():
+            async with self.make_app(argv=[]) as app:
+                app.hook.register('pre_close', pre_close)
+                await app.run_async()
+            return app
+
+        app = run_until_complete(main())
+        self.eq(closed, [app])
+
+
+class AsyncControllerTestCase(test.CementCoreTestCase):
+
+    def test_run(self):
+        app = self.make_app(argv=['cmd1'], base_controller=AsyncController)
+        app.setup()
+        self.eq(app.run(), 'async cmd1')
+
+        # a new event loop is used each time
+        app._meta.argv = ['cmd1']
+        self.eq(app.run(), 'async cmd1')
+        app.close()
+
+    def test_run_sync_command(self):
+        app = self.make_app(argv=['cmd2'], base_controller=AsyncController)
+        app.setup()
+        self.eq(app.run(), 'sync cmd2')
+        app.close()
+
+    def test_run_async(self):
+        app = self.make_app(argv=['cmd1'], base_controller=AsyncController)
+        app.setup()
+        self.eq(run_until_complete(app.run_async()), 'async cmd1')
+        app.close()
+
+    @test.raises(exc.FrameworkError)
+    def test_run_from_running_loop(self):
+        async def main(app):
+            return app.run()
+
+        app = self.make_app(argv=['cmd1'], base_controller=AsyncController)
+        app.setup()
+        try:
+            run_until_complete(main(app))
+        except exc.FrameworkError as e:
+            self.ok(e.msg.find('app.run_async()') > -1)
+            raise
+        finally:
+            app.close()
+
+    def test_argparse(self):
+        app = self.make_app(argv=['cmd1'],
+                            arg_handler=ext_argparse.ArgparseArgumentHandler,
+                            handlers=[AsyncArgparseController,
+                                      AsyncNestedArgparseController])
+        app.setup()
+        self.eq(app.run(), 'async cmd1')
+        app.close()
+
+        app = self.make_app(argv=['nested', 'cmd2'],
+                            arg_handler=ext_argparse.ArgparseArgumentHandler,
+                            handlers=[AsyncArgparseController,
+                                      AsyncNestedArgparseController])
+        app.setup()
+        self.eq(app.run(), 'async nested cmd2')
+        self.eq(run_until_complete(app.run_async()), 'async nested cmd2')
+        app.close()
@@ -0,0 +1,25 @@
+"""Tests for cement.utils.batch."""
+
+import os
+from cement.utils import test, batch
+
+
+class BatchUtilsTestCase(test.CementCoreTestCase):
+
+    def test_parse_batch_line(self):
+        self.eq(batch.parse_batch_line('cmd --foo "bar baz"\n'),
+                ['cmd', '--foo', 'bar baz'])
+        self.eq(batch.parse_batch_line('   \n'), None)
+        self.eq(batch.parse_batch_line('  # cmd --foo\n'), None)
+
+    def test_read_batch(self):
+        path = os.path.join(self.tmp_dir, 'batch.txt')
+        with open(path, 'w') as f:
+            f.write("cmd1\n\n# cmd2\ncmd3 --foo\n")
+
+        self.eq(list(batch.read_batch(path)), [['cmd1'], ['cmd3', '--foo']])
+
+    def test_exit_code_from(self):
+        self.eq(batch.exit_code_from(SystemExit()), 0)
+        self.eq(batch.exit_code_from(SystemExit(2)), 2)
+        self.eq(batch.exit_code_from(SystemExit('error message')), 1)
@@ -0,0 +1,60 @@
+"""Tests for cement.utils.profiler."""
+
+from time import sleep
+from cement.utils import test
+from cement.utils.profiler import StartupProfiler
+
+
+class StartupProfilerTestCase(test.CementCoreTestCase):
+
+    def test_disabled(self):
+        profiler = StartupProfiler()
+        with profiler.measure('phases', 'nothing'):
+            pass
+        self.eq(profiler.stats, None)
+        self.eq(profiler.total(), 0.0)
+        self.eq(profiler.render(), '')
+
+    def test_measure(self):
+        profiler = StartupProfiler(enabled=True)
+        with profiler.measure('phases', 'sleepy'):
+            data = [x for x in range(1000)]
+            sleep(0.01)
+        self.eq(len(data), 1000)
+        with profiler.measure('bogus_group', 'bogus'):
+            pass
+        profiler.stop()
+
+        self.eq(len(profiler.stats['phases']), 1)
+        self.eq(len(profiler.stats['bogus_group']), 1)
+
+        item = profiler.stats['phases'][0]
+        self.eq(item['label'], 'sleepy')
+        self.ok(item['wall'] >= 0.01)
+        self.ok(item['cpu'] >= 0)
+        self.ok(profiler.total() >= 0.01)
+
+        res = profiler.render()
+        self.ok(res.find('sleepy') >= 0)
+        self.ok(res.find('total startup time') >= 0)
+
+    def test_measure_exception(self):
+        profiler = StartupProfiler(enabled=True, trace_memory=False)
+        try:
+            with profiler.measure('phases', 'broken'):
+                raise Exception('broken')
+        except Exception:
+            pass
+        item = profiler.stats['phases'][0]
+        self.eq(item['label'], 'broken')
+        self.eq(item['memory'], None)
+        line = [x for x in profiler.render().split('\n')
+                if x.find('broken') >= 0][0]
+        self.eq(line.split()[-1], '-')
+
+    def test_reset(self):
+        profiler = StartupProfiler(enabled=True, trace_memory=False)
+        with profiler.measure('plugins', 'myplugin'):
+            pass
+        profiler.reset()
+        self.eq(profiler.stats['plugins'], [])
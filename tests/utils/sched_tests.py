@@ -0,0 +1,141 @@
+"""Tests for cement.utils.sched."""
+
+import os
+import signal
+import threading
+from cement.core import exc
+from cement.utils import test, sched
+
+
+class SchedulerTestCase(test.CementCoreTestCase):
+
+    @test.raises(exc.FrameworkError)
+    def test_invalid_mode(self):
+        sched.Scheduler(1, mode='bogus')
+
+    def test_next_run(self):
+        s = sched.Scheduler(10)
+        self.eq(s.next_run(100, 105), 115)
+
+        s = sched.Scheduler(10, mode='fixed_rate')
+        self.eq(s.next_run(100, 105), 110)
+
+        # overran, so the missed runs are skipped
+        self.eq(s.next_run(100, 125), 130)
+
+        s = sched.Scheduler(10, mode='fixed_rate', skip_missed=False)
+        self.eq(s.next_run(100, 125), 110)
+
+    def test_next_run_backoff(self):
+        s = sched.Scheduler(10, mode='fixed_rate', backoff=60)
+        s.failures = 1
+        self.eq(s.next_run(100, 105), 125)
+        s.failures = 2
+        self.eq(s.next_run(100, 105), 145)
+        s.failures = 5
+        self.eq(s.next_run(100, 105), 165)
+
+    def test_run(self):
+        s = sched.Scheduler(0, jitter=0.001)
+        runs = []
+
+        def func():
+            runs.append(True)
+            if len(runs) == 3:
+                s.stop()
+
+        s.run(func)
+        self.eq(len(runs), 3)
+        self.eq(s.runs, 3)
+
+    def test_run_errors(self):
+        s = sched.Scheduler(0, backoff=0.001)
+        errors = []
+
+        def func():
+            if len(errors) == 2:
+                s.stop()
+            else:
+                raise Exception('fake error')
+
+        s.run(func, error_func=errors.append)
+        self.eq(len(errors), 2)
+        self.eq(s.failures, 0)
+
+    @test.raises(Exception)
+    def test_run_errors_raised(self):
+        def func():
+            raise Exception('fake error')
+
+        sched.Scheduler(0).run(func)
+
+    def test_wake(self):
+        # the run is due in an hour, but is woken up
+        s = sched.Scheduler(3600)
+        runs = []
+
+        def func():
+            runs.append(True)
+            if len(runs) == 2:
+                s.stop()
+            else:
+                threading.Timer(0.01, s.wake).start()
+
+        s.run(func)
+        self.eq(len(runs), 2)
+
+    def test_reload_signal(self):
+        s = sched.Scheduler(3600)
+        runs = []
+        reloads = []
+
+        def func():
+            runs.append(True)
+            if len(runs) == 2:
+                s.stop()
+            else:
+                os.kill(os.getpid(), signal.SIGHUP)
+
+        handler = signal.getsignal(signal.SIGHUP)
+        s.run(func, reload_func=lambda: reloads.append(True))
+        self.eq(len(runs), 2)
+        self.eq(len(reloads), 1)
+
+        # the original signal handler is restored
+        self.eq(signal.getsignal(signal.SIGHUP), handler)
+
+    def test_reload_errors(self):
+        s = sched.Scheduler(0, backoff=0.001)
+        calls = []
+        errors = []
+
+        def func():
+            calls.append('run')
+            if len(calls) == 1:
+                s.wake(reload=True)
+            else:
+                s.stop()
+
+        def reload_func():
+            calls.append('reload')
+            if calls.count('reload') == 1:
+                raise Exception('fake error')
+
+        s.run(func, reload_func=reload_func, error_func=errors.append)
+        self.eq(len(errors), 1)
+
+        # the failed reload is retried before the next run
+        self.eq(calls, ['run', 'reload', 'reload', 'run'])
+        self.eq(s.failures, 0)
+
+    @test.raises(Exception)
+    def test_reload_errors_raised(self):
+        s = sched.Scheduler(0)
+
+        def func():
+            s.wake(reload=True)
+
+        def reload_func():
+            raise Exception('fake error')
+
+        s.run(func, reload_func=reload_func)
@@ -0,0 +1,179 @@
+"""Tests for cement.utils.snapshot."""
+
+import os
+import stat
+from cement.utils import test
+from cement.utils.snapshot import SetupSnapshot, ParsedConfigCache, \
+    fingerprint
+from cement.ext.ext_configparser import ConfigParserConfigHandler
+
+
+class BogusConfigHandler(ConfigParserConfigHandler):
+    pass
+
+
+class SetupSnapshotTestCase(test.CementCoreTestCase):
+
+    def setUp(self):
+        super(SetupSnapshotTestCase, self).setUp()
+        self.path = os.path.join(self.tmp_dir, 'cache', 'setup.snapshot')
+        self.input = os.path.join(self.tmp_dir, 'input.conf')
+        with open(self.input, 'w') as f:
+            f.write('foo')
+
+    def test_fingerprint(self):
+        self.eq(fingerprint(os.path.join(self.tmp_dir, 'bogus')), None)
+        self.eq(fingerprint(self.tmp_dir), ['dir', ['input.conf']])
+        self.eq(fingerprint(self.input)[0], 'file')
+        self.eq(fingerprint(self.input)[2], 3)
+
+    def test_save_and_load(self):
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        self.eq(snapshot.load(), False)
+        self.eq(snapshot.get('config'), None)
+        snapshot.track(self.input)
+        snapshot.set('config', dict(section=dict(foo='bar')))
+        self.eq(snapshot.save(), True)
+        self.ok(os.path.exists(self.path))
+
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        self.eq(snapshot.load(), True)
+        self.eq(snapshot.hit, True)
+        self.eq(snapshot.get('config'), dict(section=dict(foo='bar')))
+
+        # nothing changed, nothing to write
+        snapshot.track(self.input)
+        self.eq(snapshot.save(), False)
+
+    def test_key_mismatch(self):
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        snapshot.set('config', {})
+        snapshot.save()
+
+        snapshot = SetupSnapshot(self.path, key=['other'])
+        self.eq(snapshot.load(), False)
+        self.eq(snapshot.hit, False)
+
+    def test_input_changed(self):
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        snapshot.track(self.input, os.path.join(self.tmp_dir, 'new.conf'))
+        snapshot.set('config', {})
+        snapshot.save()
+
+        with open(os.path.join(self.tmp_dir, 'new.conf'), 'w') as f:
+            f.write('bar')
+
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        self.eq(snapshot.load(), False)
+
+    def test_corrupt_snapshot(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as f:
+            f.write('{ not json')
+
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        self.eq(snapshot.load(), False)
+
+    def test_unserializable_data(self):
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        snapshot.set('config', dict(section=dict(foo=object())))
+        self.eq(snapshot.save(), False)
+        self.eq(os.path.exists(self.path), False)
+
+    def test_lossy_data(self):
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        self.eq(snapshot.set('config', dict(section=dict(foo=(1, 2)))),
+                False)
+        self.eq(snapshot.get('config'), None)
+        self.eq(snapshot.set('config', {1: 'one'}), False)
+        self.eq(snapshot.set('config', dict(section=dict(foo=[1, 2]))), True)
+
+        # replacing stored data with lossy data removes it
+        self.eq(snapshot.set('config', dict(section=dict(foo=(1, 2)))),
+                False)
+        self.eq(snapshot.get('config'), None)
+
+    def test_private(self):
+        snapshot = SetupSnapshot(self.path, key=['test'])
+        snapshot.set('config', dict(section=dict(password='hunter2')))
+        self.eq(snapshot.save(), True)
+        mode = stat.S_IMODE(os.stat(self.path).st_mode)
+        self.eq(mode, 0o600)
+        mode = stat.S_IMODE(os.stat(os.path.dirname(self.path)).st_mode)
+        self.eq(mode, 0o700)
+
+        # an existing snapshot is replaced
+        snapshot.set('config', {})
+        self.eq(snapshot.save(), True)
+        self.eq(SetupSnapshot(self.path, key=['test']).load(), True)
+        self.eq(os.listdir(os.path.dirname(self.path)), ['setup.snapshot'])
+
+
+class ParsedConfigCacheTestCase(test.CementCoreTestCase):
+
+    def setUp(self):
+        super(ParsedConfigCacheTestCase, self).setUp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.input = os.path.join(self.tmp_dir, 'input.conf')
+        with open(self.input, 'w') as f:
+            f.write('foo')
+
+    def test_set_and_get(self):
+        data = dict(section=dict(foo='bar', count=1))
+        cache = ParsedConfigCache(self.cache_dir)
+        self.eq(cache.get(self.input, ConfigParserConfigHandler), None)
+        self.eq(cache.set(self.input, ConfigParserConfigHandler, data), True)
+
+        cache = ParsedConfigCache(self.cache_dir)
+        self.eq(cache.get(self.input, ConfigParserConfigHandler), data)
+
+    def test_input_changed(self):
+        cache = ParsedConfigCache(self.cache_dir)
+        cache.set(self.input, ConfigParserConfigHandler, dict(section={}))
+
+        with open(self.input, 'w') as f:
+            f.write('foo = bar')
+
+        self.eq(cache.get(self.input, ConfigParserConfigHandler), None)
+
+    def test_handler_changed(self):
+        cache = ParsedConfigCache(self.cache_dir)
+        cache.set(self.input, ConfigParserConfigHandler, dict(section={}))
+        self.eq(cache.get(self.input, BogusConfigHandler), None)
+
+        # the source of the handler changing invalidates the entry too
+        cache._handler_fingerprints[cache._handler_id(
+            ConfigParserConfigHandler)] = ['file', 0, 0]
+        self.eq(cache.get(self.input, ConfigParserConfigHandler), None)
+
+    def test_corrupt_entry(self):
+        cache = ParsedConfigCache(self.cache_dir)
+        cache.set(self.input, ConfigParserConfigHandler, dict(section={}))
+        path = cache._entry_path(self.input, ConfigParserConfigHandler)
+        with open(path, 'w') as f:
+            f.write('not a pickle')
+
+        self.eq(cache.get(self.input, ConfigParserConfigHandler), None)
+
+    def test_unpicklable_data(self):
+        cache = ParsedConfigCache(self.cache_dir)
+        data = dict(section=dict(foo=lambda: None))
+        self.eq(cache.set(self.input, ConfigParserConfigHandler, data), False)
+        self.eq(os.path.exists(self.cache_dir), False)
+
+    def test_private(self):
+        data = dict(section=dict(password='hunter2'))
+        cache = ParsedConfigCache(self.cache_dir)
+        self.eq(cache.set(self.input, ConfigParserConfigHandler, data), True)
+        path = cache._entry_path(self.input, ConfigParserConfigHandler)
+        self.eq(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        self.eq(stat.S_IMODE(os.stat(self.cache_dir).st_mode), 0o700)
+
+        # entries that others could have written are not unpickled
+        os.chmod(path, 0o666)
+        self.eq(cache.get(self.input, ConfigParserConfigHandler), None)
+        os.chmod(path, 0o600)
+        os.chmod(self.cache_dir, 0o777)
+        self.eq(cache.get(self.input, ConfigParserConfigHandler), None)
+        os.chmod(self.cache_dir, 0o700)
+        self.eq(cache.get(self.input, ConfigParserConfigHandler), data)